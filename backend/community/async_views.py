@@ -0,0 +1,15 @@
+from django.views.decorators.http import require_GET
+
+from .models import Community
+from .serializers import CommunitySerializer
+from re_meals_api.async_api import keyset_page
+
+
+@require_GET
+async def community_list(request):
+    """Async variant of the community list, optionally for one ?warehouse_id."""
+    queryset = Community.objects.select_related("warehouse_id")
+    warehouse_id = request.GET.get("warehouse_id")
+    if warehouse_id:
+        queryset = queryset.filter(warehouse_id__warehouse_id=warehouse_id)
+    return await keyset_page(request, queryset, CommunitySerializer)
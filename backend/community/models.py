@@ -1,6 +1,6 @@
 from django.db import models
 
-from re_meals_api.id_utils import generate_prefixed_id
+from re_meals_api.id_utils import PrefixedIdManager, generate_prefixed_id
 from warehouse.models import Warehouse
 
 class Community(models.Model):
@@ -18,6 +18,8 @@ class Community(models.Model):
         related_name='communities',
     )
 
+    objects = PrefixedIdManager()
+
     def save(self, *args, **kwargs):
         if not self.community_id:
             self.community_id = generate_prefixed_id(
@@ -2,8 +2,9 @@ from rest_framework import serializers
 
 from .models import Community
 from warehouse.models import Warehouse
+from re_meals_api.sparse_fields import SparseFieldsetMixin
         
-class CommunitySerializer(serializers.ModelSerializer):
+class CommunitySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     warehouse_id = serializers.SlugRelatedField(
         queryset=Warehouse.objects.all(),
         slug_field="warehouse_id",
@@ -136,14 +136,14 @@ class CommunityWarehouseAPITests(TestCase):
 
     # 6. Community list endpoint is publicly accessible
     def test_community_list_is_public(self):
-        response = self.api_client.get(reverse("community-list"))
+        response = self.api_client.get(reverse("community-list"), {"all": 1})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.json()), 1)
         self.assertEqual(response.json()[0]["community_id"], self.community.community_id)
 
     # 7. Authenticated user can list communities
     def test_authenticated_user_can_list_communities(self):
-        response = self.authenticated_client.get(reverse("community-list"))
+        response = self.authenticated_client.get(reverse("community-list"), {"all": 1})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.json()), 1)
         self.assertEqual(response.json()[0]["community_id"], self.community.community_id)
@@ -168,14 +168,14 @@ class CommunityWarehouseAPITests(TestCase):
 
     # 9. Warehouse list endpoint is publicly accessible
     def test_warehouse_list_is_public(self):
-        response = self.api_client.get(reverse("warehouse-list"))
+        response = self.api_client.get(reverse("warehouse-list"), {"all": 1})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.json()), 1)
         self.assertEqual(response.json()[0]["warehouse_id"], self.warehouse.warehouse_id)
 
     # 10. Authenticated user can list warehouses
     def test_authenticated_user_can_list_warehouses(self):
-        response = self.authenticated_client.get(reverse("warehouse-list"))
+        response = self.authenticated_client.get(reverse("warehouse-list"), {"all": 1})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.json()), 1)
         self.assertEqual(response.json()[0]["warehouse_id"], self.warehouse.warehouse_id)
@@ -286,7 +286,7 @@ class CommunityWarehouseAPITests(TestCase):
     # 20. Listing communities returns empty list after deletion
     def test_list_empty_after_deletion(self):
         self.community.delete()
-        response = self.authenticated_client.get(reverse("community-list"))
+        response = self.authenticated_client.get(reverse("community-list"), {"all": 1})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.json(), [])
 
@@ -390,7 +390,7 @@ class CommunityWarehouseAPITests(TestCase):
     # 29. API filtering by nonexistent warehouse returns empty list
     def test_filter_by_invalid_warehouse_returns_empty(self):
         response = self.authenticated_client.get(
-            f"{reverse('community-list')}?warehouse_id=NOTREAL"
+            f"{reverse('community-list')}?warehouse_id=NOTREAL&all=1"
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.json(), [])
@@ -1,8 +1,9 @@
 from rest_framework import viewsets, permissions
 from .models import Community
 from .serializers import CommunitySerializer
+from re_meals_api.sparse_fields import SparseFieldsetViewMixin
 
-class CommunityViewSet(viewsets.ModelViewSet):
+class CommunityViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Community.objects.all()
     serializer_class = CommunitySerializer
     permission_classes = [permissions.AllowAny]
@@ -0,0 +1,17 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = "dashboard:version"
+
+
+def versioned_key(key):
+    """`key` under the current dashboard cache version."""
+    version = cache.get_or_set(VERSION_KEY, uuid.uuid4().hex, settings.DASHBOARD_CACHE_SECONDS)
+    return f"dashboard:{version}:{key}"
+
+
+def invalidate_dashboard():
+    """Drop every cached dashboard section, the public one and each user's."""
+    cache.delete(VERSION_KEY)
@@ -0,0 +1,151 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient, Client
+
+# (name, WSGI path, async path) of every public read endpoint with an async variant.
+ENDPOINTS = [
+    ("impact", "/api/impact/", "/api/async/impact/"),
+    ("impact-summary", "/api/impact/summary/", "/api/async/impact/summary/"),
+    ("heat-map", "/api/impact/heat-map/", "/api/async/impact/heat-map/"),
+    ("communities", "/api/community/communities/", "/api/async/communities/"),
+    ("leaderboard", "/api/restaurants/leaderboard/", "/api/async/restaurants/leaderboard/"),
+]
+
+
+def _host():
+    """A host name ALLOWED_HOSTS accepts, for the in-process clients."""
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*":
+            return host.lstrip(".")
+    return "localhost"
+
+
+class Command(BaseCommand):
+    help = 'Compare requests/s of the public read endpoints on the WSGI path and their async variants'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Requests per endpoint and path (default: 200)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=10,
+            help='Requests in flight at once (default: 10)',
+        )
+        parser.add_argument(
+            '--endpoint',
+            action='append',
+            choices=[name for name, _, _ in ENDPOINTS],
+            help='Only benchmark this endpoint (repeatable)',
+        )
+        parser.add_argument(
+            '--wsgi-url',
+            help='Base URL of a running WSGI server, e.g. http://localhost:8000',
+        )
+        parser.add_argument(
+            '--asgi-url',
+            help='Base URL of a running ASGI server, e.g. http://localhost:8001',
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be at least 1.')
+        if bool(options['wsgi_url']) != bool(options['asgi_url']):
+            raise CommandError('--wsgi-url and --asgi-url must be given together.')
+
+        live = bool(options['wsgi_url'])
+        self.stdout.write(
+            f"Against {options['wsgi_url']} (WSGI) and {options['asgi_url']} (ASGI)" if live
+            else 'In process: django.test.Client (WSGI) and AsyncClient (ASGI)'
+        )
+        selected = options['endpoint'] or [name for name, _, _ in ENDPOINTS]
+        for name, wsgi_path, async_path in ENDPOINTS:
+            if name not in selected:
+                continue
+            if live:
+                wsgi = self._run_http(options['wsgi_url'].rstrip('/') + wsgi_path, options)
+                asgi = self._run_http(options['asgi_url'].rstrip('/') + async_path, options)
+            else:
+                wsgi = self._run_wsgi(wsgi_path, options)
+                asgi = async_to_sync(self._run_asgi)(async_path, options)
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ {name}: WSGI {self._describe(*wsgi)} | ASGI {self._describe(*asgi)}'
+            ))
+
+    def _describe(self, results, elapsed):
+        latencies = sorted(seconds * 1000 for _, seconds in results)
+        failed = sum(1 for status, _ in results if status != 200)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return (
+            f'{len(results) / elapsed:.1f} req/s, p50 {statistics.median(latencies):.1f} ms, '
+            f'p95 {p95:.1f} ms, {failed} failed'
+        )
+
+    def _timed_threads(self, fetch, options):
+        def run_threaded(index):
+            try:
+                return fetch(index)
+            finally:
+                connection.close()
+
+        fetch(None)  # warm caches and connections
+        started = time.perf_counter()
+        if options['concurrency'] == 1:
+            results = [fetch(i) for i in range(options['requests'])]
+        else:
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                results = list(pool.map(run_threaded, range(options['requests'])))
+        return results, time.perf_counter() - started
+
+    def _run_wsgi(self, path, options):
+        client = Client(headers={'host': _host()})
+
+        def fetch(_):
+            started = time.perf_counter()
+            status = client.get(path).status_code
+            return status, time.perf_counter() - started
+
+        return self._timed_threads(fetch, options)
+
+    async def _run_asgi(self, path, options):
+        client = AsyncClient(headers={'host': _host()})
+        limit = asyncio.Semaphore(options['concurrency'])
+
+        async def fetch(_):
+            async with limit:
+                started = time.perf_counter()
+                status = (await client.get(path)).status_code
+                return status, time.perf_counter() - started
+
+        await fetch(None)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(fetch(i) for i in range(options['requests'])))
+        return results, time.perf_counter() - started
+
+    def _run_http(self, url, options):
+        def fetch(_):
+            started = time.perf_counter()
+            try:
+                with urlopen(url, timeout=30) as response:
+                    response.read()
+                    status = response.status
+            except HTTPError as exc:
+                status = exc.code
+            except URLError as exc:
+                raise CommandError(f'Could not reach {url}: {exc.reason}')
+            return status, time.perf_counter() - started
+
+        return self._timed_threads(fetch, options)
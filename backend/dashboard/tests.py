@@ -0,0 +1,177 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from community.models import Community
+from delivery.models import Delivery
+from donation.models import Donation
+from fooditem.models import FoodItem
+from impactrecord.models import ImpactRecord
+from restaurants.models import Restaurant
+from users.models import Donor, User
+from warehouse.models import Warehouse
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class DashboardTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.restaurant = Restaurant.objects.create(
+            restaurant_id="RES0000001", address="Bangkok", name="KFC", branch_name="Central",
+        )
+        self.other = Restaurant.objects.create(
+            restaurant_id="RES0000002", address="Bangkok", name="MK", branch_name="Siam",
+        )
+        self.warehouse = Warehouse.objects.create(
+            warehouse_id="WAH0000001", address="Storage", capacity=100,
+            stored_date=date(2025, 1, 1), exp_date=date(2025, 12, 31),
+        )
+        self.community = Community.objects.create(
+            community_id="COM0000001", name="North Block", address="North Road",
+            received_time=timezone.now(), population=10, warehouse_id=self.warehouse,
+        )
+        self.item = self._distributed(self.restaurant, 20)
+        self._distributed(self.other, 10)
+        self.delivery = Delivery.objects.create(
+            delivery_type="distribution", pickup_time=timezone.now(),
+            dropoff_time=timezone.now() + timedelta(hours=1), pickup_location_type="warehouse",
+            dropoff_location_type="community", warehouse_id=self.warehouse,
+            community_id=self.community, food_item=self.item, delivery_quantity="2 kg",
+            status="delivered",
+        )
+        self.user = User.objects.create(
+            user_id="USR0000001", username="donor01", fname="Donor", lname="User",
+            bod=date(1992, 3, 3), phone="0900000000", email="donor@example.com",
+            password="pw12345",
+        )
+        Donor.objects.create(user=self.user, restaurant_id=self.restaurant)
+
+    def _distributed(self, restaurant, quantity):
+        item = FoodItem.objects.create(
+            name="Rice", quantity=quantity, unit="kg",
+            expire_date=date.today() + timedelta(days=3),
+            donation=Donation.objects.create(restaurant=restaurant),
+            is_claimed=True, is_distributed=True,
+        )
+        ImpactRecord.objects.create_for_food_items(FoodItem.objects.filter(pk=item.pk))
+        return item
+
+    # 1. One response carries impact, leaderboard, heat map and counts
+    def test_dashboard_public_sections(self):
+        res = self.client.get("/api/dashboard/")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNone(res.data["user"])
+
+        impact = res.data["impact"]
+        self.assertEqual(impact["totals"]["meals_saved"], 30 * 0.5)
+        self.assertEqual(impact["period"], "week")
+        self.assertEqual(sum(row["meals_saved"] for row in impact["series"]), 15.0)
+
+        self.assertEqual(
+            [row["restaurant_id"] for row in res.data["leaderboard"]["restaurants"]],
+            ["RES0000001", "RES0000002"],
+        )
+        self.assertEqual(len(res.data["heat_map"]["cells"]), 1)
+        self.assertEqual(res.data["heat_map"]["cells"][0]["community"], "COM0000001")
+        self.assertEqual(
+            res.data["counts"],
+            {
+                "restaurants": 2,
+                "communities": 1,
+                "donations": 2,
+                "food_items": 2,
+                "distributed_food_items": 2,
+            },
+        )
+
+    # 2. The user section is scoped to the caller's restaurants and communities
+    def test_dashboard_user_scope(self):
+        res = self.client.get("/api/dashboard/", HTTP_X_USER_ID="USR0000001")
+        user = res.data["user"]
+        self.assertEqual(user["role"], "user")
+        self.assertEqual(user["restaurant_ids"], ["RES0000001"])
+        self.assertEqual(user["community_ids"], [])
+        self.assertEqual(user["impact"]["meals_saved"], 20 * 0.5)
+        self.assertEqual(user["deliveries"], {})
+
+    # 3. Admins and drivers get delivery counts for their own view
+    def test_dashboard_admin_and_driver(self):
+        admin = self.client.get(
+            "/api/dashboard/", HTTP_X_USER_ID="USR0000009", HTTP_X_USER_IS_ADMIN="true"
+        )
+        self.assertEqual(admin.data["user"]["role"], "admin")
+        self.assertEqual(admin.data["user"]["deliveries"], {"delivered": 1})
+
+        driver = self.client.get(
+            "/api/dashboard/", HTTP_X_USER_ID="USR0000008", HTTP_X_USER_IS_DELIVERY="true"
+        )
+        self.assertEqual(driver.data["user"]["role"], "delivery")
+        self.assertEqual(driver.data["user"]["deliveries"], {})
+
+    # 4. A repeated request is answered from the cache without queries
+    @override_settings(CACHES=LOCMEM_CACHE)
+    def test_dashboard_is_cached(self):
+        cache.clear()
+        first = self.client.get("/api/dashboard/", HTTP_X_USER_ID="USR0000001")
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get("/api/dashboard/", HTTP_X_USER_ID="USR0000001")
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(first.data, second.data)
+
+        other = self.client.get("/api/dashboard/", HTTP_X_USER_ID="USR0000002")
+        self.assertEqual(other.data["user"]["restaurant_ids"], [])
+
+    # 5. The read benchmark reports requests/s for both paths of each endpoint
+    def test_benchmark_dashboard_reads(self):
+        out = StringIO()
+        call_command(
+            "benchmark_dashboard_reads", requests=3, concurrency=1,
+            endpoint=["heat-map", "leaderboard"], stdout=out,
+        )
+        lines = [line for line in out.getvalue().splitlines() if line.startswith("✓")]
+        self.assertEqual([line.split(":")[0] for line in lines], ["✓ heat-map", "✓ leaderboard"])
+        for line in lines:
+            self.assertIn("WSGI", line)
+            self.assertIn("ASGI", line)
+            self.assertEqual(line.count("0 failed"), 2)
+
+        with self.assertRaises(CommandError):
+            call_command("benchmark_dashboard_reads", wsgi_url="http://localhost:8000", stdout=StringIO())
+
+    # 6. Delivering a donation refreshes the cached leaderboard and impact totals
+    @override_settings(CACHES=LOCMEM_CACHE)
+    def test_delivered_donation_invalidates_cache(self):
+        cache.clear()
+        donation = Donation.objects.create(restaurant=self.other, status="accepted")
+        FoodItem.objects.create(
+            name="Soup", quantity=4, unit="kg", expire_date=date.today() + timedelta(days=3),
+            donation=donation, is_claimed=True, is_distributed=True,
+        )
+        delivery = Delivery.objects.create(
+            delivery_type="donation", pickup_time=timezone.now(),
+            dropoff_time=timezone.now() + timedelta(hours=1), pickup_location_type="restaurant",
+            dropoff_location_type="warehouse", warehouse_id=self.warehouse, donation_id=donation,
+            user_id=self.user,
+        )
+        before = self.client.get("/api/dashboard/")
+        self.assertEqual(before.data["impact"]["totals"]["meals_saved"], 30 * 0.5)
+
+        res = self.client.patch(
+            f"/api/delivery/deliveries/{delivery.pk}/", {"status": "delivered"}, format="json",
+            HTTP_X_USER_IS_ADMIN="true",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        after = self.client.get("/api/dashboard/")
+        self.assertEqual(after.data["impact"]["totals"]["meals_saved"], 34 * 0.5)
+        board = {row["restaurant_id"]: row["meals_saved"] for row in after.data["leaderboard"]["restaurants"]}
+        self.assertEqual(board["RES0000002"], 14 * 0.5)
@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+
+from community.models import Community
+from .cache import versioned_key
+from delivery.models import Delivery
+from donation.models import Donation
+from fooditem.models import FoodItem
+from impactrecord.heatmap import get_heat_map
+from impactrecord.models import ImpactRollup
+from restaurants.leaderboard import get_leaderboard
+from restaurants.models import Restaurant
+from re_meals_api.db_router import read_database, use_replica
+from users.scope import get_user_scope
+
+# Weekly points shown in the dashboard's meals chart.
+SERIES_WEEKS = 12
+
+
+def _str_to_bool(value):
+    return str(value).lower() in ["true", "1", "yes"]
+
+
+def _deliveries_by_status(deliveries):
+    return dict(deliveries.order_by().values_list("status").annotate(count=Count("pk")))
+
+
+def _public_section():
+    """Everything every visitor sees: impact, leaderboard, heat map, counts."""
+    today = timezone.localdate()
+    series_from = today - timedelta(days=today.weekday(), weeks=SERIES_WEEKS - 1)
+    cells, _ = get_heat_map()
+    return {
+        "impact": {
+            "totals": ImpactRollup.objects.totals(),
+            "period": "week",
+            "series": ImpactRollup.objects.scoped(date_from=series_from).series("week"),
+        },
+        "leaderboard": get_leaderboard(),
+        "heat_map": {"cells": cells},
+        "counts": {
+            "restaurants": Restaurant.objects.count(),
+            "communities": Community.objects.count(),
+            "donations": Donation.objects.count(),
+            "food_items": FoodItem.objects.count(),
+            "distributed_food_items": FoodItem.objects.filter(is_distributed=True).count(),
+        },
+    }
+
+
+def _user_section(user_id, is_admin, is_driver):
+    """The caller's own slice, scoped the same way as the delivery list."""
+    if is_admin:
+        return {
+            "user_id": user_id,
+            "role": "admin",
+            "deliveries": _deliveries_by_status(Delivery.objects.all()),
+        }
+    if is_driver:
+        return {
+            "user_id": user_id,
+            "role": "delivery",
+            "deliveries": _deliveries_by_status(Delivery.objects.filter(user_id__user_id=user_id)),
+        }
+
+    scope = get_user_scope(user_id)
+    deliveries = Delivery.objects.filter(
+        Q(delivery_type="donation", donation_id__restaurant_id__in=scope.restaurant_ids)
+        | Q(delivery_type="distribution", community_id__in=scope.community_ids)
+    )
+    impact = ImpactRollup.objects.filter(
+        Q(restaurant_id__in=scope.restaurant_ids) | Q(community_id__in=scope.community_ids)
+    )
+    return {
+        "user_id": user_id,
+        "role": "user",
+        "restaurant_ids": list(scope.restaurant_ids),
+        "community_ids": list(scope.community_ids),
+        "impact": impact.totals(),
+        "deliveries": _deliveries_by_status(deliveries),
+    }
+
+
+def _cached(key, load):
+    key = versioned_key(key)
+    data = cache.get(key)
+    if data is None:
+        # One transaction on one connection (the replica when one is
+        # configured). PostgreSQL's default READ COMMITTED takes a new
+        # snapshot per statement, so the transaction is made REPEATABLE READ
+        # for every section to see the same committed state.
+        using = read_database()
+        connection = connections[using]
+        outermost = not connection.in_atomic_block
+        with transaction.atomic(using=using):
+            if outermost and connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            data = load()
+        cache.set(key, data, settings.DASHBOARD_CACHE_SECONDS)
+    return data
+
+
+@api_view(["GET"])
+@use_replica
+def dashboard(request):
+    """
+    Everything the dashboard renders, in one response.
+
+    The public part (impact totals and weekly series, leaderboard, heat map
+    and counts) is shared by all callers; the `user` part is scoped by the
+    X-USER-ID, X-USER-IS-ADMIN and X-USER-IS-DELIVERY headers and is null
+    for anonymous callers. Both parts are cached briefly.
+    """
+    data = dict(_cached("public", _public_section))
+
+    user_id = request.headers.get("X-USER-ID")
+    data["user"] = None
+    if user_id:
+        is_admin = _str_to_bool(request.headers.get("X-USER-IS-ADMIN"))
+        is_driver = _str_to_bool(request.headers.get("X-USER-IS-DELIVERY"))
+        role = "admin" if is_admin else "delivery" if is_driver else "user"
+        data["user"] = _cached(
+            f"user:{role}:{user_id}",
+            lambda: _user_section(user_id, is_admin, is_driver),
+        )
+    return Response(data)
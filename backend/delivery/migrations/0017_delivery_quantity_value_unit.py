@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('delivery', '0016_alter_delivery_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='delivery',
+            name='quantity_unit',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='delivery',
+            name='quantity_value',
+            field=models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated manually to fill quantity_value/quantity_unit from delivery_quantity
+
+import re
+from decimal import Decimal
+
+from django.db import migrations
+
+QUANTITY_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)\s*(.*)$')
+
+
+def backfill_quantity_columns(apps, schema_editor):
+    Delivery = apps.get_model('delivery', 'Delivery')
+    batch = []
+    deliveries = Delivery.objects.filter(delivery_quantity__isnull=False).only(
+        'delivery_id', 'delivery_quantity'
+    )
+    for delivery in deliveries.iterator(chunk_size=1000):
+        match = QUANTITY_PATTERN.match(delivery.delivery_quantity.strip())
+        if not match:
+            continue
+        delivery.quantity_value = Decimal(match.group(1)).quantize(Decimal('0.001'))
+        delivery.quantity_unit = match.group(2).strip()
+        batch.append(delivery)
+        if len(batch) >= 1000:
+            Delivery.objects.bulk_update(batch, ['quantity_value', 'quantity_unit'])
+            batch = []
+    if batch:
+        Delivery.objects.bulk_update(batch, ['quantity_value', 'quantity_unit'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('delivery', '0017_delivery_quantity_value_unit'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_quantity_columns, migrations.RunPython.noop),
+    ]
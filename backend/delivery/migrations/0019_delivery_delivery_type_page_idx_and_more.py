@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0002_alter_community_warehouse_id_delete_warehouse'),
+        ('delivery', '0018_backfill_quantity_value_unit'),
+        ('donation', '0005_add_created_by'),
+        ('fooditem', '0005_canonical_food_ids'),
+        ('users', '0011_add_user_role_flags'),
+        ('warehouse', '0002_alter_warehouse_address'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='delivery',
+            index=models.Index(fields=['delivery_type', 'delivery_id'], name='delivery_type_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='delivery',
+            index=models.Index(condition=models.Q(('delivery_type', 'distribution'), ('food_item__isnull', False), ('status', 'delivered')), fields=['delivery_id'], name='delivery_public_impact_idx'),
+        ),
+    ]
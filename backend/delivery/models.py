@@ -1,13 +1,88 @@
+import re
+from collections import defaultdict
 from datetime import datetime, time, timedelta
+from decimal import Decimal
 
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone as django_timezone
 from warehouse.models import Warehouse
 from community.models import Community
 from donation.models import Donation
 from users.models import User
 from fooditem.models import FoodItem
-from re_meals_api.id_utils import generate_prefixed_id
+from re_meals_api.id_utils import PrefixedIdManager, generate_prefixed_id
+
+QUANTITY_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)\s*(.*)$')
+QUANTITY_PLACES = Decimal("0.001")
+
+
+def parse_delivery_quantity(value):
+    """
+    Split a quantity string into (Decimal value, unit), or None.
+
+    "25.67 กรัม" -> (Decimal("25.670"), "กรัม"), "15 kg" -> (Decimal("15.000"), "kg").
+    """
+    if not value:
+        return None
+    match = QUANTITY_PATTERN.match(str(value).strip())
+    if not match:
+        return None
+    return Decimal(match.group(1)).quantize(QUANTITY_PLACES), match.group(2).strip()
+
+
+def format_delivery_quantity(value, unit):
+    """Render structured quantity columns back to the "15 kg" form."""
+    if value is None:
+        return None
+    return f"{Decimal(value).normalize():f} {unit}".strip()
+
+
+class DeliveryManager(PrefixedIdManager):
+    def create_batch(self, deliveries):
+        """
+        Insert unsaved deliveries in one statement and deduct their stock.
+
+        Demand is summed per food item so each item is touched by a single
+        conditional UPDATE, and every delivery gets its id from one reserved
+        block. Runs in a transaction: if any item runs short (for example
+        because a concurrent delivery got there first) InsufficientQuantity
+        is raised and nothing is written.
+        """
+        deliveries = list(deliveries)
+        demand = defaultdict(int)
+        for delivery in deliveries:
+            delivery._sync_quantity_columns()
+            if delivery.food_item_id and delivery.delivery_quantity:
+                units = self.model.stock_units(delivery.quantity_value)
+                if units is None:
+                    raise ValueError(
+                        f"Invalid delivery quantity format: '{delivery.delivery_quantity}'"
+                    )
+                demand[delivery.food_item_id] += units
+
+        # impactrecord and warehouse import this module, so import them lazily.
+        from impactrecord.heatmap import invalidate_heat_map
+        from impactrecord.models import ImpactRecord, ImpactRollup
+        from warehouse.inventory import invalidate_warehouse_inventory
+
+        with transaction.atomic():
+            # A fixed order keeps concurrent batches from deadlocking on rows.
+            for food_id in sorted(demand):
+                FoodItem.objects.deduct_quantity(food_id, demand[food_id])
+            # bulk_create sends no signals, so move already recorded impact
+            # to the new communities here.
+            impacted = ImpactRecord.objects.filter(
+                food_id__in={d.food_item_id for d in deliveries if d.food_item_id}
+            )
+            ImpactRollup.objects.remove_records(impacted)
+            created = self.bulk_create_with_ids(deliveries)
+            ImpactRollup.objects.add_records(impacted)
+        # bulk_create sends no signals, so clear the caches they would have.
+        invalidate_heat_map()
+        invalidate_warehouse_inventory(*{d.warehouse_id_id for d in created})
+        for delivery in created:
+            delivery._remember_loaded_values()
+        return created
 
 
 class Delivery(models.Model):
@@ -88,36 +163,151 @@ class Delivery(models.Model):
         blank=True,
         help_text="Quantity of food item being delivered (e.g., '15 kg', '8 bucket')"
     )
+    # Structured form of delivery_quantity, filled on every write so totals
+    # can be summed in SQL instead of parsing the text.
+    quantity_value = models.DecimalField(
+        max_digits=12,
+        decimal_places=3,
+        null=True,
+        blank=True,
+    )
+    quantity_unit = models.CharField(max_length=50, blank=True, default="")
+
+    objects = DeliveryManager()
+
+    class Meta:
+        indexes = [
+            # ?delivery_type= lists, paged in delivery_id order.
+            models.Index(fields=["delivery_type", "delivery_id"], name="delivery_type_page_idx"),
+            # The public impact feed: delivered distributions of a food item.
+            models.Index(
+                fields=["delivery_id"],
+                condition=models.Q(
+                    delivery_type="distribution", status="delivered", food_item__isnull=False
+                ),
+                name="delivery_public_impact_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Delivery {self.delivery_id} ({self.delivery_type})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what was read so save() can tell which fields changed
+        # without fetching the row again.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._remember_loaded_values()
+
+    def _remember_loaded_values(self):
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+    def get_dirty_fields(self):
+        """
+        Names of fields changed since the row was loaded or last saved, or
+        None when there is no snapshot to compare against.
+        """
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None:
+            return None
+        dirty = set()
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue  # deferred and never touched
+            if field.attname not in loaded or loaded[field.attname] != self.__dict__[field.attname]:
+                dirty.add(field.name)
+        return dirty
     
+    @staticmethod
+    def stock_units(quantity_value):
+        """FoodItem.quantity is an IntegerField, so deliveries move whole units."""
+        if quantity_value is None:
+            return None
+        return int(round(quantity_value))
+
+    def set_quantity(self, value, unit=""):
+        """Set the structured quantity and the text representation together."""
+        self.quantity_value = (
+            Decimal(value).quantize(QUANTITY_PLACES) if value is not None else None
+        )
+        self.quantity_unit = unit or ""
+        self.delivery_quantity = format_delivery_quantity(self.quantity_value, self.quantity_unit)
+
+    def _sync_quantity_columns(self):
+        parsed = parse_delivery_quantity(self.delivery_quantity)
+        if parsed:
+            self.quantity_value, self.quantity_unit = parsed
+        elif not self.delivery_quantity and self.quantity_value is not None:
+            self.delivery_quantity = format_delivery_quantity(self.quantity_value, self.quantity_unit)
+        else:
+            self.quantity_value, self.quantity_unit = None, ""
+
     def update_food_item_quantity(self):
-        """Update food item quantity when delivery is created"""
+        """Deduct this delivery's quantity from its food item's stock."""
         if not self.food_item or not self.delivery_quantity:
             return
-        
-        # Extract numeric quantity from string (e.g., "25.67 กรัม" -> 25.67, "15 kg" -> 15)
-        # Support both integer and float values
-        try:
-            import re
-            # Match number (integer or float) at the start of the string
-            quantity_match = re.search(r'^(\d+(?:\.\d+)?)', str(self.delivery_quantity).strip())
-            if not quantity_match:
-                raise ValueError(f"Could not extract quantity from '{self.delivery_quantity}'")
-            quantity = float(quantity_match.group(1))
-            # Round to integer for FoodItem.quantity (which is IntegerField)
-            quantity_int = int(round(quantity))
-        except (ValueError, AttributeError) as e:
-            raise ValueError(f"Invalid delivery quantity format: '{self.delivery_quantity}'") from e
-        
-        if quantity_int > self.food_item.quantity:
-            raise ValueError(
-                f"Delivery quantity ({quantity_int}) exceeds available quantity ({self.food_item.quantity}) for {self.food_item.name}"
-            )
-        
+
+        quantity_int = self.stock_units(self.quantity_value)
+        if quantity_int is None:
+            raise ValueError(f"Invalid delivery quantity format: '{self.delivery_quantity}'")
+
+        FoodItem.objects.deduct_quantity(self.food_item.pk, quantity_int)
         self.food_item.quantity -= quantity_int
-        self.food_item.save()
+
+    def _restore_food_item_quantity(self, food_item_id, quantity_value):
+        quantity_int = self.stock_units(quantity_value)
+        if food_item_id and quantity_int:
+            FoodItem.objects.restore_quantity(food_item_id, quantity_int)
+
+    def _sync_food_item_quantity(self):
+        """
+        Move stock between food items so it matches this delivery's food item
+        and quantity. Every change is a single UPDATE on the food item row.
+        """
+        if self._state.adding:
+            self.update_food_item_quantity()
+            return
+
+        loaded = getattr(self, "_loaded_values", {})
+        if "food_item_id" in loaded and "quantity_value" in loaded:
+            old_food_item_id = loaded["food_item_id"]
+            old_quantity_value = loaded["quantity_value"]
+        else:
+            try:
+                old_instance = Delivery.objects.only("food_item", "quantity_value").get(pk=self.pk)
+            except Delivery.DoesNotExist:
+                self.update_food_item_quantity()
+                return
+            old_food_item_id = old_instance.food_item_id
+            old_quantity_value = old_instance.quantity_value
+
+        new_food_item_id = self.food_item_id
+
+        if new_food_item_id and old_food_item_id == new_food_item_id:
+            # Same food item: only the difference between quantities moves.
+            old_quantity = self.stock_units(old_quantity_value)
+            new_quantity = self.stock_units(self.quantity_value)
+            if old_quantity is None or new_quantity is None:
+                return
+            if new_quantity > old_quantity:
+                FoodItem.objects.deduct_quantity(new_food_item_id, new_quantity - old_quantity)
+            elif new_quantity < old_quantity:
+                FoodItem.objects.restore_quantity(new_food_item_id, old_quantity - new_quantity)
+            self.food_item.quantity -= new_quantity - old_quantity
+        elif new_food_item_id:
+            # Food item changed (or was newly assigned): return stock to the
+            # old item and take it from the new one.
+            self._restore_food_item_quantity(old_food_item_id, old_quantity_value)
+            self.update_food_item_quantity()
 
     def save(self, *args, **kwargs):
         if not self.delivery_id:
@@ -149,51 +339,27 @@ class Delivery(models.Model):
             # Make timezone-aware
             self.dropoff_time = django_timezone.make_aware(combined)
         
-        # Handle quantity updates for existing deliveries
-        is_update = self.pk is not None
-        if is_update:
-            # Get the old instance from database before save
-            try:
-                old_instance = Delivery.objects.get(pk=self.pk)
-                old_food_item = old_instance.food_item
-                old_delivery_quantity = old_instance.delivery_quantity
-                new_food_item = self.food_item
-                new_delivery_quantity = self.delivery_quantity
-                
-                # If food item changed, return old quantity to old food item
-                # (Note: This is also handled in views.py, but we do it here as a safety net)
-                if old_food_item and old_delivery_quantity and new_food_item and old_food_item != new_food_item:
-                    # Old quantity was already returned in views.py, just deduct new quantity
-                    if new_delivery_quantity:
-                        self.update_food_item_quantity()
-                # If same food item but quantity changed, adjust the quantity
-                elif old_food_item and new_food_item and old_food_item == new_food_item:
-                    if old_delivery_quantity != new_delivery_quantity and new_delivery_quantity:
-                        try:
-                            import re
-                            old_match = re.search(r'^(\d+(?:\.\d+)?)', str(old_delivery_quantity).strip())
-                            new_match = re.search(r'^(\d+(?:\.\d+)?)', str(new_delivery_quantity).strip())
-                            if old_match and new_match:
-                                old_quantity = float(old_match.group(1))
-                                new_quantity = float(new_match.group(1))
-                                old_quantity_int = int(round(old_quantity))
-                                new_quantity_int = int(round(new_quantity))
-                                # Return old quantity and deduct new quantity
-                                new_food_item.quantity += old_quantity_int - new_quantity_int
-                                new_food_item.save()
-                        except (ValueError, AttributeError):
-                            pass
-                    # If quantity didn't change, no update needed
-                elif new_food_item and new_delivery_quantity:
-                    # New food item assigned (old was None), deduct quantity
-                    self.update_food_item_quantity()
-            except Delivery.DoesNotExist:
-                # New delivery, just deduct quantity
-                pass
-        
-        super().save(*args, **kwargs)
-        
-        # Update food item quantity if this is a new delivery (after save to ensure pk exists)
-        if not is_update and not hasattr(self, '_quantity_updated') and self.food_item and self.delivery_quantity:
-            self.update_food_item_quantity()
-            self._quantity_updated = True
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if "delivery_quantity" in update_fields:
+                update_fields |= {"quantity_value", "quantity_unit"}
+
+        if update_fields is None or "delivery_quantity" in update_fields:
+            self._sync_quantity_columns()
+
+        if update_fields is None and not self._state.adding:
+            # Only write what changed, e.g. a single column for a driver's
+            # status update.
+            update_fields = self.get_dirty_fields()
+
+        if update_fields is not None:
+            kwargs["update_fields"] = update_fields
+            if not update_fields:
+                return
+
+        with transaction.atomic():
+            if update_fields is None or update_fields & {"food_item", "quantity_value"}:
+                self._sync_food_item_quantity()
+            super().save(*args, **kwargs)
+        self._remember_loaded_values()
@@ -4,12 +4,13 @@ from django.utils import timezone as django_timezone
 from rest_framework import serializers
 from rest_framework.fields import DateTimeField
 
-from .models import Delivery
+from .models import Delivery, format_delivery_quantity, parse_delivery_quantity
 from users.models import User
 from warehouse.models import Warehouse
 from community.models import Community
 from donation.models import Donation
-from fooditem.models import FoodItem
+from fooditem.serializers import FoodItemIdField
+from re_meals_api.sparse_fields import SparseFieldsetMixin
 
 
 class FlexibleDateTimeField(DateTimeField):
@@ -71,7 +72,51 @@ class FlexibleDateTimeField(DateTimeField):
         return super().to_representation(value)
 
 
-class DeliverySerializer(serializers.ModelSerializer):
+class DeliveryListSerializer(serializers.ListSerializer):
+    """
+    Validates a batch of deliveries as a whole: each row is checked on its
+    own first, then demand is summed per food item across the batch.
+    Errors are keyed by row index, the same shape DRF uses for per-row
+    validation errors.
+    """
+
+    def to_internal_value(self, data):
+        rows = super().to_internal_value(data)
+        errors = self._check_batch_stock(rows)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return rows
+
+    def _check_batch_stock(self, rows):
+        demand = {}
+        for row in rows:
+            food_item = row.get("food_item")
+            parsed = parse_delivery_quantity(row.get("delivery_quantity"))
+            if food_item and parsed:
+                entry = demand.setdefault(food_item.pk, [food_item, 0])
+                entry[1] += Delivery.stock_units(parsed[0])
+
+        errors = {}
+        for index, row in enumerate(rows):
+            food_item = row.get("food_item")
+            if food_item is None or food_item.pk not in demand:
+                continue
+            item, total = demand[food_item.pk]
+            if total > item.quantity:
+                errors[index] = {
+                    "delivery_quantity": [
+                        f"Batch total ({total}) exceeds available quantity ({item.quantity}) for {item.name}"
+                    ]
+                }
+        return errors
+
+    def create(self, validated_data):
+        return Delivery.objects.create_batch(
+            Delivery(**attrs) for attrs in validated_data
+        )
+
+
+class DeliverySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     dropoff_time = FlexibleDateTimeField()
     user_id = serializers.SlugRelatedField(
         slug_field="user_id",
@@ -97,13 +142,12 @@ class DeliverySerializer(serializers.ModelSerializer):
         allow_null=True,
         required=False,
     )
-    food_item = serializers.SlugRelatedField(
-        slug_field="food_id",
-        queryset=FoodItem.objects.all(),
-        allow_null=True,
-        required=False,
-    )
+    food_item = FoodItemIdField(allow_null=True, required=False)
     delivery_quantity = serializers.CharField(required=False, allow_null=True, max_length=50)
+    quantity_value = serializers.DecimalField(
+        max_digits=12, decimal_places=3, required=False, allow_null=True, min_value=0
+    )
+    quantity_unit = serializers.CharField(required=False, allow_blank=True, max_length=50)
 
     class Meta:
         model = Delivery
@@ -122,8 +166,11 @@ class DeliverySerializer(serializers.ModelSerializer):
             "notes",
             "food_item",
             "delivery_quantity",
+            "quantity_value",
+            "quantity_unit",
         ]
         read_only_fields = ["delivery_id"]
+        list_serializer_class = DeliveryListSerializer
 
     def to_representation(self, instance):
         """Convert time objects to datetime for backward compatibility"""
@@ -195,6 +242,22 @@ class DeliverySerializer(serializers.ModelSerializer):
 
         return attrs
 
+    def _derive_delivery_quantity(self, attrs):
+        """
+        Accept the quantity either as text ("15 kg") or as quantity_value and
+        quantity_unit. Structured input is rendered to the text form, which
+        Delivery.save() parses back into the columns. Text wins if both are sent.
+        """
+        value = attrs.pop("quantity_value", None)
+        unit = attrs.pop("quantity_unit", None)
+        if "delivery_quantity" in attrs or (value is None and unit is None):
+            return
+        if value is None:
+            value = getattr(self.instance, "quantity_value", None)
+        if unit is None:
+            unit = getattr(self.instance, "quantity_unit", "")
+        attrs["delivery_quantity"] = format_delivery_quantity(value, unit)
+
     def validate_delivery_quantity(self, value):
         """Validate delivery quantity"""
         if value is not None and value.strip() == "":
@@ -210,6 +273,7 @@ class DeliverySerializer(serializers.ModelSerializer):
         donation = attrs.get("donation_id")
         community = attrs.get("community_id")
         food_item = attrs.get("food_item")
+        self._derive_delivery_quantity(attrs)
         delivery_quantity = attrs.get("delivery_quantity")
 
         if warehouse is None and instance is not None:
@@ -245,43 +309,24 @@ class DeliverySerializer(serializers.ModelSerializer):
             # Validate food item and quantity for distribution (only if provided)
             # Note: food_item and delivery_quantity are optional for backward compatibility
             if food_item and delivery_quantity:
-                # Extract numeric quantity from string (e.g., "25.67 กรัม" -> 25.67, "15 kg" -> 15)
-                try:
-                    import re
-                    # Match number (integer or float) at the start of the string
-                    quantity_match = re.search(r'^(\d+(?:\.\d+)?)', str(delivery_quantity).strip())
-                    if not quantity_match:
-                        errors["delivery_quantity"] = f"Invalid quantity format: '{delivery_quantity}'. Please include a number."
-                    else:
-                        quantity = float(quantity_match.group(1))
-                        quantity_int = int(round(quantity))
-                        
-                        # When updating an existing delivery, account for the old quantity if food_item is being changed
-                        available_quantity = food_item.quantity
-                        if instance and instance.food_item and instance.food_item != food_item:
-                            # Food item is being changed - old quantity will be returned in views.py before validation
-                            # So we can check the new food item's current quantity directly
-                            # The old quantity return happens before serializer validation
-                            pass
-                        elif instance and instance.food_item and instance.food_item == food_item:
-                            # Same food item, but quantity might be changing
-                            # Need to account for the old quantity that was already deducted
-                            old_quantity_str = instance.delivery_quantity
-                            if old_quantity_str:
-                                try:
-                                    old_quantity_match = re.search(r'^(\d+(?:\.\d+)?)', str(old_quantity_str).strip())
-                                    if old_quantity_match:
-                                        old_quantity = float(old_quantity_match.group(1))
-                                        old_quantity_int = int(round(old_quantity))
-                                        # Add back the old quantity to available quantity for validation
-                                        available_quantity = food_item.quantity + old_quantity_int
-                                except (ValueError, AttributeError):
-                                    pass
-                        
-                        if quantity_int > available_quantity:
-                            errors["delivery_quantity"] = f"Quantity ({quantity_int}) exceeds available quantity ({available_quantity}) for {food_item.name}"
-                except (ValueError, AttributeError):
-                    errors["delivery_quantity"] = f"Invalid quantity format: '{delivery_quantity}'"
+                parsed = parse_delivery_quantity(delivery_quantity)
+                if not parsed:
+                    errors["delivery_quantity"] = f"Invalid quantity format: '{delivery_quantity}'. Please include a number."
+                else:
+                    quantity_int = Delivery.stock_units(parsed[0])
+
+                    # When the food item stays the same, the stock already
+                    # excludes this delivery's old quantity, so add it back.
+                    # A changed food item gets its old stock returned in
+                    # Delivery.save(), so the new item is checked as-is.
+                    available_quantity = food_item.quantity
+                    if instance and instance.food_item and instance.food_item == food_item:
+                        old_quantity_int = Delivery.stock_units(instance.quantity_value)
+                        if old_quantity_int:
+                            available_quantity = food_item.quantity + old_quantity_int
+
+                    if quantity_int > available_quantity:
+                        errors["delivery_quantity"] = f"Quantity ({quantity_int}) exceeds available quantity ({available_quantity}) for {food_item.name}"
         else:
             errors["delivery_type"] = "Unknown delivery type."
 
@@ -295,7 +340,7 @@ class DeliverySerializer(serializers.ModelSerializer):
         data = super().to_representation(instance)
         
         # Handle dropoff_time if it's still a time object (for backward compatibility)
-        if hasattr(instance, 'dropoff_time'):
+        if "dropoff_time" in data and hasattr(instance, 'dropoff_time'):
             dropoff_value = instance.dropoff_time
             if isinstance(dropoff_value, time):
                 # Convert time to datetime using pickup_time date
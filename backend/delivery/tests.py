@@ -1,7 +1,15 @@
+import threading
+import time as time_module
 from datetime import date, timedelta, time, datetime
+from decimal import Decimal
 
 
 from django.contrib.auth.models import User as DjangoAuthUser
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.db.models import Sum
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient
@@ -13,6 +21,7 @@ from restaurants.models import Restaurant
 from restaurant_chain.models import RestaurantChain
 from donation.models import Donation
 from donation_request.models import DonationRequest
+from fooditem.models import FoodItem, InsufficientQuantity
 from .models import Delivery
 
 
@@ -122,7 +131,7 @@ class DeliveryAPITests(APITestCase):
 
     # 1. List endpoint returns a delivery with related IDs resolved
     def test_list_deliveries_returns_related_ids(self):
-        response = self.client.get(self.list_url, **self.admin_headers)
+        response = self.client.get(self.list_url, {"all": 1}, **self.admin_headers)
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data), 1)
@@ -199,7 +208,7 @@ class DeliveryAPITests(APITestCase):
     # 5. Requests must be authenticated
     def test_list_without_role_returns_empty(self):
         unauthenticated_client = APIClient()
-        response = unauthenticated_client.get(self.list_url)
+        response = unauthenticated_client.get(self.list_url, {"all": 1})
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data, [])
@@ -242,7 +251,7 @@ class DeliveryAPITests(APITestCase):
         )
 
         response = self.client.get(
-            f"{self.list_url}?delivery_type=donation", **self.admin_headers
+            f"{self.list_url}?delivery_type=donation&all=1", **self.admin_headers
         )
         self.assertEqual(response.status_code, 200)
         self.assertTrue(all(item["delivery_type"] == "donation" for item in response.data))
@@ -341,7 +350,7 @@ class DeliveryAPITests(APITestCase):
     # 15. Filtering by a type with no matches returns empty list
     def test_filter_by_delivery_type_returns_empty(self):
         response = self.client.get(
-            f"{self.list_url}?delivery_type=distribution", **self.admin_headers
+            f"{self.list_url}?delivery_type=distribution&all=1", **self.admin_headers
         )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data), 0)
@@ -433,13 +442,10 @@ class DeliveryAPITests(APITestCase):
 
     # 22. Listing supports pagination parameters
     def test_list_supports_pagination(self):
-        response = self.client.get(f"{self.list_url}?page=1&page_size=1", **self.admin_headers)
+        response = self.client.get(f"{self.list_url}?page_size=1", **self.admin_headers)
         self.assertEqual(response.status_code, 200)
-        # Response may be paginated data structure; ensure at least one item is returned
-        if isinstance(response.data, list):
-            self.assertEqual(len(response.data), 1)
-        else:
-            self.assertEqual(response.data["count"], 1)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNone(response.data["next"])
 
     # 23. Creating delivery requires dropoff_time
     def test_create_delivery_requires_dropoff_time(self):
@@ -560,7 +566,7 @@ class DeliveryAPITests(APITestCase):
         )
         self.assertEqual(create_response.status_code, 201)
         response = self.client.get(
-            f"{self.list_url}?delivery_type=distribution", **self.admin_headers
+            f"{self.list_url}?delivery_type=distribution&all=1", **self.admin_headers
         )
         self.assertEqual(response.status_code, 200)
         self.assertTrue(all(item["delivery_type"] == "distribution" for item in response.data))
@@ -592,7 +598,7 @@ class DeliveryAPITests(APITestCase):
             community_id=self.community,
         )
 
-        response = self.client.get(self.list_url, **self.user_headers)
+        response = self.client.get(self.list_url, {"all": 1}, **self.user_headers)
         self.assertEqual(response.status_code, 200)
         delivery_ids = {item["delivery_id"] for item in response.data}
         self.assertIn(self.existing_delivery.delivery_id, delivery_ids)
@@ -617,7 +623,7 @@ class DeliveryAPITests(APITestCase):
             community_id=self.community,
         )
 
-        response = self.client.get(self.list_url, **self.user_headers)
+        response = self.client.get(self.list_url, {"all": 1}, **self.user_headers)
         self.assertEqual(response.status_code, 200)
         delivery_ids = {item["delivery_id"] for item in response.data}
         self.assertIn(legacy_delivery.delivery_id, delivery_ids)
@@ -657,7 +663,7 @@ class DeliveryAPITests(APITestCase):
             community_id=other_community,
         )
 
-        response = self.client.get(self.list_url, **self.user_headers)
+        response = self.client.get(self.list_url, {"all": 1}, **self.user_headers)
         self.assertEqual(response.status_code, 200)
         delivery_ids = {item["delivery_id"] for item in response.data}
         self.assertIn(matching_distribution.delivery_id, delivery_ids)
@@ -665,6 +671,478 @@ class DeliveryAPITests(APITestCase):
 
     # 33. Users without related donations or requests see no deliveries
     def test_unrelated_user_sees_no_deliveries(self):
-        response = self.client.get(self.list_url, **self.other_user_headers)
+        response = self.client.get(self.list_url, {"all": 1}, **self.other_user_headers)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data, [])
+
+
+class DeliveryQuantityLedgerTests(APITestCase):
+    def setUp(self):
+        self.warehouse = Warehouse.objects.create(
+            warehouse_id="WAH0000001",
+            address="123 Storage Ave",
+            capacity=750.0,
+            stored_date=date(2025, 1, 1),
+            exp_date=date(2025, 3, 1),
+        )
+        self.community = Community.objects.create(
+            community_id="COM0000001",
+            name="North Block",
+            address="45 Main Street",
+            received_time=timezone.now(),
+            population=120,
+            warehouse_id=self.warehouse,
+        )
+        self.restaurant = Restaurant.objects.create(
+            restaurant_id="RES0000001",
+            address="77 Food Park",
+            name="GoodEats",
+            branch_name="Central",
+        )
+        self.donation = Donation.objects.create(restaurant=self.restaurant)
+        self.driver = DomainUser.objects.create(
+            user_id="USR0001",
+            username="driver01",
+            fname="Driver",
+            lname="User",
+            bod=date(1995, 5, 5),
+            phone="0911111111",
+            email="driver@example.com",
+            password="pw12345",
+        )
+        self.rice = FoodItem.objects.create(
+            name="Rice", quantity=20, unit="kg",
+            expire_date=date.today() + timedelta(days=5), donation=self.donation,
+        )
+        self.soup = FoodItem.objects.create(
+            name="Soup", quantity=10, unit="bucket",
+            expire_date=date.today() + timedelta(days=5), donation=self.donation,
+        )
+        self.list_url = reverse("delivery-list")
+        self.admin_headers = {"HTTP_X_USER_IS_ADMIN": "true"}
+
+    def _payload(self, food_item, quantity):
+        return {
+            "delivery_type": "distribution",
+            "pickup_time": timezone.now().isoformat(),
+            "dropoff_time": (timezone.now() + timedelta(hours=3)).isoformat(),
+            "pickup_location_type": "warehouse",
+            "dropoff_location_type": "community",
+            "warehouse_id": self.warehouse.warehouse_id,
+            "user_id": self.driver.user_id,
+            "community_id": self.community.community_id,
+            "food_item": food_item.food_id,
+            "delivery_quantity": quantity,
+        }
+
+    def _create(self, food_item, quantity):
+        return self.client.post(
+            self.list_url, self._payload(food_item, quantity), format="json", **self.admin_headers
+        )
+
+    # 1. Creating a distribution delivery deducts its quantity from the food item
+    def test_create_deducts_quantity(self):
+        response = self._create(self.rice, "15 kg")
+        self.assertEqual(response.status_code, 201)
+        self.rice.refresh_from_db()
+        self.assertEqual(self.rice.quantity, 5)
+
+    # 2. Requesting more than is in stock is rejected and nothing changes
+    def test_create_rejects_oversell(self):
+        response = self._create(self.rice, "25 kg")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("delivery_quantity", response.data)
+        self.rice.refresh_from_db()
+        self.assertEqual(self.rice.quantity, 20)
+        self.assertFalse(Delivery.objects.exists())
+
+    # 3. Changing the quantity on the same item only moves the difference
+    def test_update_same_item_adjusts_difference(self):
+        delivery_id = self._create(self.rice, "15 kg").data["delivery_id"]
+        detail_url = reverse("delivery-detail", args=[delivery_id])
+        response = self.client.patch(
+            detail_url, {"delivery_quantity": "8 kg"}, format="json", **self.admin_headers
+        )
+        self.assertEqual(response.status_code, 200)
+        self.rice.refresh_from_db()
+        self.assertEqual(self.rice.quantity, 12)
+
+    # 4. Switching food items returns stock to the old item and takes it from the new one
+    def test_update_changes_food_item(self):
+        delivery_id = self._create(self.rice, "5 kg").data["delivery_id"]
+        detail_url = reverse("delivery-detail", args=[delivery_id])
+        response = self.client.patch(
+            detail_url,
+            {"food_item": self.soup.food_id, "delivery_quantity": "4 bucket"},
+            format="json",
+            **self.admin_headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.rice.refresh_from_db()
+        self.soup.refresh_from_db()
+        self.assertEqual(self.rice.quantity, 20)
+        self.assertEqual(self.soup.quantity, 6)
+
+    # 5. A rejected item switch leaves both items untouched
+    def test_rejected_item_switch_keeps_stock(self):
+        delivery_id = self._create(self.rice, "5 kg").data["delivery_id"]
+        detail_url = reverse("delivery-detail", args=[delivery_id])
+        response = self.client.put(
+            detail_url,
+            self._payload(self.soup, "40 bucket"),
+            format="json",
+            **self.admin_headers,
+        )
+        self.assertEqual(response.status_code, 400)
+        self.rice.refresh_from_db()
+        self.soup.refresh_from_db()
+        self.assertEqual(self.rice.quantity, 15)
+        self.assertEqual(self.soup.quantity, 10)
+
+    # 6. The ledger refuses a deduction that the serializer did not see coming
+    def test_ledger_raises_on_stale_stock(self):
+        FoodItem.objects.filter(pk=self.rice.pk).update(quantity=3)
+        delivery = Delivery(**{
+            "delivery_type": "distribution",
+            "pickup_time": timezone.now(),
+            "dropoff_time": timezone.now() + timedelta(hours=1),
+            "pickup_location_type": "warehouse",
+            "dropoff_location_type": "community",
+            "warehouse_id": self.warehouse,
+            "community_id": self.community,
+            "user_id": self.driver,
+            "food_item": self.rice,
+            "delivery_quantity": "5 kg",
+        })
+        with self.assertRaises(InsufficientQuantity):
+            delivery.save()
+        self.assertFalse(Delivery.objects.exists())
+
+
+    # 7. Text quantities are stored as structured value and unit columns
+    def test_create_fills_quantity_columns(self):
+        response = self._create(self.rice, "12.5 kg")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["quantity_value"], "12.500")
+        self.assertEqual(response.data["quantity_unit"], "kg")
+        delivery = Delivery.objects.get(pk=response.data["delivery_id"])
+        self.assertEqual(delivery.quantity_value, Decimal("12.5"))
+
+    # 8. Structured input produces the text representation
+    def test_create_from_structured_quantity(self):
+        payload = self._payload(self.soup, None)
+        del payload["delivery_quantity"]
+        payload.update({"quantity_value": "4", "quantity_unit": "bucket"})
+        response = self.client.post(self.list_url, payload, format="json", **self.admin_headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["delivery_quantity"], "4 bucket")
+        self.soup.refresh_from_db()
+        self.assertEqual(self.soup.quantity, 6)
+
+    # 9. Delivered quantity can be summed in SQL per community
+    def test_quantity_sums_in_sql(self):
+        self._create(self.rice, "5 kg")
+        self._create(self.rice, "7.25 kg")
+        totals = (
+            Delivery.objects.filter(quantity_unit="kg")
+            .values("community_id")
+            .annotate(total=Sum("quantity_value"))
+        )
+        self.assertEqual(totals[0]["total"], Decimal("12.25"))
+
+
+    # 10. Saving a loaded delivery writes only the changed columns, without re-reading it
+    def test_status_only_save_writes_one_column(self):
+        delivery_id = self._create(self.rice, "5 kg").data["delivery_id"]
+        delivery = Delivery.objects.get(pk=delivery_id)
+        delivery.status = "in_transit"
+        with CaptureQueriesContext(connection) as ctx:
+            delivery.save()
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        selects = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('SET "status"', updates[0])
+        self.assertNotIn('"notes"', updates[0])
+        self.assertEqual(selects, [])
+        self.rice.refresh_from_db()
+        self.assertEqual(self.rice.quantity, 15)
+
+    # 11. Quantity changes are still picked up from the loaded snapshot
+    def test_snapshot_drives_quantity_adjustment(self):
+        delivery_id = self._create(self.rice, "5 kg").data["delivery_id"]
+        delivery = Delivery.objects.get(pk=delivery_id)
+        delivery.delivery_quantity = "9 kg"
+        delivery.save()
+        delivery.delivery_quantity = "7 kg"
+        delivery.save()
+        self.rice.refresh_from_db()
+        self.assertEqual(self.rice.quantity, 13)
+        self.assertEqual(Delivery.objects.get(pk=delivery_id).quantity_value, Decimal("7"))
+
+    # 12. Explicit update_fields skip the stock adjustment for untouched columns
+    def test_update_fields_limits_write(self):
+        delivery_id = self._create(self.rice, "5 kg").data["delivery_id"]
+        delivery = Delivery.objects.get(pk=delivery_id)
+        delivery.notes = "Left at gate"
+        delivery.status = "delivered"
+        delivery.save(update_fields=["status"])
+        stored = Delivery.objects.get(pk=delivery_id)
+        self.assertEqual(stored.status, "delivered")
+        self.assertEqual(stored.notes, "")
+
+
+    # 13. A bulk batch creates every row and deducts summed demand once per item
+    def test_bulk_create_deducts_summed_demand(self):
+        url = reverse("delivery-bulk")
+        payload = [
+            self._payload(self.rice, "6 kg"),
+            self._payload(self.rice, "4 kg"),
+            self._payload(self.soup, "3 bucket"),
+        ]
+        response = self.client.post(url, payload, format="json", **self.admin_headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 3)
+        ids = [row["delivery_id"] for row in response.data]
+        self.assertEqual(ids, ["DLV0000001", "DLV0000002", "DLV0000003"])
+        self.rice.refresh_from_db()
+        self.soup.refresh_from_db()
+        self.assertEqual(self.rice.quantity, 10)
+        self.assertEqual(self.soup.quantity, 7)
+        self.assertEqual(Delivery.objects.get(pk=ids[2]).quantity_unit, "bucket")
+
+    # 14. Rows that fit alone but not together reject the whole batch
+    def test_bulk_create_rejects_batch_over_stock(self):
+        url = reverse("delivery-bulk")
+        payload = [
+            self._payload(self.soup, "2 bucket"),
+            self._payload(self.rice, "12 kg"),
+            self._payload(self.rice, "12 kg"),
+        ]
+        response = self.client.post(url, payload, format="json", **self.admin_headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn(0, response.data)
+        self.assertIn("delivery_quantity", response.data[1])
+        self.assertIn("delivery_quantity", response.data[2])
+        self.assertFalse(Delivery.objects.exists())
+        self.rice.refresh_from_db()
+        self.soup.refresh_from_db()
+        self.assertEqual((self.rice.quantity, self.soup.quantity), (20, 10))
+
+    # 15. Per-row validation errors are reported against their row
+    def test_bulk_create_reports_row_errors(self):
+        url = reverse("delivery-bulk")
+        bad = self._payload(self.rice, "2 kg")
+        bad.pop("community_id")
+        payload = [self._payload(self.rice, "2 kg"), bad]
+        response = self.client.post(url, payload, format="json", **self.admin_headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn(0, response.data)
+        self.assertIn("community_id", response.data[1])
+        self.assertFalse(Delivery.objects.exists())
+
+    # 16. Only admins can submit batches
+    def test_bulk_create_requires_admin(self):
+        url = reverse("delivery-bulk")
+        response = self.client.post(url, [self._payload(self.rice, "1 kg")], format="json")
+        self.assertEqual(response.status_code, 403)
+
+    # 17. Losing a stock race at write time rolls back the whole batch
+    def test_bulk_create_rolls_back_on_race(self):
+        deliveries = [
+            Delivery(**{
+                "delivery_type": "distribution",
+                "pickup_time": timezone.now(),
+                "dropoff_time": timezone.now() + timedelta(hours=3),
+                "pickup_location_type": "warehouse",
+                "dropoff_location_type": "community",
+                "warehouse_id": self.warehouse,
+                "user_id": self.driver,
+                "community_id": self.community,
+                "food_item": item,
+                "delivery_quantity": quantity,
+            })
+            for item, quantity in [(self.soup, "5 bucket"), (self.rice, "21 kg")]
+        ]
+        with self.assertRaises(InsufficientQuantity):
+            Delivery.objects.create_batch(deliveries)
+        self.soup.refresh_from_db()
+        self.assertEqual(self.soup.quantity, 10)
+        self.assertFalse(Delivery.objects.exists())
+
+
+    # 18. Sparse fieldsets keep only the joins that are still rendered
+    def test_sparse_fields_trim_joins(self):
+        delivery_id = self._create(self.rice, "5 kg").data["delivery_id"]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(
+                self.list_url, {"fields": "delivery_id,food_item", "all": 1}, **self.admin_headers
+            )
+        self.assertEqual(response.data, [{"delivery_id": delivery_id, "food_item": self.rice.food_id}])
+        self.assertEqual(len(ctx.captured_queries), 1)
+        sql = ctx.captured_queries[0]["sql"]
+        self.assertIn('JOIN "fooditem"', sql)
+        self.assertNotIn('"warehouse_warehouse"', sql)
+
+    # 19. Legacy food ids in the food_item field resolve to the stored item
+    def test_food_item_accepts_legacy_id(self):
+        payload = self._payload(self.rice, "5 kg")
+        payload["food_item"] = "F" + self.rice.food_id[3:]
+        response = self.client.post(self.list_url, payload, format="json", **self.admin_headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["food_item"], self.rice.food_id)
+
+
+class DeliveryQuantityConcurrencyTests(TransactionTestCase):
+    THREADS = 8
+
+    def setUp(self):
+        restaurant = Restaurant.objects.create(
+            restaurant_id="RES0000001", address="77 Food Park", name="GoodEats", branch_name="Central",
+        )
+        self.donation = Donation.objects.create(restaurant=restaurant)
+        self.item = FoodItem.objects.create(
+            name="Rice", quantity=5, unit="kg",
+            expire_date=date.today() + timedelta(days=5), donation=self.donation,
+        )
+
+    # 1. Many threads deducting from one item never take it below zero
+    def test_concurrent_deductions_never_oversell(self):
+        results = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def worker():
+            try:
+                barrier.wait()
+                for _ in range(3):
+                    for attempt in range(50):
+                        try:
+                            FoodItem.objects.deduct_quantity(self.item.pk, 1)
+                            results.append("ok")
+                            break
+                        except InsufficientQuantity:
+                            results.append("rejected")
+                            break
+                        except OperationalError:
+                            # SQLite reports a busy database instead of waiting.
+                            time_module.sleep(0.01)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.item.refresh_from_db()
+        self.assertEqual(results.count("ok"), 5)
+        self.assertEqual(self.item.quantity, 0)
+
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class DeliveryVisibilityScopeTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.warehouse = Warehouse.objects.create(
+            warehouse_id="WAH0000001",
+            address="123 Storage Ave",
+            capacity=750.0,
+            stored_date=date(2025, 1, 1),
+            exp_date=date(2025, 3, 1),
+        )
+        self.community = Community.objects.create(
+            community_id="COM0000001",
+            name="North Block",
+            address="45 Main Street",
+            received_time=timezone.now(),
+            population=120,
+            warehouse_id=self.warehouse,
+        )
+        self.restaurant = Restaurant.objects.create(
+            restaurant_id="RES0000001", address="77 Food Park", name="GoodEats", branch_name="Central",
+        )
+        self.donation = Donation.objects.create(restaurant=self.restaurant)
+        self.user = DomainUser.objects.create(
+            user_id="USR0100",
+            username="donor01",
+            fname="Donor",
+            lname="User",
+            bod=date(1992, 3, 3),
+            phone="0900000000",
+            email="donor@example.com",
+            password="pw12345",
+        )
+        self.delivery = Delivery.objects.create(
+            delivery_type="donation",
+            pickup_time=timezone.now(),
+            dropoff_time=timezone.now() + timedelta(hours=2),
+            pickup_location_type="restaurant",
+            dropoff_location_type="warehouse",
+            warehouse_id=self.warehouse,
+            donation_id=self.donation,
+        )
+        self.list_url = reverse("delivery-list")
+        self.user_headers = {"HTTP_X_USER_ID": self.user.user_id}
+
+    def _visible_ids(self):
+        response = self.client.get(self.list_url, **self.user_headers)
+        self.assertEqual(response.status_code, 200)
+        return {item["delivery_id"] for item in response.data["results"]}
+
+    # 1. The list runs as a single query, with or without a cached scope
+    def test_scoped_list_is_one_query(self):
+        Donor.objects.create(user=self.user, restaurant_id=self.restaurant)
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self._visible_ids(), {self.delivery.delivery_id})
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    # 2. Becoming a donor shows the restaurant's deliveries
+    def test_new_donor_role_shows_deliveries(self):
+        self.assertEqual(self._visible_ids(), set())
+        Donor.objects.create(user=self.user, restaurant_id=self.restaurant)
+        self.assertEqual(self._visible_ids(), {self.delivery.delivery_id})
+
+    # 3. Removing the donor role hides the restaurant's deliveries again
+    def test_removed_donor_role_hides_deliveries(self):
+        donor = Donor.objects.create(user=self.user, restaurant_id=self.restaurant)
+        self.assertEqual(self._visible_ids(), {self.delivery.delivery_id})
+        donor.delete()
+        self.assertEqual(self._visible_ids(), set())
+
+    # 4. Moving a recipient's request to another community moves their deliveries
+    def test_request_community_change_moves_deliveries(self):
+        other = Community.objects.create(
+            community_id="COM0000002",
+            name="South Block",
+            address="1 South Road",
+            received_time=timezone.now(),
+            population=80,
+            warehouse_id=self.warehouse,
+        )
+        distribution = Delivery.objects.create(
+            delivery_type="distribution",
+            pickup_time=timezone.now(),
+            dropoff_time=timezone.now() + timedelta(hours=2),
+            pickup_location_type="warehouse",
+            dropoff_location_type="community",
+            warehouse_id=self.warehouse,
+            community_id=other,
+        )
+        request = DonationRequest.objects.create(
+            title="Meals",
+            community_name=self.community.name,
+            recipient_address=self.community.address,
+            expected_delivery=timezone.now() + timedelta(days=2),
+            people_count=10,
+            community=self.community,
+        )
+        Recipient.objects.create(user=self.user, address="1 Road", donation_request=request)
+        self.assertEqual(self._visible_ids(), set())
+
+        request.community = other
+        request.save()
+        self.assertEqual(self._visible_ids(), {distribution.delivery_id})
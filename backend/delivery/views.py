@@ -1,21 +1,24 @@
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from rest_framework import status as drf_status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 import uuid
 
 from impactrecord.models import ImpactRecord
-from fooditem.models import FoodItem
+from fooditem.models import FoodItem, InsufficientQuantity
 from donation.models import Donation
 from .models import Delivery
 from .serializers import DeliverySerializer
 from users.models import Donor, Recipient
+from re_meals_api.sparse_fields import SparseFieldsetViewMixin
 
 
 def _str_to_bool(value):
     return str(value).lower() in ["true", "1", "yes"]
 
 
-class DeliveryViewSet(viewsets.ModelViewSet):
+class DeliveryViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Delivery.objects.select_related(
         "warehouse_id",
         "user_id",
@@ -42,34 +45,21 @@ class DeliveryViewSet(viewsets.ModelViewSet):
         if is_driver and user_id:
             return qs.filter(user_id__user_id=user_id)
         if user_id:
-            donor_restaurant_ids = list(
-                Donor.objects.filter(user__user_id=user_id)
-                .values_list("restaurant_id__restaurant_id", flat=True)
-                .distinct()
-            )
-            donation_filter = Q(delivery_type="donation")
-            if donor_restaurant_ids:
-                donation_filter &= Q(
-                    donation_id__restaurant__restaurant_id__in=donor_restaurant_ids
+            # The user's donor and recipient roles are matched with correlated
+            # EXISTS subqueries, so the whole list is one SQL statement.
+            donation_filter = Q(delivery_type="donation") & Exists(
+                Donor.objects.filter(
+                    user__user_id=user_id,
+                    restaurant_id=OuterRef("donation_id__restaurant"),
                 )
-            else:
-                donation_filter &= Q(pk__isnull=True)
-
-            requested_communities = list(
+            )
+            community_filter = Q(delivery_type="distribution") & Exists(
                 Recipient.objects.filter(
                     user__user_id=user_id,
-                    donation_request__community__isnull=False,
+                    donation_request__community=OuterRef("community_id"),
                 )
-                .values_list("donation_request__community__community_id", flat=True)
-                .distinct()
             )
-            community_filter = Q()
-            if requested_communities:
-                community_filter = Q(
-                    delivery_type="distribution",
-                    community_id__community_id__in=requested_communities,
-                )
-            
+
             # Allow read access to delivered distribution deliveries for impact visualization
             # This is public impact data that should be visible to all authenticated users
             public_impact_filter = Q(
@@ -88,36 +78,41 @@ class DeliveryViewSet(viewsets.ModelViewSet):
             food_item__isnull=False
         )
 
+    def perform_create(self, serializer):
+        self._save_with_stock_check(serializer)
+
+    def perform_update(self, serializer):
+        self._save_with_stock_check(serializer)
+
+    def _save_with_stock_check(self, serializer):
+        # The serializer checks stock up front, but a concurrent delivery can
+        # still win the race; the conditional UPDATE in the ledger catches it.
+        try:
+            serializer.save()
+        except InsufficientQuantity as exc:
+            raise ValidationError({"delivery_quantity": str(exc)})
+
     def create(self, request, *args, **kwargs):
         if not _str_to_bool(request.headers.get("X-USER-IS-ADMIN")):
             return Response({"detail": "Admin privileges required."}, status=403)
         return super().create(request, *args, **kwargs)
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Create a list of deliveries in one transaction. Either every row is
+        created or none is; rejected batches return errors keyed by row index.
+        """
+        if not _str_to_bool(request.headers.get("X-USER-IS-ADMIN")):
+            return Response({"detail": "Admin privileges required."}, status=403)
+        serializer = self.get_serializer(data=request.data, many=True, allow_empty=False)
+        serializer.is_valid(raise_exception=True)
+        self._save_with_stock_check(serializer)
+        return Response(serializer.data, status=drf_status.HTTP_201_CREATED)
+
     def update(self, request, *args, **kwargs):
         if not _str_to_bool(request.headers.get("X-USER-IS-ADMIN")):
             return Response({"detail": "Admin privileges required."}, status=403)
-        instance = self.get_object()
-        
-        # Before updating, return old quantity to old food item if food_item is being changed
-        old_food_item = instance.food_item
-        old_delivery_quantity = instance.delivery_quantity
-        new_food_item_id = request.data.get("food_item")
-        
-        if old_food_item and old_delivery_quantity and new_food_item_id:
-            # Check if food item is actually changing
-            if str(old_food_item.food_id) != str(new_food_item_id):
-                # Return old quantity to old food item
-                try:
-                    import re
-                    quantity_match = re.search(r'^(\d+(?:\.\d+)?)', str(old_delivery_quantity).strip())
-                    if quantity_match:
-                        old_quantity = float(quantity_match.group(1))
-                        old_quantity_int = int(round(old_quantity))
-                        old_food_item.quantity += old_quantity_int
-                        old_food_item.save()
-                except (ValueError, AttributeError):
-                    pass
-        
         return super().update(request, *args, **kwargs)
 
     def destroy(self, request, *args, **kwargs):
@@ -142,30 +137,10 @@ class DeliveryViewSet(viewsets.ModelViewSet):
                     status=drf_status.HTTP_400_BAD_REQUEST,
                 )
         else:
-            # Admin can update all fields including food_item and delivery_quantity
+            # Admin can update all fields including food_item and delivery_quantity;
+            # Delivery.save() moves the stock between food items.
             data = request.data
-            
-            # Before updating, return old quantity to old food item if food_item is being changed
-            if "food_item" in data:
-                old_food_item = instance.food_item
-                old_delivery_quantity = instance.delivery_quantity
-                new_food_item_id = data.get("food_item")
-                
-                if old_food_item and old_delivery_quantity and new_food_item_id:
-                    # Check if food item is actually changing
-                    if str(old_food_item.food_id) != str(new_food_item_id):
-                        # Return old quantity to old food item
-                        try:
-                            import re
-                            quantity_match = re.search(r'^(\d+(?:\.\d+)?)', str(old_delivery_quantity).strip())
-                            if quantity_match:
-                                old_quantity = float(quantity_match.group(1))
-                                old_quantity_int = int(round(old_quantity))
-                                old_food_item.quantity += old_quantity_int
-                                old_food_item.save()
-                        except (ValueError, AttributeError):
-                            pass
-        
+
         serializer = self.get_serializer(instance, data=data, partial=True)
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
@@ -184,34 +159,13 @@ class DeliveryViewSet(viewsets.ModelViewSet):
 
     def _create_impact_records(self, delivery: Delivery):
         """
-        Create impact records for all food items in a delivered donation.
-        Uses the same calculation logic as FoodItemViewSet for consistency.
+        Create impact records for all distributed food items in a delivered
+        donation, in a constant number of queries.
         """
         donation = delivery.donation_id
         if not donation:
             return
-        
-        from impactrecord.models import ImpactRecord
-        
-        items = FoodItem.objects.filter(donation=donation, is_distributed=True)
-        for item in items:
-            # Check if impact record already exists for this food item
-            if ImpactRecord.objects.filter(food=item).exists():
-                continue  # Skip if already exists
-            
-            # Use same calculation as FoodItemViewSet for consistency
-            MEAL_FACTOR = 0.5
-            WEIGHT_FACTOR = 0.2
-            CO2_FACTOR = 2.5
-
-            meals_saved = item.quantity * MEAL_FACTOR
-            weight_saved = item.quantity * WEIGHT_FACTOR
-            co2_saved = weight_saved * CO2_FACTOR
-
-            # Don't set impact_id - let the model generate it automatically
-            ImpactRecord.objects.create(
-                meals_saved=meals_saved,
-                weight_saved_kg=weight_saved,
-                co2_reduced_kg=co2_saved,
-                food=item,
-            )
+
+        ImpactRecord.objects.create_for_food_items(
+            FoodItem.objects.filter(donation=donation, is_distributed=True)
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation', '0005_add_created_by'),
+        ('restaurants', '0002_alter_restaurant_chain'),
+        ('users', '0011_add_user_role_flags'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['status', 'donation_id'], name='donation_status_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['donated_at'], name='donation_donated_at_idx'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 
-from re_meals_api.id_utils import generate_prefixed_id
+from re_meals_api.id_utils import PrefixedIdManager, generate_prefixed_id
 from restaurants.models import Restaurant
 
 class Donation(models.Model):
@@ -31,9 +31,17 @@ class Donation(models.Model):
         related_name='donations',
     )
 
+    objects = PrefixedIdManager()
+
     class Meta:
         db_table = "donation"
         ordering = ["donation_id"]
+        indexes = [
+            # ?status= lists, paged in donation_id order.
+            models.Index(fields=["status", "donation_id"], name="donation_status_page_idx"),
+            # ?date_from= / ?date_to= ranges.
+            models.Index(fields=["donated_at"], name="donation_donated_at_idx"),
+        ]
 
     def __str__(self):
         return f"Donation {self.donation_id}"
@@ -4,9 +4,10 @@ from restaurant_chain.models import RestaurantChain
 from restaurants.models import Restaurant
 
 from .models import Donation
+from re_meals_api.sparse_fields import SparseFieldsetMixin
 
 
-class DonationSerializer(serializers.ModelSerializer):
+class DonationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     restaurant_name = serializers.SerializerMethodField()
     restaurant_branch = serializers.SerializerMethodField()
     restaurant_address = serializers.SerializerMethodField()
@@ -14,6 +15,13 @@ class DonationSerializer(serializers.ModelSerializer):
     manual_restaurant_name = serializers.CharField(write_only=True, required=False, allow_blank=True)
     manual_branch_name = serializers.CharField(write_only=True, required=False, allow_blank=True)
     manual_restaurant_address = serializers.CharField(write_only=True, required=False, allow_blank=True)
+
+    field_sources = {
+        "restaurant_name": ["restaurant"],
+        "restaurant_branch": ["restaurant"],
+        "restaurant_address": ["restaurant"],
+        "created_by_user_id": ["created_by"],
+    }
     
     def get_restaurant_name(self, obj):
         return obj.restaurant.name if obj.restaurant else None
@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient
 
@@ -88,7 +90,7 @@ class DonationTests(APITestCase):
         Donation.objects.create(donation_id="DON001", restaurant=self.restaurant)
         Donation.objects.create(donation_id="DON002", restaurant=self.restaurant)
 
-        response = self.client.get("/api/donations/")
+        response = self.client.get("/api/donations/?all=1")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data), 2)
 
@@ -96,7 +98,7 @@ class DonationTests(APITestCase):
     def test_filter_by_restaurant(self):
         Donation.objects.create(donation_id="DON001", restaurant=self.restaurant)
 
-        response = self.client.get("/api/donations/?restaurant_id=RES001")
+        response = self.client.get("/api/donations/?restaurant_id=RES001&all=1")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data), 1)
 
@@ -105,7 +107,7 @@ class DonationTests(APITestCase):
         Donation.objects.create(donation_id="DON001", restaurant=self.restaurant, status="pending")
         Donation.objects.create(donation_id="DON002", restaurant=self.restaurant, status="accepted")
 
-        response = self.client.get("/api/donations/?status=accepted")
+        response = self.client.get("/api/donations/?status=accepted&all=1")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["donation_id"], "DON002")
@@ -168,7 +170,7 @@ class DonationTests(APITestCase):
     def test_filter_status_false(self):
         Donation.objects.create(donation_id="DON1", restaurant=self.restaurant, status="pending")
         Donation.objects.create(donation_id="DON2", restaurant=self.restaurant, status="accepted")
-        response = self.client.get("/api/donations/?status=pending")
+        response = self.client.get("/api/donations/?status=pending&all=1")
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["donation_id"], "DON1")
 
@@ -189,7 +191,7 @@ class DonationTests(APITestCase):
 
     # 14. Donation list returns empty if no donations exist
     def test_empty_donations_list(self):
-        response = self.client.get("/api/donations/")
+        response = self.client.get("/api/donations/?all=1")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data), 0)
 
@@ -229,7 +231,7 @@ class DonationTests(APITestCase):
         d_old.donated_at = timezone.make_aware(datetime(2020, 1, 1))
         d_old.save(update_fields=["donated_at"])
 
-        response = self.client.get("/api/donations/?date_from=2023-01-01T00:00:00Z")
+        response = self.client.get("/api/donations/?date_from=2023-01-01T00:00:00Z&all=1")
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["donation_id"], "DON1")
 
@@ -241,14 +243,14 @@ class DonationTests(APITestCase):
         d_old.donated_at = timezone.make_aware(datetime(2020, 1, 1))
         d_old.save(update_fields=["donated_at"])
 
-        response = self.client.get("/api/donations/?date_to=2021-01-01T00:00:00Z")
+        response = self.client.get("/api/donations/?date_to=2021-01-01T00:00:00Z&all=1")
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["donation_id"], "DON2")
 
     # 19. Invalid status value in filter should return 0 results
     def test_invalid_status_param(self):
         Donation.objects.create(donation_id="DON1", restaurant=self.restaurant, status="pending")
-        response = self.client.get("/api/donations/?status=maybe")
+        response = self.client.get("/api/donations/?status=maybe&all=1")
         self.assertEqual(len(response.data), 0)
 
     # 20. PUT donation allowed but FK cannot change
@@ -307,7 +309,7 @@ class DonationTests(APITestCase):
     def test_list_ordering_donated_at(self):
         Donation.objects.create(donation_id="DON1", restaurant=self.restaurant)
         Donation.objects.create(donation_id="DON2", restaurant=self.restaurant)
-        response = self.client.get("/api/donations/")
+        response = self.client.get("/api/donations/?all=1")
         ids = [d["donation_id"] for d in response.data]
         self.assertEqual(ids, ["DON1", "DON2"])
 
@@ -375,7 +377,7 @@ class DonationTests(APITestCase):
         Donation.objects.create(donation_id="DON1", restaurant=self.restaurant, status="pending")
         Donation.objects.create(donation_id="DON2", restaurant=self.restaurant, status="accepted")
 
-        response = self.client.get("/api/donations/?restaurant_id=RES001&status=accepted")
+        response = self.client.get("/api/donations/?restaurant_id=RES001&status=accepted&all=1")
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["donation_id"], "DON2")
 
@@ -478,3 +480,28 @@ class DonationTests(APITestCase):
         self.assertEqual(response.status_code, 403)
         donation.refresh_from_db()
         self.assertEqual(donation.status, "pending")
+
+    # 40. ?fields= trims the response and skips the restaurant join
+    def test_sparse_fields_skip_method_fields(self):
+        Donation.objects.create(donation_id="DONSPARSE", restaurant=self.restaurant)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/donations/?fields=donation_id,status&all=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [{"donation_id": "DONSPARSE", "status": "pending"}])
+        select = next(q["sql"] for q in ctx.captured_queries if 'FROM "donation"' in q["sql"])
+        self.assertNotIn('"restaurant"', select.split("FROM")[1])
+        self.assertNotIn('"donated_at"', select)
+
+    # 41. Method fields still render when their relation is requested
+    def test_sparse_fields_keep_requested_method_fields(self):
+        Donation.objects.create(donation_id="DONSPARSE", restaurant=self.restaurant)
+        response = self.client.get("/api/donations/?fields=donation_id,restaurant_name&all=1")
+        self.assertEqual(response.data, [{"donation_id": "DONSPARSE", "restaurant_name": "KFC"}])
+
+    # 42. ?exclude= removes fields from the full set
+    def test_exclude_fields(self):
+        Donation.objects.create(donation_id="DONSPARSE", restaurant=self.restaurant)
+        response = self.client.get("/api/donations/?exclude=created_by_user_id,restaurant_address&all=1")
+        self.assertNotIn("created_by_user_id", response.data[0])
+        self.assertNotIn("restaurant_address", response.data[0])
+        self.assertEqual(response.data[0]["restaurant_branch"], "Central")
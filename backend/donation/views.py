@@ -7,7 +7,7 @@ from rest_framework.response import Response
 
 from .models import Donation
 from .serializers import DonationSerializer
-from users.models import User
+from re_meals_api.sparse_fields import SparseFieldsetViewMixin
 
 
 def _parse_datetime_param(value):
@@ -26,7 +26,7 @@ def _parse_datetime_param(value):
     return dt
 
 
-class DonationViewSet(viewsets.ModelViewSet):
+class DonationViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Donation.objects.select_related("restaurant", "created_by").all()
     serializer_class = DonationSerializer
 
@@ -38,29 +38,19 @@ class DonationViewSet(viewsets.ModelViewSet):
     def _is_admin(self):
         return self._str_to_bool(self.request.headers.get("X-USER-IS-ADMIN"))
 
-    def _get_current_user(self):
-        """Get the current user from request headers."""
-        user_id = self.request.headers.get("X-USER-ID")
-        if not user_id:
-            return None
-        try:
-            return User.objects.get(user_id=user_id)
-        except User.DoesNotExist:
-            return None
-
     def _is_restaurant_representative(self, donation):
         """Check if the current user is a representative of the donation's restaurant."""
-        user = self._get_current_user()
-        if not user or not user.restaurant:
+        user = self.request.remeals_user
+        if not user.restaurant_id:
             return False
-        return user.restaurant.restaurant_id == donation.restaurant.restaurant_id
+        return user.restaurant_id == donation.restaurant_id
 
     def _is_donation_creator(self, donation):
         """Check if the current user is the creator of the donation."""
-        user = self._get_current_user()
-        if not user:
+        user = self.request.remeals_user
+        if not user.is_authenticated:
             return False
-        return donation.created_by == user
+        return donation.created_by_id == user.user_id
 
     def _ensure_manageable(self, donation):
         """Ensure the donation can be modified or deleted by the current user."""
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0002_alter_community_warehouse_id_delete_warehouse'),
+        ('donation_request', '0008_set_created_by_from_recipient'),
+        ('users', '0011_add_user_role_flags'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donationrequest',
+            index=models.Index(fields=['-created_at', '-request_id'], name='donation_request_created_idx'),
+        ),
+    ]
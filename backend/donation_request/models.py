@@ -1,6 +1,6 @@
 from django.db import models
 
-from re_meals_api.id_utils import generate_prefixed_id
+from re_meals_api.id_utils import PrefixedIdManager, generate_prefixed_id
 from community.models import Community
 
 
@@ -38,9 +38,15 @@ class DonationRequest(models.Model):
         related_name='donation_requests',
     )
 
+    objects = PrefixedIdManager()
+
     class Meta:
         db_table = "donation_request"
         ordering = ["-created_at"]
+        indexes = [
+            # Lists are paged on (-created_at, -request_id).
+            models.Index(fields=["-created_at", "-request_id"], name="donation_request_created_idx"),
+        ]
 
     def __str__(self):
         return f"DonationRequest {self.request_id}"
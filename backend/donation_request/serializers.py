@@ -3,11 +3,11 @@ from rest_framework import serializers
 
 from community.models import Community
 from warehouse.models import Warehouse
-from users.models import User
 from .models import DonationRequest
+from re_meals_api.sparse_fields import SparseFieldsetMixin
 
 
-class DonationRequestSerializer(serializers.ModelSerializer):
+class DonationRequestSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     request_id = serializers.CharField(read_only=True)
     community_id = serializers.PrimaryKeyRelatedField(
         queryset=Community.objects.all(),
@@ -45,7 +45,7 @@ class DonationRequestSerializer(serializers.ModelSerializer):
         return attrs
     community_name = serializers.CharField(required=False)
 
-    created_by_user_id = serializers.CharField(source='created_by.user_id', read_only=True, allow_null=True)
+    created_by_user_id = serializers.CharField(source='created_by_id', read_only=True, allow_null=True)
 
     class Meta:
         model = DonationRequest
@@ -108,17 +108,10 @@ class DonationRequestSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({
                 "community_id": "Either community_id or community_name is required."
             })
-        # Set created_by from request context if available
-        request = self.context.get('request')
-        if request:
-            # Try to get user from headers
-            user_id = request.headers.get("X-USER-ID")
-            if user_id:
-                try:
-                    user = User.objects.get(user_id=user_id)
-                    validated_data["created_by"] = user
-                except User.DoesNotExist:
-                    pass
+        # Set created_by from the caller resolved for this request, if any
+        user = getattr(self.context.get('request'), "remeals_user", None)
+        if user is not None and user.is_authenticated:
+            validated_data["created_by_id"] = user.user_id
         return super().create(validated_data)
 
     def update(self, instance, validated_data):
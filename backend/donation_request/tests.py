@@ -120,7 +120,7 @@ class DonationRequestAPITests(APITestCase):
 
     # 3. Non-admin can list all requests
     def test_non_admin_can_view_all_requests(self):
-        response = self.client.get(reverse("donation-request-list"))
+        response = self.client.get(reverse("donation-request-list"), {"all": 1})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 2)
         returned_ids = {item["request_id"] for item in response.data}
@@ -130,7 +130,7 @@ class DonationRequestAPITests(APITestCase):
 
     # 4. Anonymous users can read the request list
     def test_anonymous_user_can_view_requests(self):
-        response = self.client.get(reverse("donation-request-list"))
+        response = self.client.get(reverse("donation-request-list"), {"all": 1})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 2)
 
@@ -138,6 +138,7 @@ class DonationRequestAPITests(APITestCase):
     def test_admin_sees_all_requests(self):
         response = self.client.get(
             reverse("donation-request-list"),
+            {"all": 1},
             **self._headers(self.recipient_one, is_admin=True),
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -205,7 +206,7 @@ class DonationRequestAPITests(APITestCase):
 
     # 11. Listing exposes the created_at timestamp
     def test_list_includes_created_at(self):
-        response = self.client.get(reverse("donation-request-list"))
+        response = self.client.get(reverse("donation-request-list"), {"all": 1})
         self.assertTrue(all("created_at" in item for item in response.data))
 
     # 12. Detail response returns contact_phone and notes
@@ -384,7 +385,7 @@ class DonationRequestAPITests(APITestCase):
     # 21. Listing can filter by community_id
     def test_list_filters_by_community_id(self):
         response = self.client.get(
-            f"{reverse('donation-request-list')}?community_id={self.community_one.community_id}"
+            f"{reverse('donation-request-list')}?community_id={self.community_one.community_id}&all=1"
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 2)
@@ -401,7 +402,7 @@ class DonationRequestAPITests(APITestCase):
     # 23. Collection supports searching for recipient_address (partial)
     def test_list_supports_recipient_address_contains(self):
         response = self.client.get(
-            f"{reverse('donation-request-list')}?recipient_address=Zone"
+            f"{reverse('donation-request-list')}?recipient_address=Zone&all=1"
         )
         self.assertTrue(any("Zone" in item["recipient_address"] for item in response.data))
 
@@ -426,7 +427,7 @@ class DonationRequestAPITests(APITestCase):
     # 26. Filtering by people_count returns matching requests
     def test_filter_by_people_count(self):
         response = self.client.get(
-            f"{reverse('donation-request-list')}?people_count=120"
+            f"{reverse('donation-request-list')}?people_count=120&all=1"
         )
         self.assertTrue(any(item["people_count"] == 120 for item in response.data))
 
@@ -3,11 +3,11 @@ from rest_framework.response import Response
 
 from .models import DonationRequest
 from .serializers import DonationRequestSerializer
-from users.models import User, Recipient
 from delivery.models import Delivery
+from re_meals_api.sparse_fields import SparseFieldsetViewMixin
 
 
-class DonationRequestViewSet(viewsets.ModelViewSet):
+class DonationRequestViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = DonationRequest.objects.select_related("community", "created_by").all()
     serializer_class = DonationRequestSerializer
     permission_classes = [permissions.AllowAny]
@@ -26,40 +26,26 @@ class DonationRequestViewSet(viewsets.ModelViewSet):
     def _is_admin(self):
         return self._str_to_bool(self.request.headers.get("X-USER-IS-ADMIN"))
 
-    def _get_current_user(self):
-        """Get the current user from request headers."""
-        user_id = self.request.headers.get("X-USER-ID")
-        if not user_id:
-            return None
-        try:
-            return User.objects.get(user_id=user_id)
-        except User.DoesNotExist:
-            return None
-
     def _is_request_owner(self, donation_request):
         """Check if the current user owns this donation request."""
-        user = self._get_current_user()
-        if not user:
+        user = self.request.remeals_user
+        if not user.is_authenticated:
             return False
         
         # Primary check: if user is the creator (created_by matches)
         # This works for both donors and recipients
-        if donation_request.created_by == user:
+        if donation_request.created_by_id == user.user_id:
             return True
         
         # Fallback: check if user is a recipient and their donation_request matches
         # This handles legacy requests where created_by might be NULL
-        try:
-            recipient = Recipient.objects.get(user=user)
-            if recipient.donation_request == donation_request:
-                return True
-        except Recipient.DoesNotExist:
-            pass
+        if user.recipient_request_id and user.recipient_request_id == donation_request.request_id:
+            return True
         
         # Additional fallback for legacy requests: if created_by is NULL,
         # check if contact_phone matches (less secure but helps with old requests)
         # Only allow this if status is pending (not accepted)
-        if (donation_request.created_by is None and 
+        if (donation_request.created_by_id is None and 
             donation_request.status == "pending" and
             donation_request.contact_phone and
             user.phone and
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from fooditem.models import FoodItem
+from warehouse.inventory import invalidate_all_warehouse_inventory
+
+
+class Command(BaseCommand):
+    help = 'Flag food items past their expire_date as expired, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Items flagged per UPDATE (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1.')
+
+        total = 0
+        for count in FoodItem.objects.expire_due(chunk_size=options['chunk_size']):
+            total += count
+        if total:
+            invalidate_all_warehouse_inventory()
+        self.stdout.write(self.style.SUCCESS(f'✓ Flagged {total} food items as expired'))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-17 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation', '0005_add_created_by'),
+        ('fooditem', '0003_merge_0002_add_category_0002_fooditem_chain'),
+        ('restaurant_chain', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(fields=['expire_date', 'is_expired'], name='fooditem_expiry_idx'),
+        ),
+    ]
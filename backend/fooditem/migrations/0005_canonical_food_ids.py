@@ -0,0 +1,35 @@
+# Generated manually to rewrite legacy food ids (FOO0014, F0014) to FOO0000014
+
+from django.db import migrations
+
+from re_meals_api.id_utils import canonical_prefixed_id
+
+
+def canonicalize_food_ids(apps, schema_editor):
+    FoodItem = apps.get_model("fooditem", "FoodItem")
+    Delivery = apps.get_model("delivery", "Delivery")
+    ImpactRecord = apps.get_model("impactrecord", "ImpactRecord")
+
+    existing = set(FoodItem.objects.values_list("food_id", flat=True))
+    for food_id in sorted(existing):
+        canonical = canonical_prefixed_id(food_id, "FOO", padding=7, aliases=("F",))
+        # Leave an id alone if its canonical form is already taken.
+        if canonical == food_id or canonical in existing:
+            continue
+        FoodItem.objects.filter(food_id=food_id).update(food_id=canonical)
+        Delivery.objects.filter(food_item_id=food_id).update(food_item_id=canonical)
+        ImpactRecord.objects.filter(food_id=food_id).update(food_id=canonical)
+        existing.add(canonical)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fooditem", "0004_fooditem_expiry_idx"),
+        ("delivery", "0018_backfill_quantity_value_unit"),
+        ("impactrecord", "0005_seed_impact_factor"),
+    ]
+
+    operations = [
+        migrations.RunPython(canonicalize_food_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation', '0006_donation_donation_status_page_idx_and_more'),
+        ('fooditem', '0005_canonical_food_ids'),
+        ('restaurant_chain', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(fields=['donation', 'food_id'], name='fooditem_donation_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(condition=models.Q(('is_distributed', False)), fields=['food_id'], name='fooditem_undistributed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(condition=models.Q(('is_claimed', False)), fields=['food_id'], name='fooditem_unclaimed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(condition=models.Q(('is_expired', False)), fields=['food_id'], name='fooditem_unexpired_idx'),
+        ),
+    ]
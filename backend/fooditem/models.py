@@ -1,12 +1,82 @@
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 
 from donation.models import Donation
 from restaurant_chain.models import RestaurantChain
-from re_meals_api.id_utils import generate_prefixed_id
+from re_meals_api.id_utils import PrefixedIdManager, canonical_prefixed_id, generate_prefixed_id
+
+
+class InsufficientQuantity(ValueError):
+    """Raised when a deduction would take a food item's quantity below zero."""
+
+
+class FoodItemManager(PrefixedIdManager):
+    def bulk_create_with_ids(self, objs, **kwargs):
+        """
+        Insert food items with canonical ids, each inheriting its donation's
+        restaurant chain. The chains of all donations are read in one query.
+        """
+        objs = list(objs)
+        donation_ids = {obj.donation_id for obj in objs if obj.donation_id and not obj.chain_id}
+        chains = dict(
+            Donation.objects.filter(pk__in=donation_ids).values_list("pk", "restaurant__chain_id")
+        ) if donation_ids else {}
+        for obj in objs:
+            if obj.donation_id and not obj.chain_id:
+                obj.chain_id = chains.get(obj.donation_id)
+            if obj.food_id:
+                obj.food_id = self.model.canonical_id(obj.food_id)
+        return super().bulk_create_with_ids(objs, **kwargs)
+
+    def deduct_quantity(self, food_id, amount):
+        """
+        Take `amount` units from the food item in one conditional UPDATE.
+
+        The row is only changed when enough stock is left, so two concurrent
+        deliveries can never oversell the same item.
+        """
+        if amount <= 0:
+            return
+        updated = self.filter(pk=food_id, quantity__gte=amount).update(
+            quantity=F("quantity") - amount
+        )
+        if not updated:
+            item = self.filter(pk=food_id).values("name", "quantity").first()
+            if item is None:
+                raise self.model.DoesNotExist(f"Food item {food_id} does not exist.")
+            raise InsufficientQuantity(
+                f"Delivery quantity ({amount}) exceeds available quantity "
+                f"({item['quantity']}) for {item['name']}"
+            )
+
+    def restore_quantity(self, food_id, amount):
+        """Give `amount` units back to the food item in one UPDATE."""
+        if amount <= 0:
+            return
+        self.filter(pk=food_id).update(quantity=F("quantity") + amount)
+
+    def expire_due(self, today=None, chunk_size=1000):
+        """
+        Flag items whose expire_date has passed, chunk_size rows at a time.
+
+        Each chunk is one indexed SELECT on (expire_date, is_expired) and one
+        UPDATE by primary key, so a large backlog never holds long row locks.
+        Yields the number of items flagged per chunk.
+        """
+        today = today or timezone.localdate()
+        due = self.filter(expire_date__lt=today, is_expired=False).order_by("expire_date")
+        while True:
+            ids = list(due.values_list("pk", flat=True)[:chunk_size])
+            if not ids:
+                return
+            yield self.filter(pk__in=ids, is_expired=False).update(is_expired=True)
 
 
 class FoodItem(models.Model):
     PREFIX = "FOO"
+    # Older clients sent F0000014 for FOO0000014.
+    LEGACY_PREFIXES = ("F",)
 
     food_id = models.CharField(max_length=10, primary_key=True)
     name = models.CharField(max_length=100)
@@ -40,15 +110,50 @@ class FoodItem(models.Model):
         related_name="food_items",
     )
 
+    objects = FoodItemManager()
+
     class Meta:
         db_table = "fooditem"
         ordering = ["food_id"]
+        indexes = [
+            # Lets the expiry sweeper find due items without a table scan.
+            models.Index(fields=["expire_date", "is_expired"], name="fooditem_expiry_idx"),
+            # ?donation= lists, paged in food_id order.
+            models.Index(fields=["donation", "food_id"], name="fooditem_donation_page_idx"),
+            # ?is_distributed=false, ?is_claimed=false and ?is_expired=false
+            # lists only walk the rows still in stock, not the history.
+            models.Index(
+                fields=["food_id"],
+                condition=models.Q(is_distributed=False),
+                name="fooditem_undistributed_idx",
+            ),
+            models.Index(
+                fields=["food_id"],
+                condition=models.Q(is_claimed=False),
+                name="fooditem_unclaimed_idx",
+            ),
+            models.Index(
+                fields=["food_id"],
+                condition=models.Q(is_expired=False),
+                name="fooditem_unexpired_idx",
+            ),
+        ]
 
-    def save(self, *args, **kwargs):
+    @classmethod
+    def canonical_id(cls, value):
+        """The stored form of a food id given as FOO0000014, FOO14, F0014 or 14."""
+        return canonical_prefixed_id(value, cls.PREFIX, padding=7, aliases=cls.LEGACY_PREFIXES)
+
+    def inherit_chain_from_donation(self):
         if self.donation and not self.chain:
             restaurant = getattr(self.donation, "restaurant", None)
             if restaurant and restaurant.chain:
                 self.chain = restaurant.chain
+
+    def save(self, *args, **kwargs):
+        self.inherit_chain_from_donation()
+        if self.food_id and self._state.adding:
+            self.food_id = self.canonical_id(self.food_id)
         if not self.food_id:
             self.food_id = generate_prefixed_id(
                 self.__class__,
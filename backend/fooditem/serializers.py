@@ -3,9 +3,33 @@ from datetime import date
 from rest_framework import serializers
 
 from .models import FoodItem
+from re_meals_api.sparse_fields import SparseFieldsetMixin
 
 
-class FoodItemSerializer(serializers.ModelSerializer):
+class FoodItemIdField(serializers.SlugRelatedField):
+    """
+    Food item reference by food_id. Incoming ids are made canonical first, so
+    legacy forms resolve in one query; output is read off the foreign key
+    column without loading the item.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("slug_field", "food_id")
+        if not kwargs.get("read_only"):
+            kwargs.setdefault("queryset", FoodItem.objects.all())
+        super().__init__(**kwargs)
+
+    def use_pk_only_optimization(self):
+        return True
+
+    def to_internal_value(self, data):
+        return super().to_internal_value(FoodItem.canonical_id(data))
+
+    def to_representation(self, value):
+        return value.pk
+
+
+class FoodItemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer enforcing domain validation rules and formatting."""
 
     def validate(self, attrs):
@@ -76,30 +100,16 @@ class FoodItemSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(f"Invalid category. Allowed: {', '.join(sorted(allowed))}")
         return value
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        food_id = data.get("food_id")
-        if food_id:
-            # Normalize to FOO0000001 format to match impact records
-            data["food_id"] = self._format_food_id(food_id)
-        return data
-
-    @staticmethod
-    def _format_food_id(value: str) -> str:
-        """
-        Normalize food_id to FOO{7digits} format to match impact records.
-        Handles both FOO0000001 (database format) and F0001 (legacy format).
-        """
-        if not value:
-            return value
-        
-        # Extract digits from the food_id
-        digits = "".join(ch for ch in value if ch.isdigit())
-        if not digits:
-            return value
-        
-        # Return in FOO{7digits} format to match impact records and database
-        return f"FOO{digits.zfill(7)}"
+    def validate_food_id(self, value):
+        # The unique check above ran on the raw value; repeat it on the
+        # stored form so F0014 cannot overwrite FOO0000014.
+        value = FoodItem.canonical_id(value)
+        existing = FoodItem.objects.filter(food_id=value)
+        if self.instance is not None:
+            existing = existing.exclude(pk=self.instance.pk)
+        if existing.exists():
+            raise serializers.ValidationError("food item with this food id already exists.")
+        return value
 
     class Meta:
         model = FoodItem
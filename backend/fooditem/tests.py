@@ -1,8 +1,16 @@
 from datetime import date, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 
+from re_meals_api.pagination import KeysetPagination
 from restaurants.models import Restaurant
 from restaurant_chain.models import RestaurantChain
 from donation.models import Donation
@@ -68,7 +76,7 @@ class FoodItemTests(APITestCase):
             expire_date=self.future_expire,
             donation=self.donation
         )
-        res = self.client.get("/api/fooditems/")
+        res = self.client.get("/api/fooditems/?all=1")
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data), 1)
 
@@ -199,7 +207,7 @@ class FoodItemTests(APITestCase):
             unit="cup", expire_date=self.future_expire, donation=donation2
         )
 
-        res = self.client.get("/api/fooditems/?donation=DON0001")
+        res = self.client.get("/api/fooditems/?donation=DON0001&all=1")
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data), 1)  # Only 1 for DON0001
 
@@ -282,7 +290,7 @@ class FoodItemTests(APITestCase):
             donation=self.donation
         )
 
-        res = self.client.get("/api/fooditems/?is_expired=true")
+        res = self.client.get("/api/fooditems/?is_expired=true&all=1")
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data), 1)
         self.assertEqual(res.data[0]["food_id"], "FOO0000001")
@@ -301,7 +309,7 @@ class FoodItemTests(APITestCase):
             donation=self.donation
         )
 
-        res = self.client.get("/api/fooditems/?is_claimed=true")
+        res = self.client.get("/api/fooditems/?is_claimed=true&all=1")
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data), 1)
         self.assertEqual(res.data[0]["food_id"], "FOO0000001")
@@ -396,7 +404,7 @@ class FoodItemTests(APITestCase):
             unit="box", expire_date=self.future_expire, donation=self.donation
         )
 
-        res = self.client.get("/api/fooditems/")
+        res = self.client.get("/api/fooditems/?all=1")
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data[0]["food_id"], "FOO0000001")  # ordered
 
@@ -478,7 +486,7 @@ class FoodItemTests(APITestCase):
             is_claimed=True, is_expired=True
         )
 
-        res = self.client.get("/api/fooditems/?is_claimed=true&is_expired=true")
+        res = self.client.get("/api/fooditems/?is_claimed=true&is_expired=true&all=1")
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         # Only 1 item matches both filters
         self.assertEqual(len(res.data), 1)
@@ -529,7 +537,7 @@ class FoodItemTests(APITestCase):
             is_expired=False
         )
 
-        res = self.client.get("/api/fooditems/?is_expired=false")
+        res = self.client.get("/api/fooditems/?is_expired=false&all=1")
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data), 1)
 
@@ -548,3 +556,207 @@ class FoodItemTests(APITestCase):
 
         res = self.client.post("/api/fooditems/", data, format="json")
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # 31. Lists are paginated by cursor in food_id order
+    def test_list_pages_follow_cursor(self):
+        FoodItem.objects.bulk_create_with_ids(
+            FoodItem(
+                name=f"Item {i}", quantity=1, unit="box",
+                expire_date=self.future_expire, donation=self.donation,
+            )
+            for i in range(5)
+        )
+        first = self.client.get("/api/fooditems/?page_size=2")
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["food_id"] for item in first.data["results"]],
+            ["FOO0000001", "FOO0000002"],
+        )
+
+        # Rows inserted before the cursor position do not shift later pages
+        FoodItem.objects.create(
+            food_id="FOO0000000", name="Early", quantity=1, unit="box",
+            expire_date=self.future_expire, donation=self.donation,
+        )
+        second = self.client.get(first.data["next"])
+        self.assertEqual(
+            [item["food_id"] for item in second.data["results"]],
+            ["FOO0000003", "FOO0000004"],
+        )
+        third = self.client.get(second.data["next"])
+        self.assertEqual([item["food_id"] for item in third.data["results"]], ["FOO0000005"])
+        self.assertIsNone(third.data["next"])
+
+    # 32. page_size is capped at the configured maximum
+    @patch.object(KeysetPagination, "max_page_size", 3)
+    def test_page_size_is_capped(self):
+        FoodItem.objects.bulk_create_with_ids(
+            FoodItem(
+                name=f"Item {i}", quantity=1, unit="box",
+                expire_date=self.future_expire, donation=self.donation,
+            )
+            for i in range(5)
+        )
+        res = self.client.get("/api/fooditems/?page_size=100")
+        self.assertEqual(len(res.data["results"]), 3)
+        self.assertIsNotNone(res.data["next"])
+
+    # 33. ?all=1 keeps returning the whole list unpaginated
+    def test_all_returns_plain_list(self):
+        FoodItem.objects.bulk_create_with_ids(
+            FoodItem(
+                name=f"Item {i}", quantity=1, unit="box",
+                expire_date=self.future_expire, donation=self.donation,
+            )
+            for i in range(3)
+        )
+        res = self.client.get("/api/fooditems/?all=1")
+        self.assertIsInstance(res.data, list)
+        self.assertEqual(len(res.data), 3)
+
+    # 34. ?fields= loads only the requested columns
+    def test_sparse_fields_trim_select(self):
+        FoodItem.objects.create(
+            food_id="FOO0000001", name="Rice", quantity=7, unit="kg",
+            expire_date=self.future_expire, donation=self.donation,
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get("/api/fooditems/?fields=quantity,donation")
+        self.assertEqual(res.data["results"], [{"quantity": 7, "donation": "DON0001"}])
+        self.assertEqual(len(ctx.captured_queries), 1)
+        sql = ctx.captured_queries[0]["sql"]
+        self.assertIn('"quantity"', sql)
+        self.assertNotIn('"name"', sql)
+        self.assertNotIn('"expire_date"', sql)
+
+    # 35. Sparse fieldsets do not affect writes
+    def test_sparse_fields_ignored_on_write(self):
+        data = {
+            "food_id": "FOO0000009", "name": "Soup", "quantity": 2, "unit": "bowl",
+            "expire_date": self.future_expire, "donation": "DON0001",
+        }
+        res = self.client.post("/api/fooditems/?fields=name", data, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertIn("quantity", res.data)
+
+    # 36. The expiry sweeper flags only past-due items, in chunks
+    def test_expire_due_flags_in_chunks(self):
+        FoodItem.objects.bulk_create_with_ids(
+            FoodItem(
+                name=f"Old {i}", quantity=1, unit="box",
+                expire_date=date.today() - timedelta(days=i + 1), donation=self.donation,
+            )
+            for i in range(5)
+        )
+        fresh = FoodItem.objects.create(
+            name="Fresh", quantity=1, unit="box",
+            expire_date=date.today(), donation=self.donation,
+        )
+        self.assertEqual(list(FoodItem.objects.expire_due(chunk_size=2)), [2, 2, 1])
+        self.assertEqual(FoodItem.objects.filter(is_expired=True).count(), 5)
+        fresh.refresh_from_db()
+        self.assertFalse(fresh.is_expired)
+        self.assertEqual(list(FoodItem.objects.expire_due()), [])
+
+    # 37. The expire_food_items command reports how many items it flagged
+    def test_expire_food_items_command(self):
+        FoodItem.objects.create(
+            name="Old", quantity=1, unit="box",
+            expire_date=self.past_expire, donation=self.donation,
+        )
+        out = StringIO()
+        call_command("expire_food_items", chunk_size=10, stdout=out)
+        self.assertIn("Flagged 1 food items", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("expire_food_items", chunk_size=0, stdout=StringIO())
+
+    # 38. Legacy id forms are resolved with a single primary-key query
+    def test_legacy_id_lookup_is_one_query(self):
+        item = FoodItem.objects.create(
+            name="Rice", quantity=3, unit="kg",
+            expire_date=self.future_expire, donation=self.donation,
+        )
+        digits = item.food_id[3:]
+        for legacy in (f"F{digits}", f"FOO{int(digits)}", item.food_id.lower()):
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.get(f"/api/fooditems/{legacy}/?fields=food_id")
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.data["food_id"], item.food_id)
+            self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(self.client.get("/api/fooditems/F9999999/").status_code, 404)
+
+    # 39. Ids supplied in a legacy form are stored canonically and stay unique
+    def test_create_stores_canonical_id(self):
+        data = {
+            "food_id": "F14",
+            "name": "Soup",
+            "quantity": 2,
+            "unit": "bowl",
+            "expire_date": self.future_expire,
+            "donation": self.donation.donation_id,
+        }
+        res = self.client.post("/api/fooditems/", data, format="json")
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.data["food_id"], "FOO0000014")
+        self.assertTrue(FoodItem.objects.filter(pk="FOO0000014").exists())
+
+        duplicate = self.client.post("/api/fooditems/", {**data, "food_id": "FOO0014"}, format="json")
+        self.assertEqual(duplicate.status_code, 400)
+        self.assertEqual(FoodItem.objects.count(), 1)
+        self.assertEqual(FoodItem.objects.get().name, "Soup")
+
+    # 40. The migration rewrites stored legacy ids and the rows pointing at them
+    def test_migration_canonicalizes_stored_ids(self):
+        from django.apps import apps
+        from importlib import import_module
+
+        from impactrecord.models import ImpactRecord
+
+        item = FoodItem.objects.create(
+            food_id="FOO0000015", name="Bread", quantity=1, unit="box",
+            expire_date=self.future_expire, donation=self.donation,
+        )
+        ImpactRecord.objects.create(food=item, meals_saved=1, weight_saved_kg=1, co2_reduced_kg=1)
+        with connection.constraint_checks_disabled():
+            FoodItem.objects.filter(pk="FOO0000015").update(food_id="F15")
+            ImpactRecord.objects.filter(food_id="FOO0000015").update(food_id="F15")
+
+        migration = import_module("fooditem.migrations.0005_canonical_food_ids")
+        migration.canonicalize_food_ids(apps, None)
+
+        self.assertEqual(list(FoodItem.objects.values_list("food_id", flat=True)), ["FOO0000015"])
+        self.assertEqual(ImpactRecord.objects.get().food_id, "FOO0000015")
+
+    # 41. Bulk inserts store legacy ids canonically and still inherit the chain
+    def test_bulk_create_canonicalizes_ids(self):
+        FoodItem.objects.bulk_create_with_ids([
+            FoodItem(
+                food_id="F14", name="Soup", quantity=2, unit="bowl",
+                expire_date=self.future_expire, donation=self.donation,
+            ),
+        ])
+        self.assertEqual(list(FoodItem.objects.values_list("food_id", flat=True)), ["FOO0000014"])
+        self.assertEqual(FoodItem.objects.get(pk="FOO0000014").chain_id, self.chain.chain_id)
+
+        res = self.client.get("/api/fooditems/F14/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["food_id"], "FOO0000014")
+
+    # 42. Chain inheritance in bulk inserts costs one query, whatever the batch size
+    def test_bulk_create_inherits_chain_in_one_query(self):
+        def insert(count):
+            items = [
+                FoodItem(
+                    name=f"Item {i}", quantity=1, unit="box",
+                    expire_date=self.future_expire, donation_id=self.donation.donation_id,
+                )
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as ctx:
+                FoodItem.objects.bulk_create_with_ids(items)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(insert(2), insert(10))
+        self.assertEqual(
+            set(FoodItem.objects.values_list("chain_id", flat=True)), {self.chain.chain_id}
+        )
@@ -1,5 +1,4 @@
 from django.http import QueryDict
-from django.http import QueryDict
 from rest_framework import viewsets
 from rest_framework.response import Response
 from rest_framework.exceptions import NotFound
@@ -7,38 +6,23 @@ from rest_framework.exceptions import NotFound
 from .models import FoodItem
 from .serializers import FoodItemSerializer
 from impactrecord.models import ImpactRecord
+from re_meals_api.sparse_fields import SparseFieldsetViewMixin
 
 
-class FoodItemViewSet(viewsets.ModelViewSet):
+class FoodItemViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class = FoodItemSerializer
 
     def get_object(self):
         """
-        Override to handle both formatted (F0001) and original (FOO0001) food_id formats.
-        The serializer formats food_id in responses, but the database stores the original format.
+        Look the item up by its canonical id, so legacy forms such as F0014
+        or FOO0014 cost the same single primary-key query as FOO0000014.
         """
         lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
-        food_id = self.kwargs[lookup_url_kwarg]
-        
-        # Try to find by the provided ID first (could be formatted or original)
+        food_id = FoodItem.canonical_id(self.kwargs[lookup_url_kwarg])
         try:
             return FoodItem.objects.get(food_id=food_id)
         except FoodItem.DoesNotExist:
-            pass
-        
-        # If not found, try converting formatted ID (F0001) back to original (FOO0001)
-        # Extract digits from the formatted ID
-        digits = "".join(ch for ch in food_id if ch.isdigit())
-        if digits:
-            # Try with FOO prefix
-            original_id = f"FOO{digits.zfill(4)}"
-            try:
-                return FoodItem.objects.get(food_id=original_id)
-            except FoodItem.DoesNotExist:
-                pass
-        
-        # If still not found, raise NotFound
-        raise NotFound("No FoodItem matches the given query.")
+            raise NotFound("No FoodItem matches the given query.")
 
     def get_queryset(self):
         """
@@ -131,27 +115,7 @@ class FoodItemViewSet(viewsets.ModelViewSet):
     def _create_impact_record(self, item):
         """
         Create an ImpactRecord the first time the food item becomes distributed.
-        Impact values are constant based on quantity — not on food attributes.
+        Values are its quantity times the coefficients of the latest
+        ImpactFactor version for the item's unit and category.
         """
-        from impactrecord.models import ImpactRecord
-        
-        # Check if impact record already exists for this food item
-        if ImpactRecord.objects.filter(food=item).exists():
-            return  # Don't create duplicate
-
-        # Constants (fixed coefficients)
-        MEAL_FACTOR = 0.5
-        WEIGHT_FACTOR = 0.2
-        CO2_FACTOR = 2.5
-
-        meals_saved = item.quantity * MEAL_FACTOR
-        weight_saved = item.quantity * WEIGHT_FACTOR
-        co2_saved = weight_saved * CO2_FACTOR
-
-        # Don't set impact_id - let the model generate it automatically
-        ImpactRecord.objects.create(
-            meals_saved=meals_saved,
-            weight_saved_kg=weight_saved,
-            co2_reduced_kg=co2_saved,
-            food=item
-        )
+        ImpactRecord.objects.create_for_food_items(FoodItem.objects.filter(pk=item.pk))
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import IdSequence
+
+
+@admin.register(IdSequence)
+class IdSequenceAdmin(admin.ModelAdmin):
+    list_display = ("prefix", "last_value")
+    search_fields = ("prefix",)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class IdSequenceConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'id_sequence'
+
+    def ready(self):
+        from . import signals  # noqa: F401
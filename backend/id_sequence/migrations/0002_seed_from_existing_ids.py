@@ -0,0 +1,60 @@
+# Generated manually to seed each prefix counter from the ids already in use
+
+from django.db import migrations
+
+
+PREFIXED_MODELS = [
+    ("restaurant_chain", "RestaurantChain", "chain_id", "CHA"),
+    ("restaurants", "Restaurant", "restaurant_id", "RES"),
+    ("warehouse", "Warehouse", "warehouse_id", "WAH"),
+    ("community", "Community", "community_id", "COM"),
+    ("donation", "Donation", "donation_id", "DON"),
+    ("fooditem", "FoodItem", "food_id", "FOO"),
+    ("impactrecord", "ImpactRecord", "impact_id", "IMP"),
+    ("delivery", "Delivery", "delivery_id", "DLV"),
+    ("donation_request", "DonationRequest", "request_id", "REQ"),
+]
+
+
+def seed_sequences(apps, schema_editor):
+    IdSequence = apps.get_model("id_sequence", "IdSequence")
+    for app_label, model_name, field_name, prefix in PREFIXED_MODELS:
+        model = apps.get_model(app_label, model_name)
+        max_number = 0
+        existing_ids = model.objects.filter(
+            **{f"{field_name}__startswith": prefix}
+        ).values_list(field_name, flat=True)
+        for value in existing_ids.iterator():
+            suffix = value[len(prefix):]
+            if suffix.isdigit():
+                max_number = max(max_number, int(suffix))
+        IdSequence.objects.update_or_create(
+            prefix=prefix, defaults={"last_value": max_number}
+        )
+
+
+def unseed_sequences(apps, schema_editor):
+    IdSequence = apps.get_model("id_sequence", "IdSequence")
+    IdSequence.objects.filter(
+        prefix__in=[prefix for *_, prefix in PREFIXED_MODELS]
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('id_sequence', '0001_initial'),
+        ('community', '0002_alter_community_warehouse_id_delete_warehouse'),
+        ('delivery', '0016_alter_delivery_status'),
+        ('donation', '0005_add_created_by'),
+        ('donation_request', '0008_set_created_by_from_recipient'),
+        ('fooditem', '0003_merge_0002_add_category_0002_fooditem_chain'),
+        ('impactrecord', '0001_initial'),
+        ('restaurant_chain', '0001_initial'),
+        ('restaurants', '0002_alter_restaurant_chain'),
+        ('warehouse', '0002_alter_warehouse_address'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_sequences, unseed_sequences),
+    ]
@@ -0,0 +1,73 @@
+from django.db import IntegrityError, connections, models, router, transaction
+from django.db.models import F
+
+
+class IdSequenceManager(models.Manager):
+    def allocate(self, prefix, count=1, seed=None):
+        """
+        Reserve `count` consecutive numbers for `prefix` and return the last one.
+
+        The increment runs as a single UPDATE on the counter row, so concurrent
+        callers never receive the same number. When the row does not exist yet
+        it is created from `seed()` (the highest number already in use).
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1.")
+
+        using = router.db_for_write(self.model)
+        value = self._increment(using, prefix, count)
+        if value is None:
+            start = seed() if seed else 0
+            try:
+                with transaction.atomic(using=using):
+                    self.using(using).create(prefix=prefix, last_value=start)
+            except IntegrityError:
+                # Another request created the row first; just increment it.
+                pass
+            value = self._increment(using, prefix, count)
+        return value
+
+    def advance_to(self, prefix, value):
+        """Make sure `prefix` never hands out `value` or anything below it."""
+        using = router.db_for_write(self.model)
+        return (
+            self.using(using)
+            .filter(prefix=prefix, last_value__lt=value)
+            .update(last_value=value)
+        )
+
+    def _increment(self, using, prefix, count):
+        connection = connections[using]
+        if connection.features.can_return_columns_from_insert:
+            # PostgreSQL and SQLite >= 3.35 support UPDATE ... RETURNING.
+            table = connection.ops.quote_name(self.model._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {table} SET last_value = last_value + %s "
+                    f"WHERE prefix = %s RETURNING last_value",
+                    [count, prefix],
+                )
+                row = cursor.fetchone()
+            return row[0] if row else None
+
+        # The UPDATE holds the row lock, so the read below sees our own increment.
+        queryset = self.using(using).filter(prefix=prefix)
+        with transaction.atomic(using=using):
+            if not queryset.update(last_value=F("last_value") + count):
+                return None
+            return queryset.values_list("last_value", flat=True).get()
+
+
+class IdSequence(models.Model):
+    """Last number handed out for each prefixed primary key (DON, FOO, ...)."""
+
+    prefix = models.CharField(max_length=10, primary_key=True)
+    last_value = models.BigIntegerField(default=0)
+
+    objects = IdSequenceManager()
+
+    class Meta:
+        db_table = "id_sequence"
+
+    def __str__(self):
+        return f"{self.prefix} @ {self.last_value}"
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from re_meals_api.id_utils import parse_suffix, was_allocated
+from .models import IdSequence
+
+
+@receiver(post_save)
+def sync_sequence_with_supplied_id(sender, instance, created, **kwargs):
+    """
+    Keep the counter ahead of ids that were supplied explicitly (API payloads,
+    fixtures loaded with loaddata) so later allocations never collide with them.
+    """
+    prefix = getattr(sender, "PREFIX", None)
+    if not created or not prefix:
+        return
+
+    value = instance.pk
+    if not isinstance(value, str) or was_allocated(prefix, value):
+        return
+
+    number = parse_suffix(value, prefix)
+    if number is not None:
+        IdSequence.objects.advance_to(prefix, number)
@@ -0,0 +1,124 @@
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from re_meals_api.id_utils import generate_prefixed_id, generate_prefixed_id_block
+from restaurants.models import Restaurant
+from donation.models import Donation
+from fooditem.models import FoodItem
+from restaurant_chain.models import RestaurantChain
+from warehouse.models import Warehouse
+from .models import IdSequence
+
+
+class IdSequenceTests(TestCase):
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(
+            restaurant_id="RES0000001",
+            address="Bangkok",
+            name="KFC",
+            branch_name="Central",
+        )
+
+    def _warehouse(self, **kwargs):
+        return Warehouse.objects.create(
+            address="Storage Lane",
+            capacity=100.0,
+            stored_date=date.today(),
+            exp_date=date.today() + timedelta(days=30),
+            **kwargs,
+        )
+
+    # 1. Generated ids keep the PREFIX + zero-padded number format.
+    def test_generated_ids_are_sequential_and_padded(self):
+        first = Donation.objects.create(restaurant=self.restaurant)
+        second = Donation.objects.create(restaurant=self.restaurant)
+        self.assertEqual(first.donation_id, "DON0000001")
+        self.assertEqual(second.donation_id, "DON0000002")
+
+    # 2. Allocation cost does not depend on the number of existing rows.
+    def test_allocation_does_not_scan_table(self):
+        for _ in range(5):
+            Donation.objects.create(restaurant=self.restaurant)
+        with CaptureQueriesContext(connection) as ctx:
+            generate_prefixed_id(Donation, "donation_id", "DON", padding=7)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('FROM "donation"', ctx.captured_queries[0]["sql"])
+
+    # 3. Explicitly supplied ids push the counter forward.
+    def test_supplied_id_advances_counter(self):
+        Donation.objects.create(donation_id="DON0000041", restaurant=self.restaurant)
+        donation = Donation.objects.create(restaurant=self.restaurant)
+        self.assertEqual(donation.donation_id, "DON0000042")
+
+    # 4. Supplied ids with other formats are ignored by the counter.
+    def test_non_numeric_supplied_id_is_ignored(self):
+        self._warehouse(warehouse_id="WAHOVERRIDE")
+        warehouse = self._warehouse()
+        self.assertEqual(warehouse.warehouse_id, "WAH0000001")
+
+    # 5. A prefix without a counter row is seeded from the current maximum.
+    def test_missing_counter_is_seeded_from_existing_ids(self):
+        self._warehouse(warehouse_id="WAH0000007")
+        IdSequence.objects.filter(prefix="WAH").delete()
+        warehouse = self._warehouse()
+        self.assertEqual(warehouse.warehouse_id, "WAH0000008")
+        self.assertEqual(IdSequence.objects.get(prefix="WAH").last_value, 8)
+
+    # 6. Allocating a range returns the last number of the range.
+    def test_allocate_reserves_count_numbers(self):
+        IdSequence.objects.update_or_create(prefix="TST", defaults={"last_value": 10})
+        self.assertEqual(IdSequence.objects.allocate("TST", count=5), 15)
+        self.assertEqual(IdSequence.objects.allocate("TST"), 16)
+
+    # 7. Allocating zero numbers is rejected.
+    def test_allocate_rejects_non_positive_count(self):
+        with self.assertRaises(ValueError):
+            IdSequence.objects.allocate("TST", count=0)
+
+    # 8. A block of ids is contiguous and reserved in one query.
+    def test_block_allocation_is_contiguous(self):
+        Donation.objects.create(restaurant=self.restaurant)
+        with CaptureQueriesContext(connection) as ctx:
+            ids = generate_prefixed_id_block(Donation, "donation_id", "DON", 3, padding=7)
+        self.assertEqual(ids, ["DON0000002", "DON0000003", "DON0000004"])
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(Donation.objects.create(restaurant=self.restaurant).donation_id, "DON0000005")
+
+    # 9. bulk_create_with_ids assigns ids and keeps supplied ones.
+    def test_bulk_create_with_ids_fills_missing_ids(self):
+        donations = Donation.objects.bulk_create_with_ids(
+            [
+                Donation(restaurant=self.restaurant),
+                Donation(donation_id="DON0000010", restaurant=self.restaurant),
+                Donation(restaurant=self.restaurant),
+            ]
+        )
+        self.assertEqual(
+            [d.donation_id for d in donations],
+            ["DON0000011", "DON0000010", "DON0000012"],
+        )
+        self.assertEqual(Donation.objects.count(), 3)
+        self.assertEqual(Donation.objects.create(restaurant=self.restaurant).donation_id, "DON0000013")
+
+    # 10. Bulk inserts of food items still inherit the restaurant chain.
+    def test_bulk_create_food_items_inherits_chain(self):
+        chain = RestaurantChain.objects.create(chain_name="KFC Group")
+        self.restaurant.chain = chain
+        self.restaurant.save()
+        donation = Donation.objects.create(restaurant=self.restaurant)
+        items = FoodItem.objects.bulk_create_with_ids(
+            FoodItem(
+                name=f"Item {i}",
+                quantity=1,
+                unit="kg",
+                expire_date=date.today() + timedelta(days=3),
+                donation=donation,
+            )
+            for i in range(50)
+        )
+        self.assertEqual(items[0].food_id, "FOO0000001")
+        self.assertEqual(items[-1].food_id, "FOO0000050")
+        self.assertEqual(FoodItem.objects.filter(chain=chain).count(), 50)
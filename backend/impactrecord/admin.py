@@ -1,3 +1,9 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ImpactFactor
+
+
+@admin.register(ImpactFactor)
+class ImpactFactorAdmin(admin.ModelAdmin):
+    list_display = ("version", "unit", "category", "meal_factor", "weight_factor", "co2_factor", "created_at")
+    list_filter = ("version",)
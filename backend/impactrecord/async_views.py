@@ -0,0 +1,52 @@
+from django.http import HttpResponseNotModified
+from django.views.decorators.http import require_GET
+
+from .heatmap import aget_heat_map
+from .models import ImpactRecord, ImpactRollup
+from .serializers import HeatMapQuerySerializer, ImpactRecordSerializer, ImpactSummaryQuerySerializer
+from re_meals_api.async_api import json_response, keyset_page, query_params
+from re_meals_api.db_router import use_replica
+
+
+@require_GET
+@use_replica
+async def impact_list(request):
+    """Async variant of the impact record list, with the same cursor pages."""
+    return await keyset_page(request, ImpactRecord.objects.all(), ImpactRecordSerializer)
+
+
+@require_GET
+@use_replica
+async def impact_summary(request):
+    """Async variant of ImpactRecordViewSet.summary."""
+    filters, error = query_params(ImpactSummaryQuerySerializer, request)
+    if error:
+        return error
+    filters = dict(filters)
+    period = filters.pop("period")
+
+    records = ImpactRollup.objects.scoped(**filters)
+    return json_response(
+        {
+            "totals": await records.atotals(),
+            "period": period,
+            "series": await records.aseries(period),
+        }
+    )
+
+
+@require_GET
+@use_replica
+async def heat_map(request):
+    """Async variant of ImpactRecordViewSet.heat_map, with the same ETag."""
+    params, error = query_params(HeatMapQuerySerializer, request)
+    if error:
+        return error
+    cells, etag = await aget_heat_map(**params)
+
+    if etag in {tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")}:
+        response = HttpResponseNotModified()
+    else:
+        response = json_response({"cells": cells})
+    response["ETag"] = etag
+    return response
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Case, Count, DateField, F, FloatField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, TruncMonth
+
+from delivery.models import Delivery
+
+VERSION_KEY = "impact-heat-map:version"
+
+
+def _delivered_distributions():
+    return Delivery.objects.filter(
+        delivery_type="distribution",
+        status="delivered",
+        community_id__isnull=False,
+    )
+
+
+def _food_item_total(aggregate):
+    """Correlated subquery over the delivered distributions of the same food item."""
+    return Subquery(
+        _delivered_distributions()
+        .filter(food_item=OuterRef("food_item"))
+        .order_by()
+        .values("food_item")
+        .annotate(total=aggregate)
+        .values("total")
+    )
+
+
+def _cell_rows(date_from=None, date_to=None, community=None):
+    """
+    Meals saved per (community, month of drop-off), in one SQL statement.
+
+    Each delivered distribution delivery is joined to its food item's impact
+    record and takes a share of it in proportion to its quantity among the
+    item's delivered distributions (evenly when none has a quantity).
+    """
+    quantity = Coalesce(Cast("quantity_value", FloatField()), Value(0.0))
+    item_quantity = _food_item_total(Sum(Cast("quantity_value", FloatField())))
+    item_deliveries = Cast(_food_item_total(Count("pk")), FloatField())
+    share = Case(
+        When(item_quantity__gt=0, then=quantity / F("item_quantity")),
+        default=Value(1.0) / F("item_deliveries"),
+        output_field=FloatField(),
+    )
+
+    deliveries = _delivered_distributions().filter(food_item__impact__isnull=False)
+    if community:
+        deliveries = deliveries.filter(community_id=community)
+    deliveries = deliveries.annotate(
+        month=TruncMonth("dropoff_time", output_field=DateField()),
+        item_quantity=item_quantity,
+        item_deliveries=item_deliveries,
+    )
+    if date_from:
+        deliveries = deliveries.filter(month__gte=date_from.replace(day=1))
+    if date_to:
+        deliveries = deliveries.filter(month__lte=date_to)
+
+    return (
+        deliveries.values("month", community=F("community_id"), community_name=F("community_id__name"))
+        .annotate(meals=Sum(F("food_item__impact__meals_saved") * share, output_field=FloatField()))
+        .order_by("community", "month")
+    )
+
+
+def _cell(row):
+    return {
+        "community": row["community"],
+        "community_name": row["community_name"],
+        "month": row["month"].strftime("%Y-%m"),
+        "meals": round(row["meals"] or 0, 6),
+    }
+
+
+def _with_etag(cells):
+    digest = hashlib.md5(json.dumps(cells, cls=DjangoJSONEncoder, sort_keys=True).encode()).hexdigest()
+    return cells, f'"{digest}"'
+
+
+def _cache_key(version, date_from, date_to, community):
+    return f"impact-heat-map:{version}:{date_from or ''}:{date_to or ''}:{community or ''}"
+
+
+def get_heat_map(date_from=None, date_to=None, community=None):
+    """
+    Return (cells, etag) for the community × month heat map.
+
+    The result is cached until a delivery or impact record changes (or the
+    cache entry expires); the ETag is a hash of the cells, so an unchanged
+    map keeps its tag even after it has been recomputed.
+    """
+    version = cache.get_or_set(VERSION_KEY, uuid.uuid4().hex, settings.HEAT_MAP_CACHE_SECONDS)
+    key = _cache_key(version, date_from, date_to, community)
+    cached = cache.get(key)
+    if cached is None:
+        cached = _with_etag([_cell(row) for row in _cell_rows(date_from, date_to, community)])
+        cache.set(key, cached, settings.HEAT_MAP_CACHE_SECONDS)
+    return cached
+
+
+async def aget_heat_map(date_from=None, date_to=None, community=None):
+    """get_heat_map for async views, sharing its cache entries."""
+    version = await cache.aget_or_set(VERSION_KEY, uuid.uuid4().hex, settings.HEAT_MAP_CACHE_SECONDS)
+    key = _cache_key(version, date_from, date_to, community)
+    cached = await cache.aget(key)
+    if cached is None:
+        cached = _with_etag([_cell(row) async for row in _cell_rows(date_from, date_to, community)])
+        await cache.aset(key, cached, settings.HEAT_MAP_CACHE_SECONDS)
+    return cached
+
+
+def invalidate_heat_map():
+    cache.delete(VERSION_KEY)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from impactrecord.models import ImpactRollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the impact rollup table from impact records and check that it matches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify-only',
+            action='store_true',
+            help='Only compare the rollup with impact records; do not rewrite it',
+        )
+
+    def handle(self, *args, **options):
+        if not options['verify_only']:
+            rows = ImpactRollup.objects.rebuild()
+            self.stdout.write(self.style.SUCCESS(f'✓ Rebuilt impact rollup ({rows} rows)'))
+
+        mismatches = ImpactRollup.objects.differences()
+        if mismatches:
+            for key, expected, stored in mismatches[:20]:
+                day, restaurant, chain, community = key
+                self.stdout.write(
+                    f'  {day} restaurant={restaurant or "-"} chain={chain or "-"} '
+                    f'community={community or "-"}: expected {expected or "nothing"}, '
+                    f'stored {stored or "nothing"}'
+                )
+            raise CommandError(f'Impact rollup differs from impact records in {len(mismatches)} rows.')
+
+        self.stdout.write(self.style.SUCCESS('✓ Impact rollup matches impact records'))
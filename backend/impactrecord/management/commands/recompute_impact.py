@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from impactrecord.heatmap import invalidate_heat_map
+from impactrecord.models import ImpactFactor, ImpactRecord, ImpactRollup
+
+
+class Command(BaseCommand):
+    help = 'Recompute impact records with an impact factor version and rebuild the rollup'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--factor-version',
+            type=int,
+            help='Impact factor version to apply (default: the latest one)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Records read and written per batch (default: 5000)',
+        )
+
+    def handle(self, *args, **options):
+        version = options['factor_version'] or ImpactFactor.objects.latest_version()
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1.')
+        if not ImpactFactor.objects.filter(version=version).exists():
+            raise CommandError(f'Impact factor version {version} does not exist.')
+
+        total = 0
+        for count in ImpactRecord.objects.recompute(version, options['chunk_size']):
+            total += count
+            self.stdout.write(f'  recomputed {total} records')
+
+        if total:
+            rows = ImpactRollup.objects.rebuild()
+            invalidate_heat_map()
+            self.stdout.write(f'  rebuilt impact rollup ({rows} rows)')
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ {total} impact records recomputed with factor version {version}')
+        )
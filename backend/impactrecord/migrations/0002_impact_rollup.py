@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('impactrecord', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImpactRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('restaurant_id', models.CharField(blank=True, default='', max_length=10)),
+                ('chain_id', models.CharField(blank=True, default='', max_length=10)),
+                ('community_id', models.CharField(blank=True, default='', max_length=10)),
+                ('records', models.FloatField(default=0)),
+                ('meals_saved', models.FloatField(default=0)),
+                ('weight_saved_kg', models.FloatField(default=0)),
+                ('co2_reduced_kg', models.FloatField(default=0)),
+            ],
+            options={
+                'db_table': 'impact_rollup',
+                'constraints': [models.UniqueConstraint(fields=('day', 'restaurant_id', 'chain_id', 'community_id'), name='impact_rollup_unique_key')],
+            },
+        ),
+    ]
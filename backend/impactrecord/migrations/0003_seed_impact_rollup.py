@@ -0,0 +1,77 @@
+# Generated manually to fill impact_rollup from the impact records already stored
+
+from collections import defaultdict
+
+from django.db import migrations
+
+IMPACT_COLUMNS = ("meals_saved", "weight_saved_kg", "co2_reduced_kg")
+
+
+def seed_rollup(apps, schema_editor):
+    ImpactRecord = apps.get_model("impactrecord", "ImpactRecord")
+    ImpactRollup = apps.get_model("impactrecord", "ImpactRollup")
+    Delivery = apps.get_model("delivery", "Delivery")
+
+    deliveries = defaultdict(list)
+    for delivery in Delivery.objects.filter(
+        delivery_type="distribution", status="delivered", food_item__isnull=False
+    ).exclude(community_id__isnull=True).values("food_item_id", "community_id", "quantity_value"):
+        deliveries[delivery["food_item_id"]].append(delivery)
+
+    sums = defaultdict(lambda: defaultdict(float))
+    records = ImpactRecord.objects.values(
+        "food_id",
+        "impact_date",
+        "food__donation__restaurant_id",
+        "food__donation__restaurant__chain_id",
+        *IMPACT_COLUMNS,
+    )
+    for record in records.iterator():
+        targets = deliveries[record["food_id"]]
+        total = sum(float(d["quantity_value"] or 0) for d in targets)
+        if not targets:
+            shares = {"": 1.0}
+        else:
+            shares = defaultdict(float)
+            for d in targets:
+                share = float(d["quantity_value"] or 0) / total if total else 1 / len(targets)
+                shares[d["community_id"]] += share
+        for community, share in shares.items():
+            key = (
+                record["impact_date"],
+                record["food__donation__restaurant_id"] or "",
+                record["food__donation__restaurant__chain_id"] or "",
+                community,
+            )
+            sums[key]["records"] += share
+            for column in IMPACT_COLUMNS:
+                sums[key][column] += record[column] * share
+
+    ImpactRollup.objects.bulk_create(
+        [
+            ImpactRollup(
+                day=day, restaurant_id=restaurant, chain_id=chain,
+                community_id=community, **values,
+            )
+            for (day, restaurant, chain, community), values in sums.items()
+        ],
+        batch_size=1000,
+    )
+
+
+def clear_rollup(apps, schema_editor):
+    apps.get_model("impactrecord", "ImpactRollup").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('impactrecord', '0002_impact_rollup'),
+        ('delivery', '0018_backfill_quantity_value_unit'),
+        ('donation', '0005_add_created_by'),
+        ('restaurants', '0002_alter_restaurant_chain'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_rollup, clear_rollup),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('impactrecord', '0003_seed_impact_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='impactrecord',
+            name='factor_version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.CreateModel(
+            name='ImpactFactor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField()),
+                ('unit', models.CharField(blank=True, default='', max_length=20)),
+                ('category', models.CharField(blank=True, default='', max_length=32)),
+                ('meal_factor', models.FloatField()),
+                ('weight_factor', models.FloatField()),
+                ('co2_factor', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'impact_factor',
+                'ordering': ['version', 'unit', 'category'],
+                'constraints': [models.UniqueConstraint(fields=('version', 'unit', 'category'), name='impact_factor_unique_key')],
+            },
+        ),
+    ]
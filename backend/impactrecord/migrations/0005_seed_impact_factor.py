@@ -0,0 +1,28 @@
+# Generated manually to store the original hard-coded coefficients as version 1
+
+from django.db import migrations
+
+
+def seed_factors(apps, schema_editor):
+    ImpactFactor = apps.get_model("impactrecord", "ImpactFactor")
+    ImpactFactor.objects.get_or_create(
+        version=1,
+        unit="",
+        category="",
+        defaults={"meal_factor": 0.5, "weight_factor": 0.2, "co2_factor": 2.5},
+    )
+
+
+def clear_factors(apps, schema_editor):
+    apps.get_model("impactrecord", "ImpactFactor").objects.filter(version=1).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('impactrecord', '0004_impact_factor'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_factors, clear_factors),
+    ]
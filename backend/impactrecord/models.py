@@ -1,7 +1,237 @@
-from django.db import models
+from collections import defaultdict
 
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+
+from dashboard.cache import invalidate_dashboard
+from delivery.models import Delivery
 from fooditem.models import FoodItem
-from re_meals_api.id_utils import generate_prefixed_id
+from re_meals_api.id_utils import PrefixedIdManager, generate_prefixed_id
+from restaurants.leaderboard import invalidate_leaderboard
+from .heatmap import invalidate_heat_map
+
+# Coefficients applied to a food item's quantity when no impact factor row
+# matches; version 1 of the impact_factor table starts out with these.
+MEAL_FACTOR = 0.5
+WEIGHT_FACTOR = 0.2
+CO2_FACTOR = 2.5
+
+
+def calculate_impact(quantity, factors=(MEAL_FACTOR, WEIGHT_FACTOR, CO2_FACTOR)):
+    """Return (meals_saved, weight_saved_kg, co2_reduced_kg) for a quantity."""
+    meal_factor, weight_factor, co2_factor = factors
+    weight_saved = quantity * weight_factor
+    return quantity * meal_factor, weight_saved, weight_saved * co2_factor
+
+
+class ImpactFactorQuerySet(models.QuerySet):
+    def latest_version(self):
+        return self.aggregate(version=models.Max("version"))["version"] or 1
+
+    def table(self, version=None):
+        """
+        Factors of one version (the latest by default) as an ImpactFactorTable,
+        loaded with a single query.
+        """
+        version = version or self.latest_version()
+        rows = self.filter(version=version).values_list(
+            "unit", "category", "meal_factor", "weight_factor", "co2_factor"
+        )
+        return ImpactFactorTable(
+            version, {(unit, category): tuple(factors) for unit, category, *factors in rows}
+        )
+
+
+class ImpactFactorTable:
+    """
+    In-memory lookup over one factor version.
+
+    The most specific row wins: unit and category, then unit only, then
+    category only, then the version's catch-all row (blank unit and
+    category), then the module defaults.
+    """
+
+    def __init__(self, version, factors):
+        self.version = version
+        self.factors = factors
+
+    def lookup(self, unit, category):
+        unit = ImpactFactor.normalize_unit(unit)
+        category = category or ""
+        for key in ((unit, category), (unit, ""), ("", category), ("", "")):
+            if key in self.factors:
+                return self.factors[key]
+        return (MEAL_FACTOR, WEIGHT_FACTOR, CO2_FACTOR)
+
+    def calculate(self, quantity, unit, category):
+        return calculate_impact(quantity, self.lookup(unit, category))
+
+
+class ImpactFactor(models.Model):
+    """
+    Impact coefficients per factor version, food unit and category.
+
+    Blank unit or category rows apply to any unit or category. Records keep
+    the version that produced them, so a new version can be rolled out with
+    the recompute_impact command.
+    """
+
+    version = models.PositiveIntegerField()
+    unit = models.CharField(max_length=20, blank=True, default="")
+    category = models.CharField(max_length=32, blank=True, default="")
+    meal_factor = models.FloatField()
+    weight_factor = models.FloatField()
+    co2_factor = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ImpactFactorQuerySet.as_manager()
+
+    class Meta:
+        db_table = "impact_factor"
+        ordering = ["version", "unit", "category"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["version", "unit", "category"], name="impact_factor_unique_key"
+            ),
+        ]
+
+    @staticmethod
+    def normalize_unit(unit):
+        return (unit or "").strip().lower()
+
+    def save(self, *args, **kwargs):
+        self.unit = self.normalize_unit(self.unit)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"ImpactFactor v{self.version} ({self.unit or '*'}/{self.category or '*'})"
+
+
+# Buckets for impact time series; weeks start on Monday.
+SUMMARY_PERIODS = {"day": TruncDay, "week": TruncWeek, "month": TruncMonth}
+
+IMPACT_SUMS = {
+    "meals_saved": Sum("meals_saved"),
+    "weight_saved_kg": Sum("weight_saved_kg"),
+    "co2_reduced_kg": Sum("co2_reduced_kg"),
+}
+
+
+class ImpactRecordManager(PrefixedIdManager):
+    def create_for_food_items(self, food_items):
+        """
+        Create impact records for every item in `food_items` that has none yet.
+
+        Uses a constant number of queries whatever the number of items: one
+        anti-join to find the items without a record, two reads for the
+        latest impact factor version and its rows, one id block reservation,
+        one bulk INSERT and one re-read of the inserted rows, plus the rollup
+        update (two reads and one write per rollup key).
+
+        Returns the records this call inserted, read back from the database.
+        Items recorded concurrently by another request are skipped by the
+        INSERT and left out of the result. The bulk INSERT sends no
+        post_save, so the cached heat map, leaderboard and dashboard are
+        invalidated here.
+        """
+        items = food_items.filter(impact__isnull=True).only("food_id", "quantity", "unit", "category")
+        records = []
+        factors = None
+        for item in items:
+            if factors is None:
+                factors = ImpactFactor.objects.table()
+            meals_saved, weight_saved, co2_saved = factors.calculate(
+                item.quantity, item.unit, item.category
+            )
+            records.append(
+                self.model(
+                    meals_saved=meals_saved,
+                    weight_saved_kg=weight_saved,
+                    co2_reduced_kg=co2_saved,
+                    factor_version=factors.version,
+                    food=item,
+                )
+            )
+        if not records:
+            return []
+        # A concurrent request may have recorded the same item in the meantime;
+        # the one-to-one constraint on food makes that insert a no-op.
+        with transaction.atomic():
+            self.bulk_create_with_ids(records, ignore_conflicts=True)
+            # Objects whose INSERT was skipped still carry the ids they were
+            # given, so only rows that exist under those ids were created here.
+            inserted = self.filter(pk__in=[record.pk for record in records])
+            ImpactRollup.objects.add_records(inserted)
+            created = list(inserted)
+        if created:
+            invalidate_heat_map()
+            invalidate_leaderboard()
+            invalidate_dashboard()
+        return created
+
+    def recompute(self, version=None, chunk_size=5000):
+        """
+        Re-derive impact values of records made with another factor version.
+
+        The quantity a record was computed from is recovered from its stored
+        values and its own factor version, so stock that left the food item
+        since distribution does not change the result. Records are read in
+        primary-key chunks, computed per factor group and written back with
+        one bulk_update per chunk. Yields the number of records per chunk.
+        The impact rollup is not touched; rebuild it afterwards.
+
+        The per-record work is a factor lookup and three multiplications, so
+        the chunk's SELECT and bulk_update dominate its cost; vectorising the
+        arithmetic (e.g. with NumPy) would not change the run time noticeably
+        and is left out to keep the dependency list small.
+        """
+        target = ImpactFactor.objects.table(version)
+        tables = {target.version: target}
+        records = (
+            self.exclude(factor_version=target.version)
+            .order_by("impact_id")
+            .values_list(
+                "impact_id", "factor_version", "meals_saved", "weight_saved_kg",
+                "food__quantity", "food__unit", "food__category",
+            )
+        )
+        last_id = ""
+        while True:
+            chunk = list(records.filter(impact_id__gt=last_id)[:chunk_size])
+            if not chunk:
+                return
+            last_id = chunk[-1][0]
+
+            groups = defaultdict(list)
+            for impact_id, old_version, meals, weight, quantity, unit, category in chunk:
+                if old_version not in tables:
+                    tables[old_version] = ImpactFactor.objects.table(old_version)
+                old_meal, old_weight, _ = tables[old_version].lookup(unit, category)
+                if old_meal:
+                    quantity = meals / old_meal
+                elif old_weight:
+                    quantity = weight / old_weight
+                groups[target.lookup(unit, category)].append((impact_id, quantity or 0))
+
+            updated = []
+            for (meal_factor, weight_factor, co2_factor), rows in groups.items():
+                updated.extend(
+                    self.model(
+                        impact_id=impact_id,
+                        meals_saved=quantity * meal_factor,
+                        weight_saved_kg=quantity * weight_factor,
+                        co2_reduced_kg=quantity * weight_factor * co2_factor,
+                        factor_version=target.version,
+                    )
+                    for impact_id, quantity in rows
+                )
+            self.bulk_update(
+                updated,
+                ["meals_saved", "weight_saved_kg", "co2_reduced_kg", "factor_version"],
+                batch_size=1000,
+            )
+            yield len(updated)
 
 
 class ImpactRecord(models.Model):
@@ -15,12 +245,17 @@ class ImpactRecord(models.Model):
 
     impact_date = models.DateField(auto_now_add=True)
 
+    # ImpactFactor version the values were computed with.
+    factor_version = models.PositiveIntegerField(default=1)
+
     food = models.OneToOneField(
         FoodItem,
         on_delete=models.CASCADE,
         related_name="impact"
     )
 
+    objects = ImpactRecordManager()
+
     class Meta:
         db_table = "impact_record"
 
@@ -36,3 +271,210 @@ class ImpactRecord(models.Model):
 
     def __str__(self):
         return f"ImpactRecord {self.impact_id}"
+
+
+# Rows whose record share falls below this after a retraction are leftovers
+# of float rounding and are removed.
+ROLLUP_EPSILON = 1e-6
+
+
+class ImpactRollupQuerySet(models.QuerySet):
+    def scoped(self, date_from=None, date_to=None, restaurant=None, chain=None, community=None):
+        """
+        Narrow rows to a date range (inclusive) and to the restaurant or
+        chain that donated the food, or the community it was distributed to.
+        """
+        qs = self
+        if date_from:
+            qs = qs.filter(day__gte=date_from)
+        if date_to:
+            qs = qs.filter(day__lte=date_to)
+        if restaurant:
+            qs = qs.filter(restaurant_id=restaurant)
+        if chain:
+            qs = qs.filter(chain_id=chain)
+        if community:
+            qs = qs.filter(community_id=community)
+        return qs
+
+    @staticmethod
+    def _rounded(row):
+        for key in ("records", *IMPACT_SUMS):
+            row[key] = round(row[key] or 0, 6)
+        return row
+
+    def _series_rows(self, period):
+        trunc = SUMMARY_PERIODS[period]
+        return (
+            self.annotate(period_start=trunc("day"))
+            .values("period_start")
+            .annotate(records=Sum("records"), **IMPACT_SUMS)
+            .order_by("period_start")
+        )
+
+    def totals(self):
+        return self._rounded(self.aggregate(records=Sum("records"), **IMPACT_SUMS))
+
+    def series(self, period="week"):
+        return [self._rounded(row) for row in self._series_rows(period)]
+
+    async def atotals(self):
+        return self._rounded(await self.aaggregate(records=Sum("records"), **IMPACT_SUMS))
+
+    async def aseries(self, period="week"):
+        return [self._rounded(row) async for row in self._series_rows(period)]
+
+
+class ImpactRollupManager(models.Manager.from_queryset(ImpactRollupQuerySet)):
+    def contributions(self, records):
+        """
+        Split impact records into rollup keys.
+
+        A record is attributed to the communities its food item was
+        delivered to, in proportion to each delivered distribution's quantity
+        (evenly if no quantities are set), and to no community before any
+        distribution has been delivered. Pending and cancelled deliveries do
+        not count, the same rule as the heat map. Returns {(day, restaurant, chain, community): sums}.
+        """
+        rows = list(
+            records.values(
+                "food_id",
+                "impact_date",
+                "meals_saved",
+                "weight_saved_kg",
+                "co2_reduced_kg",
+                restaurant=F("food__donation__restaurant_id"),
+                chain=F("food__donation__restaurant__chain_id"),
+            )
+        )
+        deliveries = defaultdict(list)
+        if rows:
+            for delivery in Delivery.objects.filter(
+                food_item_id__in={row["food_id"] for row in rows},
+                delivery_type="distribution",
+                status="delivered",
+            ).values("food_item_id", "community_id", "quantity_value"):
+                deliveries[delivery["food_item_id"]].append(delivery)
+
+        sums = defaultdict(lambda: defaultdict(float))
+        for row in rows:
+            shares = self._community_shares(deliveries[row["food_id"]])
+            for community, share in shares.items():
+                key = (row["impact_date"], row["restaurant"] or "", row["chain"] or "", community)
+                sums[key]["records"] += share
+                for column in IMPACT_SUMS:
+                    sums[key][column] += row[column] * share
+        return sums
+
+    @staticmethod
+    def _community_shares(deliveries):
+        deliveries = [d for d in deliveries if d["community_id"]]
+        if not deliveries:
+            return {"": 1.0}
+        total = sum(float(d["quantity_value"] or 0) for d in deliveries)
+        shares = defaultdict(float)
+        for delivery in deliveries:
+            if total:
+                shares[delivery["community_id"]] += float(delivery["quantity_value"] or 0) / total
+            else:
+                shares[delivery["community_id"]] += 1 / len(deliveries)
+        return shares
+
+    def add_records(self, records):
+        self._apply(self.contributions(records), 1)
+
+    def remove_records(self, records):
+        self._apply(self.contributions(records), -1)
+
+    def _apply(self, sums, sign):
+        """Add (or subtract) per-key sums with one conditional UPDATE per key."""
+        if not sums:
+            return
+        with transaction.atomic():
+            for (day, restaurant, chain, community), values in sums.items():
+                key = dict(day=day, restaurant_id=restaurant, chain_id=chain, community_id=community)
+                changes = {column: F(column) + sign * amount for column, amount in values.items()}
+                if self.filter(**key).update(**changes) or sign < 0:
+                    continue
+                try:
+                    with transaction.atomic():
+                        self.create(**key, **values)
+                except IntegrityError:
+                    # Another transaction inserted the row first.
+                    self.filter(**key).update(**changes)
+            if sign < 0:
+                self.filter(records__lt=ROLLUP_EPSILON).delete()
+
+    def rebuild(self):
+        """Recompute every row from impact_record. Returns the number of rows."""
+        sums = self.contributions(ImpactRecord.objects.all())
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(
+                [
+                    self.model(
+                        day=day, restaurant_id=restaurant, chain_id=chain,
+                        community_id=community, **values,
+                    )
+                    for (day, restaurant, chain, community), values in sums.items()
+                ],
+                batch_size=1000,
+            )
+        return len(sums)
+
+    def differences(self, tolerance=1e-6):
+        """
+        Compare stored rows with a fresh computation from impact_record.
+        Returns a list of (key, expected, stored) for rows that disagree.
+        """
+        expected = self.contributions(ImpactRecord.objects.all())
+        stored = {
+            (row.pop("day"), row.pop("restaurant_id"), row.pop("chain_id"), row.pop("community_id")): row
+            for row in self.values(
+                "day", "restaurant_id", "chain_id", "community_id", "records", *IMPACT_SUMS
+            )
+        }
+        mismatches = []
+        for key in expected.keys() | stored.keys():
+            want, have = expected.get(key, {}), stored.get(key, {})
+            if any(
+                abs(want.get(column, 0) - have.get(column, 0)) > tolerance
+                for column in ("records", *IMPACT_SUMS)
+            ):
+                mismatches.append((key, dict(want), have))
+        return mismatches
+
+
+class ImpactRollup(models.Model):
+    """
+    Impact totals per day, restaurant, chain and community.
+
+    Kept up to date as impact records and distribution deliveries change, so
+    dashboards read a few hundred rows instead of scanning impact_record.
+    Empty strings stand for "no restaurant/chain/community".
+    """
+
+    day = models.DateField()
+    restaurant_id = models.CharField(max_length=10, blank=True, default="")
+    chain_id = models.CharField(max_length=10, blank=True, default="")
+    community_id = models.CharField(max_length=10, blank=True, default="")
+
+    # Share of records; fractional when an item went to several communities.
+    records = models.FloatField(default=0)
+    meals_saved = models.FloatField(default=0)
+    weight_saved_kg = models.FloatField(default=0)
+    co2_reduced_kg = models.FloatField(default=0)
+
+    objects = ImpactRollupManager()
+
+    class Meta:
+        db_table = "impact_rollup"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "restaurant_id", "chain_id", "community_id"],
+                name="impact_rollup_unique_key",
+            )
+        ]
+
+    def __str__(self):
+        return f"ImpactRollup {self.day} {self.restaurant_id or '-'}/{self.community_id or '-'}"
@@ -1,17 +1,18 @@
 from rest_framework import serializers
-from .models import ImpactRecord
+from .models import SUMMARY_PERIODS, ImpactRecord
+from fooditem.serializers import FoodItemIdField
+from re_meals_api.sparse_fields import SparseFieldsetMixin
 
 
-class ImpactRecordSerializer(serializers.ModelSerializer):
+class ImpactRecordSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     # Explicitly define impact_id to ensure it's returned correctly
     impact_id = serializers.CharField(read_only=True)
-    # Food field will return the food_id (primary key) as a string
-    food = serializers.SerializerMethodField()
-    
-    def get_food(self, obj):
-        # Return food_id as string to ensure consistent format
-        return str(obj.food.food_id) if obj.food and hasattr(obj.food, 'food_id') else ""
-    
+    # The canonical food_id, read from the row itself so listing does not
+    # load every FoodItem.
+    food = FoodItemIdField(read_only=True)
+
+    field_sources = {"food": ["food"]}
+
     class Meta:
         model = ImpactRecord
         fields = [
@@ -20,5 +21,37 @@ class ImpactRecordSerializer(serializers.ModelSerializer):
             "weight_saved_kg",
             "co2_reduced_kg",
             "impact_date",
+            "factor_version",
             "food",
-        ]
\ No newline at end of file
+        ]
+
+
+class ImpactSummaryQuerySerializer(serializers.Serializer):
+    """Query parameters accepted by the impact summary endpoint."""
+
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    restaurant = serializers.CharField(required=False)
+    chain = serializers.CharField(required=False)
+    community = serializers.CharField(required=False)
+    period = serializers.ChoiceField(choices=list(SUMMARY_PERIODS), default="week")
+
+    def validate(self, attrs):
+        date_from, date_to = attrs.get("date_from"), attrs.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError({"date_to": "date_to must not be before date_from."})
+        return attrs
+
+
+class HeatMapQuerySerializer(serializers.Serializer):
+    """Query parameters accepted by the community heat map endpoint."""
+
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    community = serializers.CharField(required=False)
+
+    def validate(self, attrs):
+        date_from, date_to = attrs.get("date_from"), attrs.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError({"date_to": "date_to must not be before date_from."})
+        return attrs
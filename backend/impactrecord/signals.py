@@ -0,0 +1,79 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from delivery.models import Delivery
+from .heatmap import invalidate_heat_map
+from .models import ImpactRecord, ImpactRollup
+
+# Delivery fields that decide which community an impact record counts towards.
+ATTRIBUTION_FIELDS = {"food_item", "quantity_value", "community_id", "delivery_type", "status"}
+
+
+@receiver(post_save, sender=ImpactRecord)
+def add_record_to_rollup(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        ImpactRollup.objects.add_records(ImpactRecord.objects.filter(pk=instance.pk))
+
+
+@receiver(pre_delete, sender=ImpactRecord)
+def remove_record_from_rollup(sender, instance, **kwargs):
+    ImpactRollup.objects.remove_records(ImpactRecord.objects.filter(pk=instance.pk))
+
+
+def _delivered_changed(delivery):
+    """Whether the save moves the delivery into or out of "delivered"."""
+    loaded = getattr(delivery, "_loaded_values", None)
+    if delivery._state.adding or loaded is None or "status" not in loaded:
+        return True
+    return (loaded["status"] == "delivered") != (delivery.status == "delivered")
+
+
+def _food_item_ids(delivery, update_fields=None):
+    """Food items whose impact attribution may change with this delivery."""
+    changed = ATTRIBUTION_FIELDS if update_fields is None else ATTRIBUTION_FIELDS & set(update_fields)
+    # Only delivered distributions attribute impact, so other status moves
+    # (pending -> in_transit) leave the rollup alone.
+    if changed == {"status"} and not _delivered_changed(delivery):
+        return set()
+    if not changed:
+        return set()
+    food_ids = {delivery.food_item_id}
+    if not delivery._state.adding:
+        loaded = getattr(delivery, "_loaded_values", None)
+        if loaded is not None and "food_item_id" in loaded:
+            food_ids.add(loaded["food_item_id"])
+        else:
+            food_ids.update(
+                Delivery.objects.filter(pk=delivery.pk).values_list("food_item_id", flat=True)
+            )
+    food_ids.discard(None)
+    return food_ids
+
+
+# Re-attribution is done as "subtract with the old deliveries, add back with
+# the new ones", both inside the delivery's own transaction.
+
+@receiver(pre_save, sender=Delivery)
+@receiver(pre_delete, sender=Delivery)
+def retract_delivery_impact(sender, instance, update_fields=None, raw=False, **kwargs):
+    food_ids = set() if raw else _food_item_ids(instance, update_fields)
+    instance._impact_food_ids = food_ids
+    if food_ids:
+        ImpactRollup.objects.remove_records(ImpactRecord.objects.filter(food_id__in=food_ids))
+
+
+@receiver(post_save, sender=Delivery)
+@receiver(post_delete, sender=Delivery)
+def restore_delivery_impact(sender, instance, **kwargs):
+    food_ids = getattr(instance, "_impact_food_ids", None)
+    if food_ids:
+        ImpactRollup.objects.add_records(ImpactRecord.objects.filter(food_id__in=food_ids))
+    instance._impact_food_ids = set()
+
+
+@receiver(post_save, sender=Delivery)
+@receiver(post_delete, sender=Delivery)
+@receiver(post_save, sender=ImpactRecord)
+@receiver(post_delete, sender=ImpactRecord)
+def invalidate_cached_heat_map(sender, **kwargs):
+    invalidate_heat_map()
@@ -1,12 +1,24 @@
-from django.test import TestCase
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
 # Create your tests here.
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from fooditem.models import FoodItem
 from donation.models import Donation
 from restaurants.models import Restaurant
-from impactrecord.models import ImpactRecord
+from impactrecord.models import ImpactFactor, ImpactRecord, ImpactRollup
+from restaurant_chain.models import RestaurantChain
+from warehouse.models import Warehouse
+from community.models import Community
+from delivery.models import Delivery
 
 
 class ImpactRecordTests(APITestCase):
@@ -146,7 +158,7 @@ class ImpactRecordTests(APITestCase):
         Ensure listing endpoint returns correct number of impact records.
         """
         self.client.patch(f"/api/fooditems/{self.food.food_id}/", {"is_distributed": True}, format="json")
-        res = self.client.get("/api/impact/")
+        res = self.client.get("/api/impact/?all=1")
         self.assertEqual(len(res.data), 1)
 
     # 10.Test deleting food should delete ImpactRecord (CASCADE)
@@ -156,4 +168,411 @@ class ImpactRecordTests(APITestCase):
         """
         self.client.patch(f"/api/fooditems/{self.food.food_id}/", {"is_distributed": True}, format="json")
         self.food.delete()
-        self.assertFalse(ImpactRecord.objects.exists())
\ No newline at end of file
+        self.assertFalse(ImpactRecord.objects.exists())
+    # 11.Test batch creation uses a constant number of queries
+    def test_batch_create_uses_constant_queries(self):
+        """
+        Ensure create_for_food_items costs the same number of queries for
+        a handful of items and for many, and skips items already recorded.
+        """
+        FoodItem.objects.bulk_create_with_ids(
+            FoodItem(
+                name=f"Bread {i}",
+                quantity=i + 1,
+                unit="pcs",
+                expire_date="2025-12-31",
+                is_claimed=True,
+                is_distributed=True,
+                donation=self.donation,
+            )
+            for i in range(40)
+        )
+        first = FoodItem.objects.filter(is_distributed=True).order_by("food_id").first()
+        ImpactRecord.objects.create_for_food_items(FoodItem.objects.filter(pk=first.pk))
+
+        with CaptureQueriesContext(connection) as ctx:
+            created = ImpactRecord.objects.create_for_food_items(
+                FoodItem.objects.filter(donation=self.donation, is_distributed=True)
+            )
+        self.assertEqual(len(created), 39)
+        # Six queries create and return the records (anti-join, two factor
+        # reads, id block, INSERT, re-read); the rollup adds two reads and
+        # one UPDATE for the single day/restaurant/community key they share.
+        statements = [
+            q["sql"] for q in ctx.captured_queries
+            if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))
+        ]
+        self.assertLessEqual(len(statements), 9)
+        self.assertEqual(ImpactRecord.objects.count(), 40)
+
+        record = ImpactRecord.objects.get(food__name="Bread 9")
+        self.assertEqual(record.meals_saved, 10 * 0.5)
+        self.assertEqual(record.co2_reduced_kg, (10 * 0.2) * 2.5)
+
+    def _distributed_item(self, quantity, impact_date, donation=None):
+        item = FoodItem.objects.create(
+            name="Rice", quantity=quantity, unit="kg", expire_date="2025-12-31",
+            is_claimed=True, is_distributed=True, donation=donation or self.donation,
+        )
+        ImpactRecord.objects.create_for_food_items(FoodItem.objects.filter(pk=item.pk))
+        ImpactRecord.objects.filter(food=item).update(impact_date=impact_date)
+        # Backdating bypasses the incremental upkeep, so recompute the rollup.
+        ImpactRollup.objects.rebuild()
+        return item
+
+    # 12.Test summary returns totals and a weekly series from SQL
+    def test_summary_totals_and_weekly_series(self):
+        """
+        Ensure impact/summary/ sums every record and buckets them by ISO week.
+        """
+        self._distributed_item(10, "2025-03-03")
+        self._distributed_item(20, "2025-03-05")
+        self._distributed_item(30, "2025-03-12")
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get("/api/impact/summary/")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertEqual(res.data["totals"]["records"], 3)
+        self.assertEqual(res.data["totals"]["meals_saved"], 60 * 0.5)
+        self.assertEqual(
+            [(str(row["period_start"]), row["meals_saved"]) for row in res.data["series"]],
+            [("2025-03-03", 15.0), ("2025-03-10", 15.0)],
+        )
+
+    # 13.Test summary filters by date range and month period
+    def test_summary_date_range_and_month(self):
+        """
+        Ensure date_from/date_to are inclusive and period=month groups by month.
+        """
+        self._distributed_item(10, "2025-01-31")
+        self._distributed_item(20, "2025-02-01")
+        self._distributed_item(40, "2025-03-01")
+
+        res = self.client.get("/api/impact/summary/?period=month&date_from=2025-01-31&date_to=2025-02-28")
+        self.assertEqual(res.data["totals"]["records"], 2)
+        self.assertEqual(
+            [str(row["period_start"]) for row in res.data["series"]],
+            ["2025-01-01", "2025-02-01"],
+        )
+
+    # 14.Test summary filters by restaurant, chain and community
+    def test_summary_filters_by_source_and_community(self):
+        """
+        Ensure restaurant, chain and community filters narrow the records.
+        """
+        chain = RestaurantChain.objects.create(chain_id="CHA001", chain_name="KFC Group")
+        other = Restaurant.objects.create(
+            restaurant_id="RES002", address="Chiang Mai", name="MK",
+            branch_name="Nimman", chain=chain,
+        )
+        other_donation = Donation.objects.create(donation_id="DON002", restaurant=other)
+        first = self._distributed_item(10, "2025-03-03")
+        self._distributed_item(20, "2025-03-03", donation=other_donation)
+
+        warehouse = Warehouse.objects.create(
+            warehouse_id="WAH001", address="Storage", capacity=10,
+            stored_date="2025-01-01", exp_date="2025-12-31",
+        )
+        community = Community.objects.create(
+            community_id="COM001", name="North", address="North Road",
+            received_time="2025-03-01T00:00:00Z", population=10, warehouse_id=warehouse,
+        )
+        Delivery.objects.create_batch([
+            Delivery(
+                delivery_type="distribution", pickup_time="2025-03-02T08:00:00Z",
+                dropoff_time="2025-03-02T10:00:00Z", pickup_location_type="warehouse",
+                dropoff_location_type="community", warehouse_id=warehouse,
+                community_id=community, food_item=first, delivery_quantity="1 kg",
+                status="delivered",
+            )
+        ])
+
+        by_restaurant = self.client.get("/api/impact/summary/?restaurant=RES002")
+        by_chain = self.client.get("/api/impact/summary/?chain=CHA001")
+        by_community = self.client.get("/api/impact/summary/?community=COM001")
+        self.assertEqual(by_restaurant.data["totals"]["meals_saved"], 10.0)
+        self.assertEqual(by_chain.data["totals"]["meals_saved"], 10.0)
+        self.assertEqual(by_community.data["totals"]["meals_saved"], 5.0)
+
+    # 15.Test summary rejects invalid parameters
+    def test_summary_rejects_bad_params(self):
+        """
+        Ensure unknown periods and reversed date ranges return 400.
+        """
+        self.assertEqual(self.client.get("/api/impact/summary/?period=year").status_code, 400)
+        res = self.client.get("/api/impact/summary/?date_from=2025-02-01&date_to=2025-01-01")
+        self.assertEqual(res.status_code, 400)
+        empty = self.client.get("/api/impact/summary/")
+        self.assertEqual(empty.data["totals"]["meals_saved"], 0)
+        self.assertEqual(empty.data["series"], [])
+
+    def _community(self, community_id):
+        warehouse, _ = Warehouse.objects.get_or_create(
+            warehouse_id="WAH001",
+            defaults=dict(address="Storage", capacity=10, stored_date="2025-01-01", exp_date="2025-12-31"),
+        )
+        return Community.objects.create(
+            community_id=community_id, name=community_id, address="Road",
+            received_time="2025-03-01T00:00:00Z", population=10, warehouse_id=warehouse,
+        )
+
+    def _distribution(self, community, quantity, **kwargs):
+        kwargs.setdefault("dropoff_time", "2025-03-02T10:00:00Z")
+        return Delivery.objects.create(
+            delivery_type="distribution", pickup_time="2025-03-02T08:00:00Z",
+            pickup_location_type="warehouse", dropoff_location_type="community",
+            warehouse_id=community.warehouse_id, community_id=community,
+            food_item=self.food, delivery_quantity=quantity, **kwargs,
+        )
+
+    def _rollup(self):
+        return {
+            row.community_id: (round(row.records, 6), round(row.meals_saved, 6))
+            for row in ImpactRollup.objects.all()
+        }
+
+    # 16.Test distributing an item adds it to the rollup
+    def test_rollup_follows_distribution(self):
+        """
+        Ensure the rollup row appears when the item is distributed and
+        matches the impact records.
+        """
+        self.client.patch(f"/api/fooditems/{self.food.food_id}/", {"is_distributed": True}, format="json")
+        row = ImpactRollup.objects.get()
+        self.assertEqual((row.restaurant_id, row.community_id), ("RES001", ""))
+        self.assertEqual(row.meals_saved, 10 * 0.5)
+        call_command("rebuild_impact_rollup", verify_only=True, stdout=StringIO())
+
+    # 17.Test deliveries move recorded impact between communities
+    def test_rollup_follows_deliveries(self):
+        """
+        Ensure creating, changing and deleting distribution deliveries keeps
+        the community split of an already recorded item in step.
+        """
+        north, south = self._community("COM001"), self._community("COM002")
+        self.client.patch(f"/api/fooditems/{self.food.food_id}/", {"is_distributed": True}, format="json")
+
+        first = self._distribution(north, "3 pcs", status="delivered")
+        self.assertEqual(self._rollup(), {"COM001": (1.0, 5.0)})
+
+        second = self._distribution(south, "1 pcs", status="delivered")
+        self.assertEqual(self._rollup(), {"COM001": (0.75, 3.75), "COM002": (0.25, 1.25)})
+
+        first.community_id = south
+        first.save()
+        self.assertEqual(self._rollup(), {"COM002": (1.0, 5.0)})
+
+        second.delete()
+        first.delete()
+        self.assertEqual(self._rollup(), {"": (1.0, 5.0)})
+
+    # 18.Test deleting the food item removes its impact from the rollup
+    def test_rollup_follows_cascade_delete(self):
+        """
+        Ensure the cascade from FoodItem to ImpactRecord also empties the rollup.
+        """
+        self.client.patch(f"/api/fooditems/{self.food.food_id}/", {"is_distributed": True}, format="json")
+        self.food.delete()
+        self.assertFalse(ImpactRollup.objects.exists())
+
+    # 19.Test the rebuild command detects and repairs drift
+    def test_rebuild_command_repairs_drift(self):
+        """
+        Ensure --verify-only reports a stale rollup and a rebuild fixes it.
+        """
+        self.client.patch(f"/api/fooditems/{self.food.food_id}/", {"is_distributed": True}, format="json")
+        ImpactRollup.objects.update(meals_saved=999)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_impact_rollup", verify_only=True, stdout=StringIO())
+        call_command("rebuild_impact_rollup", stdout=StringIO())
+        self.assertEqual(ImpactRollup.objects.get().meals_saved, 10 * 0.5)
+
+    def _cells(self, response):
+        return {(c["community"], c["month"]): round(c["meals"], 6) for c in response.data["cells"]}
+
+    # 20.Test heat map splits meals between communities and months in one query
+    def test_heat_map_cells(self):
+        """
+        Ensure delivered distributions share the item's meals by quantity and
+        land in the month they were dropped off.
+        """
+        north, south = self._community("COM001"), self._community("COM002")
+        self.client.patch(f"/api/fooditems/{self.food.food_id}/", {"is_distributed": True}, format="json")
+        self._distribution(north, "3 pcs", status="delivered")
+        self._distribution(
+            south, "1 pcs", status="delivered",
+            dropoff_time="2025-04-01T10:00:00Z",
+        )
+        self._distribution(south, "4 pcs")
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get("/api/impact/heat-map/")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(self._cells(res), {("COM001", "2025-03"): 3.75, ("COM002", "2025-04"): 1.25})
+        self.assertEqual(res.data["cells"][0]["community_name"], "COM001")
+
+    # 21.Test heat map filters by community and month range
+    def test_heat_map_filters(self):
+        """
+        Ensure community, date_from and date_to narrow the cells and reversed
+        ranges are rejected.
+        """
+        north, south = self._community("COM001"), self._community("COM002")
+        self.client.patch(f"/api/fooditems/{self.food.food_id}/", {"is_distributed": True}, format="json")
+        self._distribution(north, "1 pcs", status="delivered")
+        self._distribution(
+            south, "1 pcs", status="delivered",
+            dropoff_time="2025-04-20T10:00:00Z",
+        )
+
+        by_community = self.client.get("/api/impact/heat-map/?community=COM002")
+        self.assertEqual(self._cells(by_community), {("COM002", "2025-04"): 2.5})
+        by_month = self.client.get("/api/impact/heat-map/?date_from=2025-04-15&date_to=2025-04-16")
+        self.assertEqual(self._cells(by_month), {("COM002", "2025-04"): 2.5})
+        res = self.client.get("/api/impact/heat-map/?date_from=2025-05-01&date_to=2025-04-01")
+        self.assertEqual(res.status_code, 400)
+
+    # 22.Test heat map answers 304 for a matching ETag
+    def test_heat_map_etag(self):
+        """
+        Ensure an unchanged map is not re-sent and a changed one gets a new ETag.
+        """
+        north = self._community("COM001")
+        self.client.patch(f"/api/fooditems/{self.food.food_id}/", {"is_distributed": True}, format="json")
+        delivery = self._distribution(north, "1 pcs", status="delivered")
+
+        first = self.client.get("/api/impact/heat-map/")
+        etag = first["ETag"]
+        again = self.client.get("/api/impact/heat-map/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(again["ETag"], etag)
+
+        delivery.dropoff_time = "2025-05-02T10:00:00Z"
+        delivery.save()
+        changed = self.client.get("/api/impact/heat-map/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    # 23.Test heat map is served from cache until a delivery changes
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_heat_map_cache_invalidation(self):
+        """
+        Ensure repeated requests skip the database and saving a delivery
+        invalidates the cached map.
+        """
+        cache.clear()
+        north = self._community("COM001")
+        self.client.patch(f"/api/fooditems/{self.food.food_id}/", {"is_distributed": True}, format="json")
+        delivery = self._distribution(north, "1 pcs", status="delivered")
+
+        self.client.get("/api/impact/heat-map/")
+        with CaptureQueriesContext(connection) as ctx:
+            cached = self.client.get("/api/impact/heat-map/")
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(self._cells(cached), {("COM001", "2025-03"): 5.0})
+
+        delivery.status = "pending"
+        delivery.save()
+        self.assertEqual(self.client.get("/api/impact/heat-map/").data["cells"], [])
+
+    # 24.Test impact factors pick the most specific unit/category row
+    def test_impact_factor_lookup(self):
+        """
+        Ensure new records use the latest factor version, matched on unit and
+        category before the catch-all row, and remember that version.
+        """
+        ImpactFactor.objects.create(version=2, meal_factor=1, weight_factor=1, co2_factor=1)
+        ImpactFactor.objects.create(
+            version=2, unit="KG", meal_factor=4, weight_factor=1, co2_factor=2
+        )
+        ImpactFactor.objects.create(
+            version=2, unit="kg", category="Vegan", meal_factor=3, weight_factor=1, co2_factor=1
+        )
+        table = ImpactFactor.objects.table()
+        self.assertEqual(table.version, 2)
+        self.assertEqual(table.lookup(" Kg ", "Vegan"), (3, 1, 1))
+        self.assertEqual(table.lookup("kg", None), (4, 1, 2))
+        self.assertEqual(table.lookup("pcs", "Vegan"), (1, 1, 1))
+
+        FoodItem.objects.filter(pk=self.food.pk).update(unit="kg")
+        self.client.patch(f"/api/fooditems/{self.food.food_id}/", {"is_distributed": True}, format="json")
+        record = ImpactRecord.objects.get(food=self.food)
+        self.assertEqual(record.factor_version, 2)
+        self.assertEqual(record.meals_saved, 10 * 4)
+        self.assertEqual(record.co2_reduced_kg, 10 * 1 * 2)
+
+    # 25.Test recompute_impact applies a new factor version in chunks
+    def test_recompute_command(self):
+        """
+        Ensure records made with version 1 are recomputed from their original
+        quantity, not the current stock, and the rollup follows.
+        """
+        self.client.patch(f"/api/fooditems/{self.food.food_id}/", {"is_distributed": True}, format="json")
+        other = FoodItem.objects.create(
+            name="Soup", quantity=4, unit="pcs", expire_date="2025-12-31",
+            is_claimed=True, is_distributed=True, donation=self.donation,
+        )
+        ImpactRecord.objects.create_for_food_items(FoodItem.objects.filter(pk=other.pk))
+        FoodItem.objects.filter(pk=self.food.pk).update(quantity=1)
+        ImpactFactor.objects.create(version=2, meal_factor=2, weight_factor=0.5, co2_factor=3)
+
+        out = StringIO()
+        call_command("recompute_impact", chunk_size=1, stdout=out)
+        self.assertIn("2 impact records recomputed with factor version 2", out.getvalue())
+
+        record = ImpactRecord.objects.get(food=self.food)
+        self.assertEqual(record.factor_version, 2)
+        self.assertEqual(record.meals_saved, 10 * 2)
+        self.assertEqual(record.co2_reduced_kg, 10 * 0.5 * 3)
+        self.assertEqual(ImpactRollup.objects.totals()["meals_saved"], (10 + 4) * 2)
+        call_command("rebuild_impact_rollup", verify_only=True, stdout=StringIO())
+
+        with self.assertRaises(CommandError):
+            call_command("recompute_impact", factor_version=9, stdout=StringIO())
+
+    # 26. Only delivered distributions attribute impact to a community
+    def test_rollup_ignores_undelivered_distributions(self):
+        north = self._community("COM001")
+        self.client.patch(f"/api/fooditems/{self.food.food_id}/", {"is_distributed": True}, format="json")
+        delivery = self._distribution(north, "3 pcs")
+        self.assertEqual(self._rollup(), {"": (1.0, 5.0)})
+        self.assertEqual(self.client.get("/api/impact/summary/?community=COM001").data["totals"]["meals_saved"], 0)
+
+        delivery.status = "delivered"
+        delivery.save(update_fields=["status"])
+        self.assertEqual(self._rollup(), {"COM001": (1.0, 5.0)})
+        cells = self.client.get("/api/impact/heat-map/").data["cells"]
+        self.assertEqual([(c["community"], c["meals"]) for c in cells], [("COM001", 5.0)])
+        call_command("rebuild_impact_rollup", verify_only=True, stdout=StringIO())
+
+    # 27. Items recorded by a concurrent request are left out of the result
+    def test_batch_create_returns_only_inserted_records(self):
+        manager = type(ImpactRecord.objects)
+        original = manager.bulk_create_with_ids
+
+        def racing(self, records, **kwargs):
+            ImpactRecord.objects.create(
+                food=records[0].food, meals_saved=1, weight_saved_kg=1, co2_reduced_kg=1
+            )
+            return original(self, records, **kwargs)
+
+        with patch.object(manager, "bulk_create_with_ids", racing):
+            created = ImpactRecord.objects.create_for_food_items(FoodItem.objects.filter(pk=self.food.pk))
+        self.assertEqual(created, [])
+        self.assertEqual(ImpactRecord.objects.get().meals_saved, 1)
+        self.assertEqual(ImpactRollup.objects.get().records, 1)
+
+    # 28. Distributing an item through the API refreshes the cached heat map
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_heat_map_cache_follows_new_record(self):
+        cache.clear()
+        self._distribution(self._community("COM001"), "1 pcs", status="delivered")
+        first = self.client.get("/api/impact/heat-map/")
+        self.assertEqual(first.data["cells"], [])
+
+        self.client.patch(f"/api/fooditems/{self.food.food_id}/", {"is_distributed": True}, format="json")
+        res = self.client.get("/api/impact/heat-map/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._cells(res), {("COM001", "2025-03"): 9 * 0.5})
@@ -1,9 +1,58 @@
 # Create your views here.
-from rest_framework import viewsets
-from .models import ImpactRecord
-from .serializers import ImpactRecordSerializer
+from django.utils.decorators import method_decorator
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from .heatmap import get_heat_map
+from .models import ImpactRecord, ImpactRollup
+from .serializers import HeatMapQuerySerializer, ImpactRecordSerializer, ImpactSummaryQuerySerializer
+from re_meals_api.db_router import use_replica
+from re_meals_api.sparse_fields import SparseFieldsetViewMixin
 
 
-class ImpactRecordViewSet(viewsets.ReadOnlyModelViewSet):
+# Read-only reporting data: every request reads from the replica.
+@method_decorator(use_replica, name="dispatch")
+class ImpactRecordViewSet(SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
     queryset = ImpactRecord.objects.all()
-    serializer_class = ImpactRecordSerializer
\ No newline at end of file
+    serializer_class = ImpactRecordSerializer
+
+    @action(detail=False, methods=["get"], url_path="summary")
+    def summary(self, request):
+        """
+        Impact totals and a day/week/month series, read from the
+        pre-aggregated impact rollup.
+
+        Filters: date_from, date_to, restaurant, chain, community.
+        """
+        params = ImpactSummaryQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = dict(params.validated_data)
+        period = filters.pop("period")
+
+        records = ImpactRollup.objects.scoped(**filters)
+        return Response(
+            {
+                "totals": records.totals(),
+                "period": period,
+                "series": records.series(period),
+            }
+        )
+
+    @action(detail=False, methods=["get"], url_path="heat-map")
+    def heat_map(self, request):
+        """
+        Meals saved per community and month of drop-off, as a sparse list of
+        cells. Answers 304 when If-None-Match carries the current ETag.
+
+        Filters: date_from, date_to, community.
+        """
+        params = HeatMapQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        cells, etag = get_heat_map(**params.validated_data)
+
+        if etag in {tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")}:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({"cells": cells})
+        response["ETag"] = etag
+        return response
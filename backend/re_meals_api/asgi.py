@@ -2,6 +2,9 @@
 ASGI config for re_meals_api project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Production serves it with uvicorn (the ``backend-asgi`` Docker target):
+
+    uvicorn re_meals_api.asgi:application --workers 4 --lifespan off
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
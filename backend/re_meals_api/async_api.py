@@ -0,0 +1,56 @@
+"""
+Helpers for the async read endpoints mounted under /api/async/.
+
+These are plain Django async views: they validate and render with the same
+DRF serializers as the viewsets, but await the ORM and cache, so under an
+ASGI server a slow query does not hold a worker thread.
+"""
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+from .pagination import KeysetPagination
+
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, encoder=JSONEncoder, safe=False)
+
+
+def query_params(serializer_class, request):
+    """
+    Validate the query string with a DRF serializer.
+
+    Returns (validated_data, None), or (None, a 400 response with the errors).
+    """
+    params = serializer_class(data=request.GET)
+    if not params.is_valid():
+        return None, json_response(params.errors, status=400)
+    return params.validated_data, None
+
+
+def _paginated(request, queryset, serializer_class):
+    request = Request(request)
+    paginator = KeysetPagination()
+    context = {"request": request}
+    try:
+        page = paginator.paginate_queryset(queryset, request)
+    except APIException as exc:
+        return json_response({"detail": exc.detail}, status=exc.status_code)
+    if page is None:
+        return json_response(serializer_class(queryset, many=True, context=context).data)
+    data = serializer_class(page, many=True, context=context).data
+    return json_response(paginator.get_paginated_response(data).data)
+
+
+async def keyset_page(request, queryset, serializer_class):
+    """
+    A page of `queryset` exactly as the DRF list endpoints return it: the
+    KeysetPagination ?cursor= with next/previous links, ?page_size= and
+    ?all=1, and ?fields=/?exclude= on the serializer.
+
+    CursorPagination fetches and decodes synchronously, so the page is
+    built in a worker thread.
+    """
+    return await sync_to_async(_paginated)(request, queryset, serializer_class)
@@ -0,0 +1,19 @@
+"""
+Async variants of the public dashboard read endpoints, mounted at /api/async/.
+
+Served from the same ASGI application as every other route; they only pay
+off when the project runs under an ASGI server (see re_meals_api.asgi).
+"""
+from django.urls import path
+
+from community.async_views import community_list
+from impactrecord.async_views import heat_map, impact_list, impact_summary
+from restaurants.async_views import leaderboard
+
+urlpatterns = [
+    path("impact/", impact_list, name="async-impact-list"),
+    path("impact/summary/", impact_summary, name="async-impact-summary"),
+    path("impact/heat-map/", heat_map, name="async-impact-heat-map"),
+    path("communities/", community_list, name="async-community-list"),
+    path("restaurants/leaderboard/", leaderboard, name="async-restaurant-leaderboard"),
+]
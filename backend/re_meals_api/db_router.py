@@ -0,0 +1,115 @@
+"""
+Route reporting and dashboard reads to the read replica.
+
+Reads go to settings.REPLICA_DATABASE only inside `replica_reads()` (or a
+view wrapped with `use_replica`), so every other read keeps seeing the
+primary. Once a request writes, or when it is not a GET/HEAD/OPTIONS, the
+rest of the request is pinned to the primary so it reads its own writes.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+_replica_reads = ContextVar("replica_reads", default=False)
+_pinned = ContextVar("pinned_to_primary", default=False)
+
+
+@contextmanager
+def replica_reads():
+    """Send the reads made inside the block to the replica, if one is set up."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def use_replica(view):
+    """Decorator running a sync or async view inside `replica_reads()`."""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            with replica_reads():
+                return await view(*args, **kwargs)
+    else:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with replica_reads():
+                return view(*args, **kwargs)
+    return wrapper
+
+
+def pin_to_primary():
+    """Keep the rest of the current request's reads on the primary."""
+    _pinned.set(True)
+
+
+def read_database():
+    """Alias the current context reads from: the replica or the primary."""
+    replica = settings.REPLICA_DATABASE
+    if (
+        not replica
+        or not _replica_reads.get()
+        or _pinned.get()
+        # Reads inside a primary transaction must see its uncommitted rows.
+        or connections[DEFAULT_DB_ALIAS].in_atomic_block
+    ):
+        return DEFAULT_DB_ALIAS
+    return replica
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        database = read_database()
+        if database == DEFAULT_DB_ALIAS:
+            # No opinion: Django reads from the hinted instance's database
+            # or the primary.
+            return None
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return database
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
+
+
+class ReplicaPinningMiddleware:
+    """
+    Start every request unpinned, and pin writes (POST, PUT, PATCH, DELETE)
+    to the primary from their first query, reads included.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _pinned.set(request.method not in SAFE_METHODS)
+        try:
+            return self.get_response(request)
+        finally:
+            _pinned.reset(token)
+
+    async def __acall__(self, request):
+        token = _pinned.set(request.method not in SAFE_METHODS)
+        try:
+            return await self.get_response(request)
+        finally:
+            _pinned.reset(token)
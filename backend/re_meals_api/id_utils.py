@@ -1,24 +1,24 @@
 from __future__ import annotations
 
+import re
+import threading
 from typing import Type
 
 from django.db import models
 
+from id_sequence.models import IdSequence
 
-def generate_prefixed_id(
+# Remembers the last id this thread allocated per prefix so the post_save hook
+# can tell generated ids apart from ids supplied by callers or fixtures.
+_allocated = threading.local()
+
+
+def _validate_prefix(
     model_class: Type[models.Model],
     field_name: str,
     prefix: str,
-    padding: int = 3,
+    padding: int,
 ) -> str:
-    """
-    Build the next available primary key for model_class.
-
-    The new id always starts with `prefix` followed by a zero-padded integer.
-    Padding defaults to 3 digits (e.g. FOO001). The function inspects existing
-    rows that already use the prefix and increments the largest numeric suffix.
-    """
-
     if not prefix:
         raise ValueError("Prefix must be a non-empty string.")
 
@@ -28,16 +28,171 @@ def generate_prefixed_id(
         raise ValueError(
             f"Field '{field_name}' cannot store prefix '{prefix}' with {padding} digits."
         )
+    return prefix
+
+
+def max_existing_suffix(
+    model_class: Type[models.Model],
+    field_name: str,
+    prefix: str,
+) -> int:
+    """
+    Return the largest numeric suffix among existing ids that use `prefix`.
+
+    This scans every matching row, so it is only used to seed a counter the
+    first time a prefix is allocated.
+    """
 
     lookup = {f"{field_name}__startswith": prefix}
     max_number = 0
-    existing_ids = model_class.objects.filter(**lookup).values_list(field_name, flat=True)
+    existing_ids = model_class._default_manager.filter(**lookup).values_list(
+        field_name, flat=True
+    )
     for value in existing_ids:
-        if not value:
-            continue
-        suffix = value[len(prefix) :]
-        if suffix.isdigit():
-            max_number = max(max_number, int(suffix))
-
-    next_number = max_number + 1
-    return f"{prefix}{str(next_number).zfill(padding)}"
+        number = parse_suffix(value, prefix)
+        if number is not None:
+            max_number = max(max_number, number)
+    return max_number
+
+
+def parse_suffix(value: str, prefix: str) -> int | None:
+    """Return the numeric part of `value` if it is `prefix` followed by digits."""
+    if not value or not value.startswith(prefix):
+        return None
+    suffix = value[len(prefix) :]
+    return int(suffix) if suffix.isdigit() else None
+
+
+def format_prefixed_id(prefix: str, number: int, padding: int = 3) -> str:
+    return f"{prefix}{str(number).zfill(padding)}"
+
+
+def canonical_prefixed_id(
+    value: str,
+    prefix: str,
+    padding: int = 7,
+    aliases: tuple[str, ...] = (),
+) -> str:
+    """
+    Rewrite `value` to the canonical PREFIX + zero-padded number form.
+
+    Accepts the prefix or one of its legacy `aliases` (case-insensitive, e.g.
+    F0014 for FOO) or bare digits. Anything else is returned unchanged, so
+    hand-picked ids such as FOOCHAIN still match themselves.
+    """
+    if not isinstance(value, str):
+        return value
+    prefixes = "|".join(re.escape(p) for p in sorted((prefix, *aliases), key=len, reverse=True))
+    match = re.fullmatch(rf"(?:{prefixes})?(\d+)", value.strip(), flags=re.IGNORECASE)
+    if match is None or len(match.group(1).lstrip("0")) > padding:
+        return value
+    return format_prefixed_id(prefix, int(match.group(1)), padding)
+
+
+def was_allocated(prefix: str, value: str) -> bool:
+    """
+    True when `value` is the id this thread most recently generated for
+    `prefix`. The marker is consumed, so a later insert that supplies the
+    same id explicitly is not mistaken for a generated one.
+    """
+    if getattr(_allocated, prefix, None) != value:
+        return False
+    delattr(_allocated, prefix)
+    return True
+
+
+def generate_prefixed_id(
+    model_class: Type[models.Model],
+    field_name: str,
+    prefix: str,
+    padding: int = 3,
+) -> str:
+    """
+    Build the next available primary key for model_class.
+
+    The new id always starts with `prefix` followed by a zero-padded integer.
+    Padding defaults to 3 digits (e.g. FOO001). Numbers come from the
+    per-prefix counter in `id_sequence`, so allocation is a single UPDATE no
+    matter how many rows the table holds.
+    """
+    prefix = _validate_prefix(model_class, field_name, prefix, padding)
+    number = IdSequence.objects.allocate(
+        prefix,
+        seed=lambda: max_existing_suffix(model_class, field_name, prefix),
+    )
+    value = format_prefixed_id(prefix, number, padding)
+    setattr(_allocated, prefix, value)
+    return value
+
+
+def generate_prefixed_id_block(
+    model_class: Type[models.Model],
+    field_name: str,
+    prefix: str,
+    count: int,
+    padding: int = 3,
+    floor: int = 0,
+) -> list[str]:
+    """
+    Reserve `count` consecutive ids for model_class in one counter update.
+
+    This is hi/lo allocation: the counter hands out the high end of the block
+    and the individual ids are numbered locally, so bulk inserts cost a single
+    round trip for ids regardless of the batch size. Numbers at or below
+    `floor` are never handed out.
+    """
+    if count < 1:
+        return []
+
+    prefix = _validate_prefix(model_class, field_name, prefix, padding)
+    if floor:
+        IdSequence.objects.advance_to(prefix, floor)
+    last = IdSequence.objects.allocate(
+        prefix,
+        count=count,
+        seed=lambda: max(floor, max_existing_suffix(model_class, field_name, prefix)),
+    )
+    return [
+        format_prefixed_id(prefix, number, padding)
+        for number in range(last - count + 1, last + 1)
+    ]
+
+
+class PrefixedIdManager(models.Manager):
+    """Default manager for models whose primary key is PREFIX + number."""
+
+    padding = 7
+
+    def bulk_create_with_ids(self, objs, **kwargs):
+        """
+        Fill in missing primary keys from one reserved block, then bulk_create.
+
+        Ids supplied on the objects are kept and the counter is moved past
+        them, because bulk_create does not send the post_save signal that
+        normally does this.
+        """
+        objs = list(objs)
+        pk = self.model._meta.pk
+        prefix = self.model.PREFIX
+
+        missing = [obj for obj in objs if not getattr(obj, pk.attname)]
+        floor = max(
+            (
+                parse_suffix(getattr(obj, pk.attname), prefix) or 0
+                for obj in objs
+                if getattr(obj, pk.attname)
+            ),
+            default=0,
+        )
+
+        if missing:
+            ids = generate_prefixed_id_block(
+                self.model, pk.name, prefix, len(missing),
+                padding=self.padding, floor=floor,
+            )
+            for obj, value in zip(missing, ids):
+                setattr(obj, pk.attname, value)
+        elif floor:
+            IdSequence.objects.advance_to(prefix, floor)
+
+        return self.bulk_create(objs, **kwargs)
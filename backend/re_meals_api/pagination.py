@@ -0,0 +1,33 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+ALL_QUERY_PARAM = "all"
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination for every list endpoint.
+
+    Pages are ordered on the model's Meta.ordering (falling back to the
+    primary key) with the primary key appended as a tie-breaker, so cursors
+    stay stable while rows are inserted. Clients that still need the whole
+    table as a plain list can pass ?all=1.
+    """
+
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if str(request.query_params.get(ALL_QUERY_PARAM, "")).lower() in {"1", "true", "yes"}:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        model = queryset.model
+        pk_name = model._meta.pk.name
+        ordering = list(getattr(view, "pagination_ordering", None) or model._meta.ordering or [])
+        if not any(field.lstrip("-") in (pk_name, "pk") for field in ordering):
+            descending = bool(ordering) and ordering[0].startswith("-")
+            ordering.append(f"-{pk_name}" if descending else pk_name)
+        return tuple(ordering)
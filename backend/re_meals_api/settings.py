@@ -59,6 +59,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'drf_yasg',
+    'id_sequence',
     'users',
     'restaurants',
     'donation',
@@ -69,6 +70,7 @@ INSTALLED_APPS = [
     "delivery",
     "restaurant_chain",
     "donation_request",
+    "dashboard",
 ]
 
 MIDDLEWARE = [
@@ -78,6 +80,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'users.middleware.RemealsUserMiddleware',
+    're_meals_api.db_router.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -128,6 +132,113 @@ if "test" in sys.argv:
         "NAME": BASE_DIR / "test_db.sqlite3",
     }
 
+# Read replica
+# Reporting and dashboard reads (impact, leaderboards, heat maps, warehouse
+# inventory) go to the "replica" database when one is configured; see
+# re_meals_api/db_router.py. Set POSTGRES_REPLICA_HOST (the other
+# POSTGRES_REPLICA_* values default to the primary's), or SQLITE_REPLICA_PATH
+# to use a local SQLite file as a stand-in replica.
+if os.getenv("POSTGRES_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.getenv("POSTGRES_REPLICA_DB", DATABASES["default"]["NAME"]),
+        "USER": os.getenv("POSTGRES_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": os.getenv("POSTGRES_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "HOST": os.getenv("POSTGRES_REPLICA_HOST"),
+        "PORT": os.getenv("POSTGRES_REPLICA_PORT", DATABASES["default"]["PORT"]),
+    }
+elif os.getenv("SQLITE_REPLICA_PATH"):
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.getenv("SQLITE_REPLICA_PATH"),
+    }
+
+# Tests get the replica as a mirror of the test database, with routing off
+# unless a test sets REPLICA_DATABASE.
+if "test" in sys.argv:
+    DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+
+REPLICA_DATABASE = "replica" if "replica" in DATABASES and "test" not in sys.argv else None
+DATABASE_ROUTERS = ["re_meals_api.db_router.ReplicaRouter"]
+
+# Cache
+# Local memory by default; point DJANGO_CACHE_BACKEND/DJANGO_CACHE_LOCATION at a
+# shared cache (e.g. Redis) when running several backend processes.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", "remeals"),
+    }
+}
+
+# Tests create and roll back the same ids over and over, so nothing may leak
+# between them through the cache. Tests that exercise caching override this.
+if "test" in sys.argv:
+    CACHES["default"] = {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+
+# Seconds a user's restaurant/community scope stays cached. Changes to Donor and
+# Recipient rows invalidate it immediately in this process.
+USER_SCOPE_CACHE_SECONDS = int(os.getenv("USER_SCOPE_CACHE_SECONDS", "60"))
+
+# Seconds request.remeals_user (the X-USER-ID caller and their roles) stays
+# cached. Saving or deleting the user or one of their role rows invalidates it.
+REMEALS_USER_CACHE_SECONDS = int(os.getenv("REMEALS_USER_CACHE_SECONDS", "60"))
+
+# Upper bound on how long a computed restaurant/chain leaderboard is reused
+# for the same period and chain filter. Saving a donation, food item, impact
+# record, restaurant or chain through the ORM invalidates it immediately.
+LEADERBOARD_CACHE_SECONDS = int(os.getenv("LEADERBOARD_CACHE_SECONDS", "300"))
+
+# Upper bound on how long a community heat map is reused. Delivery and impact
+# record changes made through the ORM invalidate it immediately.
+HEAT_MAP_CACHE_SECONDS = int(os.getenv("HEAT_MAP_CACHE_SECONDS", "300"))
+
+# Seconds the dashboard bootstrap response is reused, per caller for the
+# user-scoped part.
+DASHBOARD_CACHE_SECONDS = int(os.getenv("DASHBOARD_CACHE_SECONDS", "30"))
+
+# Warehouse inventory snapshots are rebuilt when a delivery or food item they
+# depend on changes, and at the latest after INVENTORY_CACHE_SECONDS. The last
+# snapshot is kept for INVENTORY_SNAPSHOT_SECONDS as the base for ?since= deltas.
+INVENTORY_CACHE_SECONDS = int(os.getenv("INVENTORY_CACHE_SECONDS", "300"))
+INVENTORY_SNAPSHOT_SECONDS = int(os.getenv("INVENTORY_SNAPSHOT_SECONDS", "86400"))
+
+# API pagination
+# List endpoints return one keyset page at a time; ?page_size= can ask for up
+# to API_MAX_PAGE_SIZE rows and ?all=1 returns the full unpaginated list.
+
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "50"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "500"))
+
+REST_FRAMEWORK = {
+    "DEFAULT_PAGINATION_CLASS": "re_meals_api.pagination.KeysetPagination",
+}
+
+# Accounts
+# Users signing up or logging in with one of these emails get the Admin or
+# DeliveryStaff role. The lists are read once at startup.
+
+
+def env_email_set(name: str) -> frozenset:
+    return frozenset(
+        email.strip().lower() for email in os.getenv(name, "").split(",") if email.strip()
+    )
+
+
+ADMIN_EMAILS = env_email_set("ADMIN_EMAILS")
+DELIVERY_STAFF_EMAILS = env_email_set("DELIVERY_STAFF_EMAILS")
+DELIVERY_STAFF_DEFAULT_AREA = os.getenv("DELIVERY_STAFF_DEFAULT_AREA", "General")
+
+# Password hash checks run on at most PASSWORD_HASH_WORKERS threads per
+# process, so a burst of logins cannot take every CPU core from other
+# requests. A login that waits longer than PASSWORD_HASH_TIMEOUT seconds for
+# a free worker is answered with 503.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,105 @@
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+EXCLUDE_PARAM = "exclude"
+
+
+def _split_names(value):
+    return {name.strip() for name in value.split(",") if name.strip()} if value else set()
+
+
+def requested_fields(request):
+    """
+    Return the (fields, exclude) sets asked for in the query string.
+
+    `fields` is None when the client did not restrict the field list. Only
+    read requests are trimmed; writes always validate and return every field.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None, set()
+    params = request.query_params
+    return _split_names(params.get(FIELDS_PARAM)) or None, _split_names(params.get(EXCLUDE_PARAM))
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that honours ?fields=a,b,c and ?exclude=d.
+
+    Fields that were not requested are dropped before rendering, so their
+    SerializerMethodFields never run. Method fields list the model fields
+    they read in `field_sources` so the view can trim the SELECT to match.
+    """
+
+    field_sources = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, exclude = requested_fields(self.context.get("request"))
+        if fields is None and not exclude:
+            return
+        for name in list(self.fields):
+            if (fields is not None and name not in fields) or name in exclude:
+                self.fields.pop(name)
+
+    def get_only_fields(self):
+        """
+        Model fields needed to render the remaining fields, or None when a
+        field reads something we cannot map to a column.
+        """
+        opts = self.Meta.model._meta
+        concrete = {field.name for field in opts.concrete_fields}
+        needed = {opts.pk.name}
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            if name in self.field_sources:
+                needed.update(self.field_sources[name])
+                continue
+            root = field.source.split(".")[0]
+            if field.source == "*" or root not in concrete:
+                return None
+            needed.add(root)
+        return needed
+
+
+def _select_related_paths(tree, prefix=""):
+    for name, children in tree.items():
+        path = f"{prefix}{name}"
+        nested = list(_select_related_paths(children, f"{path}__"))
+        yield from nested or [path]
+
+
+class SparseFieldsetViewMixin:
+    """
+    ViewSet mixin that loads only the columns a sparse fieldset renders.
+
+    The serializer must use SparseFieldsetMixin. Relations that are no longer
+    rendered are dropped from select_related, and the pagination ordering
+    columns are always kept so cursors can still be built.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields, exclude = requested_fields(self.request)
+        if fields is None and not exclude:
+            return queryset
+
+        needed = self.get_serializer().get_only_fields()
+        if needed is None:
+            return queryset
+
+        opts = queryset.model._meta
+        concrete = {field.name for field in opts.concrete_fields}
+        ordering = getattr(self, "pagination_ordering", None) or opts.ordering or []
+        needed |= {name.lstrip("-") for name in ordering} & concrete
+
+        related = queryset.query.select_related
+        if isinstance(related, dict):
+            keep = [
+                path for path in _select_related_paths(related)
+                if path.split("__")[0] in needed
+            ]
+            queryset = queryset.select_related(None)
+            if keep:
+                queryset = queryset.select_related(*keep)
+        return queryset.only(*needed)
@@ -0,0 +1,368 @@
+import re
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connection, connections
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from community.models import Community
+from delivery.models import Delivery
+from donation.models import Donation
+from donation_request.models import DonationRequest
+from fooditem.models import FoodItem
+from impactrecord.models import ImpactRecord
+from re_meals_api.db_router import ReplicaPinningMiddleware, replica_reads
+from restaurants.models import Restaurant
+from warehouse.models import Warehouse
+
+# Tables the seed makes large enough that a full scan would hurt.
+LARGE_TABLES = {
+    Delivery._meta.db_table,
+    Donation._meta.db_table,
+    DonationRequest._meta.db_table,
+    FoodItem._meta.db_table,
+}
+
+# SQLite reports "SCAN <table>", optionally walking an index in order;
+# PostgreSQL reports "Seq Scan on <table>".
+SQLITE_SCAN = re.compile(r"\bSCAN (\w+)(?: USING (?:COVERING )?INDEX (\w+))?")
+PG_SEQ_SCAN = re.compile(r'Seq Scan on "?(\w+)"?')
+
+
+class QueryPlanTests(APITestCase):
+    """
+    Seeds a scaled dataset and EXPLAINs the list query of each hot endpoint,
+    failing when the plan falls back to a sequential scan of a large table.
+    """
+
+    DONATIONS = 200
+    ITEMS_PER_DONATION = 10
+    REQUESTS = 500
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        warehouse = Warehouse.objects.create(
+            warehouse_id="WAHPLAN", address="Plan Lane", capacity=1000.0,
+            stored_date=now.date(), exp_date=now.date() + timedelta(days=30),
+        )
+        community = Community.objects.create(
+            community_id="COMPLAN", name="Plan Community", address="Plan Rd",
+            received_time=now, population=100, warehouse_id=warehouse,
+        )
+        restaurant = Restaurant.objects.create(
+            restaurant_id="RESPLAN", address="Plan St", name="Planner", branch_name="Main",
+        )
+
+        donations = Donation.objects.bulk_create_with_ids(
+            Donation(restaurant=restaurant, status=("pending", "accepted", "declined")[i % 3])
+            for i in range(cls.DONATIONS)
+        )
+        for i, donation in enumerate(donations):
+            donation.donated_at = now - timedelta(hours=i)
+        Donation.objects.bulk_update(donations, ["donated_at"])
+
+        items = FoodItem.objects.bulk_create_with_ids(
+            FoodItem(
+                name=f"Item {i}", quantity=5, unit="kg",
+                expire_date=now.date() + timedelta(days=i % 30),
+                is_expired=i % 7 == 0, is_claimed=i % 2 == 0, is_distributed=i % 4 == 0,
+                donation=donations[i // cls.ITEMS_PER_DONATION],
+            )
+            for i in range(cls.DONATIONS * cls.ITEMS_PER_DONATION)
+        )
+        Delivery.objects.bulk_create_with_ids(
+            Delivery(
+                delivery_type="distribution" if i % 2 else "donation",
+                pickup_time=now, dropoff_time=now + timedelta(hours=3),
+                pickup_location_type="warehouse",
+                dropoff_location_type="community" if i % 2 else "warehouse",
+                status=("pending", "in_transit", "delivered")[i % 3],
+                warehouse_id=warehouse,
+                community_id=community if i % 2 else None,
+                donation_id=None if i % 2 else item.donation,
+                food_item=item if i % 2 else None,
+                delivery_quantity="1 kg" if i % 2 else None,
+            )
+            for i, item in enumerate(items)
+        )
+        DonationRequest.objects.bulk_create_with_ids(
+            DonationRequest(
+                title=f"Request {i}", community_name=community.name, recipient_address="Plan Rd",
+                expected_delivery=now, people_count=10, community=community,
+            )
+            for i in range(cls.REQUESTS)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def _list_plans(self, url, params=None, **headers):
+        """EXPLAIN every query the list request runs against a large table."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params or {}, **headers)
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertTrue(response.data["results"], f"{url} {params} returned no rows")
+
+        plans = []
+        prefix = connection.ops.explain_query_prefix()
+        with connection.cursor() as cursor:
+            for query in ctx.captured_queries:
+                sql = query["sql"]
+                if not sql.startswith("SELECT") or not any(f'"{table}"' in sql for table in LARGE_TABLES):
+                    continue
+                cursor.execute(f"{prefix} {sql}")
+                plans.append((sql, "\n".join(" ".join(map(str, row)) for row in cursor.fetchall())))
+        self.assertTrue(plans)
+        return plans
+
+    def _scanned_tables(self, plan, pk_order_ok):
+        """
+        Large tables the plan reads in full. Walking the primary key index
+        only counts as a scan for filtered lists: unfiltered pages stop
+        after page_size rows, filtered ones may read the whole table.
+        """
+        scanned = set(PG_SEQ_SCAN.findall(plan))
+        for table, index in SQLITE_SCAN.findall(plan):
+            if not index or (index.startswith("sqlite_autoindex_") and not pk_order_ok):
+                scanned.add(table)
+        return scanned
+
+    def assertNoSeqScan(self, url, params=None, pk_order_ok=False, **headers):
+        for sql, plan in self._list_plans(url, params, **headers):
+            scanned = self._scanned_tables(plan, pk_order_ok)
+            self.assertFalse(
+                scanned & LARGE_TABLES,
+                f"Sequential scan on {sorted(scanned & LARGE_TABLES)} for {url} {params}\n{sql}\n{plan}",
+            )
+
+    # 1. Food item lists filtered by donation and stock flags use an index
+    def test_fooditem_filters(self):
+        donation = Donation.objects.order_by("donation_id").values_list("donation_id", flat=True).first()
+        self.assertNoSeqScan("/api/fooditems/", pk_order_ok=True)
+        self.assertNoSeqScan("/api/fooditems/", {"donation": donation})
+        self.assertNoSeqScan("/api/fooditems/", {"is_distributed": "false"})
+        self.assertNoSeqScan("/api/fooditems/", {"is_claimed": "false"})
+        self.assertNoSeqScan("/api/fooditems/", {"is_expired": "false", "is_distributed": "false"})
+
+    # 2. Delivery lists by type and the public impact feed use an index
+    def test_delivery_filters(self):
+        admin = {"HTTP_X_USER_IS_ADMIN": "true"}
+        self.assertNoSeqScan("/api/delivery/deliveries/", pk_order_ok=True, **admin)
+        self.assertNoSeqScan("/api/delivery/deliveries/", {"delivery_type": "distribution"}, **admin)
+        self.assertNoSeqScan("/api/delivery/deliveries/")
+
+    # 3. Donation lists by status and donated_at range use an index
+    def test_donation_filters(self):
+        now = timezone.now()
+        date_range = {
+            "date_from": (now - timedelta(hours=5)).isoformat(),
+            "date_to": now.isoformat(),
+        }
+        self.assertNoSeqScan("/api/donations/", pk_order_ok=True)
+        self.assertNoSeqScan("/api/donations/", {"status": "accepted"})
+        self.assertNoSeqScan("/api/donations/", {"status": "pending", **date_range})
+        self.assertNoSeqScan("/api/donations/", date_range)
+
+    # 4. Donation requests are paged newest first straight off an index
+    def test_donation_request_ordering(self):
+        self.assertNoSeqScan("/api/donation-requests/")
+
+
+class AsyncReadEndpointTests(TestCase):
+    """
+    The /api/async/ endpoints answer like the DRF endpoints they mirror.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        warehouse = Warehouse.objects.create(
+            warehouse_id="WAH0000001", address="Storage", capacity=10,
+            stored_date="2025-01-01", exp_date="2025-12-31",
+        )
+        restaurant = Restaurant.objects.create(
+            restaurant_id="RES0000001", address="Bangkok", name="KFC", branch_name="Central",
+        )
+        donation = Donation.objects.create(donation_id="DON0000001", restaurant=restaurant)
+        for index in (1, 2):
+            community = Community.objects.create(
+                community_id=f"COM000000{index}", name=f"Community {index}", address="Road",
+                received_time="2025-03-01T00:00:00Z", population=10, warehouse_id=warehouse,
+            )
+            food = FoodItem.objects.create(
+                food_id=f"FOO000000{index}", name="Rice", quantity=10, unit="kg",
+                expire_date="2025-12-31", donation=donation,
+            )
+            Delivery.objects.create(
+                delivery_type="distribution", pickup_time="2025-03-02T08:00:00Z",
+                dropoff_time=f"2025-0{index + 2}-02T10:00:00Z",
+                pickup_location_type="warehouse", dropoff_location_type="community",
+                warehouse_id=warehouse, community_id=community, food_item=food,
+                delivery_quantity="1 kg", status="delivered",
+            )
+            food.is_distributed = True
+            food.save()
+            ImpactRecord.objects.create_for_food_items(FoodItem.objects.filter(pk=food.pk))
+
+    async def _both(self, sync_url, async_url, **headers):
+        expected = await sync_to_async(self.client.get)(sync_url, **headers)
+        actual = await self.async_client.get(async_url, **headers)
+        return expected, actual
+
+    # 1. Summary, heat map and leaderboard return the DRF endpoints' body
+    async def test_matches_sync_endpoints(self):
+        bodies = {}
+        for sync_url, async_url in [
+            ("/api/impact/summary/?period=month", "/api/async/impact/summary/?period=month"),
+            ("/api/impact/heat-map/", "/api/async/impact/heat-map/"),
+            ("/api/restaurants/leaderboard/?order=meals_saved", "/api/async/restaurants/leaderboard/?order=meals_saved"),
+        ]:
+            expected, actual = await self._both(sync_url, async_url)
+            self.assertEqual(actual.status_code, 200, async_url)
+            self.assertEqual(actual.json(), expected.json(), async_url)
+            bodies[async_url] = actual.json()
+        self.assertEqual(bodies["/api/async/impact/summary/?period=month"]["totals"]["records"], 2)
+        self.assertEqual(len(bodies["/api/async/impact/heat-map/"]["cells"]), 2)
+        self.assertEqual(len(bodies["/api/async/restaurants/leaderboard/?order=meals_saved"]["restaurants"]), 1)
+
+    # 2. Lists use the DRF cursor pagination: same pages, cursors and ?all=1
+    async def test_keyset_pages(self):
+        expected, actual = await self._both("/api/impact/?page_size=1", "/api/async/impact/?page_size=1")
+        first = actual.json()
+        self.assertEqual(first["results"], expected.json()["results"])
+        self.assertIsNone(first["previous"])
+        self.assertEqual(first["next"].split("?")[1], expected.json()["next"].split("?")[1])
+
+        second = (await self.async_client.get(first["next"])).json()
+        self.assertIsNone(second["next"])
+        self.assertIn("/api/async/impact/?cursor=", second["previous"])
+        expected, actual = await self._both("/api/impact/?all=1", "/api/async/impact/?all=1")
+        self.assertEqual(first["results"] + second["results"], actual.json())
+        self.assertEqual(actual.json(), expected.json())
+
+        expected, actual = await self._both(
+            "/api/community/communities/?warehouse_id=WAH0000001&fields=community_id",
+            "/api/async/communities/?warehouse_id=WAH0000001&fields=community_id",
+        )
+        self.assertEqual(actual.json()["results"], expected.json()["results"])
+        self.assertEqual(set(actual.json()["results"][0]), {"community_id"})
+        empty = await self.async_client.get("/api/async/communities/?warehouse_id=WAH9999999")
+        self.assertEqual(empty.json(), {"next": None, "previous": None, "results": []})
+
+    # 3. The heat map keeps the ETag of the sync endpoint and answers 304
+    async def test_heat_map_etag(self):
+        expected, actual = await self._both("/api/impact/heat-map/", "/api/async/impact/heat-map/")
+        self.assertEqual(actual["ETag"], expected["ETag"])
+        again = await self.async_client.get(
+            "/api/async/impact/heat-map/", headers={"If-None-Match": actual["ETag"]}
+        )
+        self.assertEqual(again.status_code, 304)
+
+    # 4. Bad query parameters are rejected and only GET is allowed
+    async def test_rejects_bad_requests(self):
+        expected, actual = await self._both("/api/impact/summary/?period=decade", "/api/async/impact/summary/?period=decade")
+        self.assertEqual(actual.status_code, 400)
+        self.assertEqual(actual.json(), expected.json())
+        self.assertEqual((await self.async_client.get("/api/async/impact/?cursor=bogus")).status_code, 404)
+        self.assertEqual((await self.async_client.post("/api/async/restaurants/leaderboard/")).status_code, 405)
+
+
+@override_settings(REPLICA_DATABASE="replica")
+class ReplicaRouterTests(TransactionTestCase):
+    """
+    In tests the replica is a mirror of the test database; queries are told
+    apart by the connection that ran them.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        self.warehouse = Warehouse.objects.create(
+            warehouse_id="WAH0000001", address="Storage", capacity=10,
+            stored_date="2025-01-01", exp_date="2025-12-31",
+        )
+        restaurant = Restaurant.objects.create(
+            restaurant_id="RES0000001", address="Bangkok", name="KFC", branch_name="Central",
+        )
+        donation = Donation.objects.create(donation_id="DON0000001", restaurant=restaurant)
+        self.food = FoodItem.objects.create(
+            food_id="FOO0000001", name="Rice", quantity=10, unit="kg",
+            expire_date="2025-12-31", donation=donation,
+        )
+
+    def _queries(self, request):
+        """Run request() and return (primary queries, replica queries)."""
+        with CaptureQueriesContext(connections["default"]) as primary, \
+                CaptureQueriesContext(connections["replica"]) as replica:
+            response = request()
+        self.assertLess(response.status_code, 300)
+        return len(primary.captured_queries), len(replica.captured_queries)
+
+    # 1. Impact, leaderboard, heat map, inventory and dashboard reads use the replica
+    def test_reporting_reads_use_replica(self):
+        for url in [
+            "/api/impact/",
+            "/api/impact/summary/",
+            "/api/impact/heat-map/",
+            "/api/restaurants/leaderboard/",
+            f"/api/warehouse/warehouses/{self.warehouse.pk}/inventory/",
+            "/api/warehouse/warehouses/inventory-summary/",
+            "/api/dashboard/",
+        ]:
+            primary, replica = self._queries(lambda: self.client.get(url))
+            self.assertEqual(primary, 0, url)
+            self.assertGreater(replica, 0, url)
+
+    # 2. Other reads and writes stay on the primary
+    def test_other_requests_use_primary(self):
+        primary, replica = self._queries(lambda: self.client.get("/api/fooditems/"))
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+        primary, replica = self._queries(lambda: self.client.patch(
+            f"/api/fooditems/{self.food.pk}/", {"is_distributed": True}, content_type="application/json",
+        ))
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    # 3. A write pins the rest of the request to the primary
+    def test_write_pins_to_primary(self):
+        ids = iter(range(2, 10))
+
+        def view(request):
+            with replica_reads():
+                counts = [self._count_on(Restaurant.objects.count)]
+                Restaurant.objects.create(
+                    restaurant_id=f"RES000000{next(ids)}", address="Bangkok", name="MK", branch_name="Siam",
+                )
+                counts.append(self._count_on(Restaurant.objects.count))
+                counts.append(self._count_on(self.food.refresh_from_db))
+            return counts
+
+        middleware = ReplicaPinningMiddleware(view)
+        self.assertEqual(middleware(RequestFactory().get("/")), [(0, 1), (1, 0), (1, 0)])
+        # The next request starts unpinned; a POST is pinned from its first query.
+        self.assertEqual(middleware(RequestFactory().get("/"))[0], (0, 1))
+        self.assertEqual(middleware(RequestFactory().post("/"))[0], (1, 0))
+
+    def _count_on(self, query):
+        with CaptureQueriesContext(connections["default"]) as primary, \
+                CaptureQueriesContext(connections["replica"]) as replica:
+            query()
+        return len(primary.captured_queries), len(replica.captured_queries)
+
+    # 4. Without a configured replica every read stays on the primary
+    @override_settings(REPLICA_DATABASE=None)
+    def test_no_replica(self):
+        primary, replica = self._queries(lambda: self.client.get("/api/impact/summary/"))
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    # 5. The async endpoints route the same way
+    def test_async_views_use_replica(self):
+        for url in ["/api/async/impact/summary/", "/api/async/restaurants/leaderboard/"]:
+            primary, replica = self._queries(lambda: async_to_sync(self.async_client.get)(url))
+            self.assertEqual(primary, 0, url)
+            self.assertGreater(replica, 0, url)
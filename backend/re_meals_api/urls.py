@@ -48,6 +48,8 @@ urlpatterns = [
     path("api/", include("fooditem.urls")),
     path("api/", include("impactrecord.urls")),
     path("api/", include("donation_request.urls")),
+    path("api/dashboard/", include("dashboard.urls")),
+    path("api/async/", include("re_meals_api.async_urls")),
 ]
 
 if schema_view:
@@ -1,6 +1,6 @@
 from django.db import models
 
-from re_meals_api.id_utils import generate_prefixed_id
+from re_meals_api.id_utils import PrefixedIdManager, generate_prefixed_id
 
 
 class RestaurantChain(models.Model):
@@ -9,6 +9,8 @@ class RestaurantChain(models.Model):
     chain_id = models.CharField(max_length=10, primary_key=True)
     chain_name = models.CharField(max_length=100)
 
+    objects = PrefixedIdManager()
+
     def save(self, *args, **kwargs):
         if not self.chain_id:
             self.chain_id = generate_prefixed_id(
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from .models import RestaurantChain
+from re_meals_api.sparse_fields import SparseFieldsetMixin
 
-class RestaurantChainSerializer(serializers.ModelSerializer):
+class RestaurantChainSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = RestaurantChain
         fields = ['chain_id', 'chain_name']
\ No newline at end of file
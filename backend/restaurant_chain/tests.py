@@ -19,7 +19,7 @@ class RestaurantChainAPITests(APITestCase):
     # 2. List restaurant chains
     def test_list_chains(self):
         RestaurantChain.objects.create(chain_id="CHA11", chain_name="Chain 11")
-        res = self.client.get("/api/restaurant-chains/")
+        res = self.client.get("/api/restaurant-chains/?all=1")
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data), 1)
 
@@ -1,8 +1,9 @@
 from rest_framework import viewsets
 from .models import RestaurantChain
 from .serializers import RestaurantChainSerializer
+from re_meals_api.sparse_fields import SparseFieldsetViewMixin
 
-class RestaurantChainViewSet(viewsets.ModelViewSet):
+class RestaurantChainViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = RestaurantChain.objects.all()
     serializer_class = RestaurantChainSerializer
     
\ No newline at end of file
@@ -0,0 +1,16 @@
+from django.views.decorators.http import require_GET
+
+from .leaderboard import aget_leaderboard
+from .serializers import LeaderboardQuerySerializer
+from re_meals_api.async_api import json_response, query_params
+from re_meals_api.db_router import use_replica
+
+
+@require_GET
+@use_replica
+async def leaderboard(request):
+    """Async variant of RestaurantViewSet.leaderboard."""
+    params, error = query_params(LeaderboardQuerySerializer, request)
+    if error:
+        return error
+    return json_response(await aget_leaderboard(**params))
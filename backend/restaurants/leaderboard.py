@@ -0,0 +1,104 @@
+import uuid
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import LEADERBOARD_METRICS, LEADERBOARD_WINDOWS, Restaurant
+
+IMPACT_METRICS = ("meals_saved", "weight_saved_kg", "co2_reduced_kg")
+
+VERSION_KEY = "restaurants:leaderboard:version"
+
+
+def _chain_rows(restaurant_rows):
+    chains = {}
+    for row in restaurant_rows:
+        if not row["chain_id"]:
+            continue
+        chain = chains.setdefault(
+            row["chain_id"],
+            {
+                "chain_id": row["chain_id"],
+                "chain_name": row["chain_name"],
+                "restaurants": 0,
+                **{metric: 0 for metric in LEADERBOARD_METRICS},
+            },
+        )
+        chain["restaurants"] += 1
+        for metric in LEADERBOARD_METRICS:
+            chain[metric] += row[metric]
+    for chain in chains.values():
+        for metric in IMPACT_METRICS:
+            chain[metric] = round(chain[metric], 6)
+    return list(chains.values())
+
+
+def _ranked(rows, order, limit, key):
+    rows = sorted(rows, key=lambda row: (-row[order], row[key]))[:limit]
+    return [{"rank": rank, **row} for rank, row in enumerate(rows, start=1)]
+
+
+def window_start(period):
+    """Start of a rolling leaderboard window, or None for all time."""
+    days = LEADERBOARD_WINDOWS[period]
+    if days is None:
+        return None
+    start = timezone.localdate() - timedelta(days=days)
+    return timezone.make_aware(datetime.combine(start, time.min))
+
+
+def _cache_key(version, period, since, chain):
+    return f"restaurants:leaderboard:{version}:{period}:{since.date() if since else ''}:{chain or ''}"
+
+
+def _rounded(rows):
+    for row in rows:
+        for metric in IMPACT_METRICS:
+            row[metric] = round(row[metric], 6)
+    return rows
+
+
+def _board(period, since, order, limit, rows):
+    return {
+        "period": period,
+        "since": since.date() if since else None,
+        "order": order,
+        "restaurants": _ranked(rows, order, limit, "restaurant_id"),
+        "chains": _ranked(_chain_rows(rows), order, limit, "chain_id"),
+    }
+
+
+def get_leaderboard(period="all", order="meals_saved", limit=5, chain=None):
+    """
+    Ranked restaurant and chain rows for a period.
+
+    The grouped rows are cached per period, start day and chain, so ordering
+    and limit changes are served without another query. Saving a donation,
+    food item, impact record, restaurant or chain invalidates them.
+    """
+    since = window_start(period)
+    version = cache.get_or_set(VERSION_KEY, uuid.uuid4().hex, settings.LEADERBOARD_CACHE_SECONDS)
+    cache_key = _cache_key(version, period, since, chain)
+    rows = cache.get(cache_key)
+    if rows is None:
+        rows = _rounded(Restaurant.objects.leaderboard_stats(since=since, chain=chain))
+        cache.set(cache_key, rows, settings.LEADERBOARD_CACHE_SECONDS)
+    return _board(period, since, order, limit, rows)
+
+
+async def aget_leaderboard(period="all", order="meals_saved", limit=5, chain=None):
+    """get_leaderboard for async views, sharing its cache entries."""
+    since = window_start(period)
+    version = await cache.aget_or_set(VERSION_KEY, uuid.uuid4().hex, settings.LEADERBOARD_CACHE_SECONDS)
+    cache_key = _cache_key(version, period, since, chain)
+    rows = await cache.aget(cache_key)
+    if rows is None:
+        rows = _rounded(await Restaurant.objects.aleaderboard_stats(since=since, chain=chain))
+        await cache.aset(cache_key, rows, settings.LEADERBOARD_CACHE_SECONDS)
+    return _board(period, since, order, limit, rows)
+
+
+def invalidate_leaderboard():
+    cache.delete(VERSION_KEY)
@@ -1,9 +1,76 @@
 from django.db import models
+from django.db.models import Count, F, FloatField, Q, Sum, Value
+from django.db.models.functions import Coalesce
 
-from re_meals_api.id_utils import generate_prefixed_id
+from re_meals_api.id_utils import PrefixedIdManager, generate_prefixed_id
 from restaurant_chain.models import RestaurantChain
 
 
+# Rolling leaderboard windows, in days back from today.
+LEADERBOARD_WINDOWS = {"all": None, "week": 7, "month": 30, "year": 365}
+
+LEADERBOARD_METRICS = (
+    "donation_count",
+    "donated_quantity",
+    "distributed_items",
+    "meals_saved",
+    "weight_saved_kg",
+    "co2_reduced_kg",
+)
+
+
+class RestaurantManager(PrefixedIdManager):
+    def _leaderboard_rows(self, since=None, chain=None):
+        """
+        Donation and impact totals for every restaurant, in one GROUP BY.
+
+        Donations (and their food items) count when donated at or after
+        `since`; impact counts when recorded on or after that day. Each
+        food item appears once per restaurant row, so the sums do not fan out.
+        """
+        donated = Q(donations__donated_at__gte=since) if since else None
+        recorded = Q(donations__food_items__impact__impact_date__gte=since.date()) if since else None
+        distributed = Q(donations__food_items__is_distributed=True)
+        if donated is not None:
+            distributed &= donated
+
+        queryset = self.all()
+        if chain:
+            queryset = queryset.filter(chain_id=chain)
+        impact = {
+            column: Coalesce(
+                Sum(f"donations__food_items__impact__{column}", filter=recorded),
+                Value(0.0),
+                output_field=FloatField(),
+            )
+            for column in ("meals_saved", "weight_saved_kg", "co2_reduced_kg")
+        }
+        return (
+            queryset.values("restaurant_id", "name", "branch_name", "chain_id")
+            .annotate(
+                chain_name=F("chain__chain_name"),
+                donation_count=Count("donations", filter=donated, distinct=True),
+                donated_quantity=Coalesce(
+                    Sum("donations__food_items__quantity", filter=donated), 0
+                ),
+                distributed_items=Count("donations__food_items", filter=distributed),
+                **impact,
+            )
+            .order_by()
+        )
+
+    @staticmethod
+    def _active(row):
+        return row["donation_count"] or row["meals_saved"]
+
+    def leaderboard_stats(self, since=None, chain=None):
+        """Leaderboard rows of the restaurants with any activity since `since`."""
+        return [row for row in self._leaderboard_rows(since, chain) if self._active(row)]
+
+    async def aleaderboard_stats(self, since=None, chain=None):
+        return [row async for row in self._leaderboard_rows(since, chain) if self._active(row)]
+
+
 class Restaurant(models.Model):
     PREFIX = "RES"
 
@@ -22,6 +89,8 @@ class Restaurant(models.Model):
         related_name="restaurants",
     )
 
+    objects = RestaurantManager()
+
     class Meta:
         db_table = "restaurant"
         ordering = ["restaurant_id"]
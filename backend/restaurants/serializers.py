@@ -1,8 +1,18 @@
 from rest_framework import serializers
-from .models import Restaurant
+from .models import LEADERBOARD_METRICS, LEADERBOARD_WINDOWS, Restaurant
+from re_meals_api.sparse_fields import SparseFieldsetMixin
 
 
-class RestaurantSerializer(serializers.ModelSerializer):
+class RestaurantSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Restaurant
         fields = "__all__"
+
+
+class LeaderboardQuerySerializer(serializers.Serializer):
+    """Query parameters accepted by the restaurant leaderboard endpoint."""
+
+    period = serializers.ChoiceField(choices=list(LEADERBOARD_WINDOWS), default="all")
+    order = serializers.ChoiceField(choices=list(LEADERBOARD_METRICS), default="meals_saved")
+    chain = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=5)
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from donation.models import Donation
+from fooditem.models import FoodItem
+from impactrecord.models import ImpactRecord
+from restaurant_chain.models import RestaurantChain
+from .leaderboard import invalidate_leaderboard
+from .models import Restaurant
+
+
+# Every table the leaderboard rows are grouped from. Bulk UPDATEs skip these
+# signals and are bounded by LEADERBOARD_CACHE_SECONDS instead.
+@receiver(post_save, sender=Donation)
+@receiver(post_delete, sender=Donation)
+@receiver(post_save, sender=FoodItem)
+@receiver(post_delete, sender=FoodItem)
+@receiver(post_save, sender=ImpactRecord)
+@receiver(post_delete, sender=ImpactRecord)
+@receiver(post_save, sender=Restaurant)
+@receiver(post_delete, sender=Restaurant)
+@receiver(post_save, sender=RestaurantChain)
+@receiver(post_delete, sender=RestaurantChain)
+def invalidate_cached_leaderboard(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_leaderboard()
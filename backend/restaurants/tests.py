@@ -1,8 +1,18 @@
 # Create your tests here.
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from restaurants.models import Restaurant
 from restaurant_chain.models import RestaurantChain
+from donation.models import Donation
+from fooditem.models import FoodItem
+from impactrecord.models import ImpactRecord
 
 class RestaurantTests(APITestCase):
 
@@ -64,7 +74,7 @@ class RestaurantTests(APITestCase):
             is_chain=False
         )
 
-        res = self.client.get("/api/restaurants/")
+        res = self.client.get("/api/restaurants/?all=1")
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data), 1)
 
@@ -347,7 +357,7 @@ class RestaurantTests(APITestCase):
             is_chain=False
         )
 
-        res = self.client.get("/api/restaurants/")
+        res = self.client.get("/api/restaurants/?all=1")
         ids = [r["restaurant_id"] for r in res.data]
         self.assertEqual(ids, sorted(ids))
 
@@ -373,7 +383,7 @@ class RestaurantTests(APITestCase):
             is_chain=False
         )
 
-        res = self.client.get("/api/restaurants/?search=Sushi")
+        res = self.client.get("/api/restaurants/?search=Sushi&all=1")
         self.assertEqual(res.status_code, 200)
 
         # DRF default search not enabled unless you add SearchFilter
@@ -389,7 +399,7 @@ class RestaurantTests(APITestCase):
             restaurant_id="RES2", address="A", name="BB", branch_name="B", is_chain=False
         )
 
-        res = self.client.get("/api/restaurants/?is_chain=true")
+        res = self.client.get("/api/restaurants/?is_chain=true&all=1")
         self.assertEqual(res.status_code, 200)
         self.assertEqual(len(res.data), 2)  # no filter enabled → returns all
         # NOTE: default DRF has no filters unless enabled manually
@@ -566,7 +576,7 @@ class RestaurantTests(APITestCase):
 
     # 31. List endpoint returns empty list when no restaurants exist
     def test_list_empty(self):
-        res = self.client.get("/api/restaurants/")
+        res = self.client.get("/api/restaurants/?all=1")
         self.assertEqual(res.status_code, 200)
         self.assertEqual(res.data, [])
 
@@ -712,3 +722,137 @@ class RestaurantTests(APITestCase):
         res = self.client.get(f"/api/restaurants/{restaurant_id}/")
         self.assertEqual(res.status_code, 200)
         self.assertEqual(res.data["chain"], chain_obj.chain_id)
+
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class RestaurantLeaderboardTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.chain = RestaurantChain.objects.create(chain_id="CHA0000001", chain_name="KFC Group")
+        self.central = Restaurant.objects.create(
+            restaurant_id="RES0000001", address="Bangkok", name="KFC",
+            branch_name="Central", chain=self.chain,
+        )
+        self.siam = Restaurant.objects.create(
+            restaurant_id="RES0000002", address="Bangkok", name="KFC",
+            branch_name="Siam", chain=self.chain,
+        )
+        self.solo = Restaurant.objects.create(
+            restaurant_id="RES0000003", address="Bangkok", name="Solo", branch_name="Main",
+        )
+        Restaurant.objects.create(
+            restaurant_id="RES0000004", address="Bangkok", name="Idle", branch_name="Main",
+        )
+
+    def _donate(self, restaurant, quantity, meals=None, days_ago=0):
+        donation = Donation.objects.create(restaurant=restaurant)
+        Donation.objects.filter(pk=donation.pk).update(
+            donated_at=timezone.now() - timedelta(days=days_ago)
+        )
+        item = FoodItem.objects.create(
+            name="Rice", quantity=quantity, unit="kg",
+            expire_date=date.today() + timedelta(days=3), donation=donation,
+            is_distributed=meals is not None,
+        )
+        if meals is not None:
+            ImpactRecord.objects.create(
+                meals_saved=meals, weight_saved_kg=meals / 2, co2_reduced_kg=meals, food=item
+            )
+            ImpactRecord.objects.filter(food=item).update(
+                impact_date=date.today() - timedelta(days=days_ago)
+            )
+        return item
+
+    # 41. Restaurants are ranked by meals saved and idle restaurants are skipped
+    def test_leaderboard_ranks_restaurants_by_meals(self):
+        self._donate(self.central, 10, meals=4)
+        self._donate(self.central, 5)
+        self._donate(self.siam, 3, meals=9)
+        self._donate(self.solo, 2, meals=1)
+
+        res = self.client.get("/api/restaurants/leaderboard/")
+        self.assertEqual(res.status_code, 200)
+        rows = res.data["restaurants"]
+        self.assertEqual([r["restaurant_id"] for r in rows], ["RES0000002", "RES0000001", "RES0000003"])
+        self.assertEqual(rows[0]["rank"], 1)
+        central = rows[1]
+        self.assertEqual(central["donation_count"], 2)
+        self.assertEqual(central["donated_quantity"], 15)
+        self.assertEqual(central["distributed_items"], 1)
+        self.assertEqual(central["meals_saved"], 4)
+        self.assertEqual(central["chain_name"], "KFC Group")
+
+    # 42. Chain rows add up their branches
+    def test_leaderboard_aggregates_chains(self):
+        self._donate(self.central, 10, meals=4)
+        self._donate(self.siam, 3, meals=9)
+        self._donate(self.solo, 2, meals=1)
+
+        res = self.client.get("/api/restaurants/leaderboard/")
+        self.assertEqual(len(res.data["chains"]), 1)
+        chain = res.data["chains"][0]
+        self.assertEqual(chain["chain_id"], "CHA0000001")
+        self.assertEqual(chain["restaurants"], 2)
+        self.assertEqual(chain["meals_saved"], 13)
+        self.assertEqual(chain["donated_quantity"], 13)
+
+    # 43. Period windows drop older donations and impact
+    def test_leaderboard_period_window(self):
+        self._donate(self.central, 10, meals=4, days_ago=60)
+        self._donate(self.siam, 3, meals=9, days_ago=2)
+
+        res = self.client.get("/api/restaurants/leaderboard/", {"period": "month"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["since"], date.today() - timedelta(days=30))
+        self.assertEqual([r["restaurant_id"] for r in res.data["restaurants"]], ["RES0000002"])
+
+    # 44. Order, limit and chain filters are applied
+    def test_leaderboard_order_limit_and_chain(self):
+        self._donate(self.central, 10, meals=4)
+        self._donate(self.siam, 3, meals=9)
+        self._donate(self.solo, 50, meals=1)
+
+        res = self.client.get("/api/restaurants/leaderboard/", {"order": "donated_quantity", "limit": 1})
+        self.assertEqual([r["restaurant_id"] for r in res.data["restaurants"]], ["RES0000003"])
+
+        res = self.client.get("/api/restaurants/leaderboard/", {"chain": "CHA0000001"})
+        self.assertEqual(
+            [r["restaurant_id"] for r in res.data["restaurants"]], ["RES0000002", "RES0000001"]
+        )
+
+    # 45. Unknown periods and orders are rejected
+    def test_leaderboard_rejects_invalid_params(self):
+        self.assertEqual(self.client.get("/api/restaurants/leaderboard/", {"period": "decade"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/restaurants/leaderboard/", {"order": "name"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/restaurants/leaderboard/", {"limit": 0}).status_code, 400)
+
+    # 46. The grouped rows are computed in one query and then served from cache
+    @override_settings(CACHES=LOCMEM_CACHE)
+    def test_leaderboard_is_one_query_and_cached(self):
+        cache.clear()
+        self._donate(self.central, 10, meals=4)
+        with CaptureQueriesContext(connection) as ctx:
+            first = self.client.get("/api/restaurants/leaderboard/")
+        self.assertEqual(len(ctx.captured_queries), 1)
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get("/api/restaurants/leaderboard/", {"order": "donation_count"})
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(first.data["restaurants"][0]["meals_saved"], second.data["restaurants"][0]["meals_saved"])
+
+    # 47. A new impact record shows up on the cached board before the TTL runs out
+    @override_settings(CACHES=LOCMEM_CACHE)
+    def test_leaderboard_cache_invalidated_by_new_records(self):
+        cache.clear()
+        self._donate(self.central, 10, meals=4)
+        first = self.client.get("/api/restaurants/leaderboard/")
+        self.assertEqual([r["restaurant_id"] for r in first.data["restaurants"]], ["RES0000001"])
+
+        item = self._donate(self.siam, 3)
+        ImpactRecord.objects.create(meals_saved=9, weight_saved_kg=4.5, co2_reduced_kg=9, food=item)
+        second = self.client.get("/api/restaurants/leaderboard/")
+        self.assertEqual(
+            [r["restaurant_id"] for r in second.data["restaurants"]], ["RES0000002", "RES0000001"]
+        )
+        self.assertEqual(second.data["restaurants"][0]["meals_saved"], 9)
@@ -1,9 +1,26 @@
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
+from .leaderboard import get_leaderboard
 from .models import Restaurant
-from .serializers import RestaurantSerializer
+from .serializers import LeaderboardQuerySerializer, RestaurantSerializer
+from re_meals_api.db_router import use_replica
+from re_meals_api.sparse_fields import SparseFieldsetViewMixin
 
 
-class RestaurantViewSet(viewsets.ModelViewSet):
+class RestaurantViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Restaurant.objects.all()
     serializer_class = RestaurantSerializer
+
+    @action(detail=False, methods=["get"], url_path="leaderboard")
+    @use_replica
+    def leaderboard(self, request):
+        """
+        Top restaurants and chains by donations and impact.
+
+        Filters: period (all/week/month/year), chain, order, limit.
+        """
+        params = LeaderboardQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return Response(get_leaderboard(**params.validated_data))
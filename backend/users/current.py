@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Subquery
+
+from .models import Admin, DeliveryStaff, Donor, Recipient, User
+
+
+@dataclass(frozen=True)
+class RemealsUser:
+    """The caller named by X-USER-ID, with the role flags permission checks need."""
+
+    user_id: str = None
+    username: str = ""
+    phone: str = ""
+    restaurant_id: str = None
+    recipient_request_id: str = None
+    is_admin: bool = False
+    is_donor: bool = False
+    is_delivery_staff: bool = False
+    is_recipient: bool = False
+
+    @property
+    def is_authenticated(self):
+        return self.user_id is not None
+
+
+ANONYMOUS = RemealsUser()
+
+
+def _cache_key(user_id):
+    return f"remeals-user:{user_id}"
+
+
+def _load_user(user_id):
+    """Fetch the user and every role flag in a single query."""
+    roles = {
+        "is_admin": Exists(Admin.objects.filter(user=OuterRef("pk"))),
+        "has_donor_role": Exists(Donor.objects.filter(user=OuterRef("pk"))),
+        "is_delivery_staff": Exists(DeliveryStaff.objects.filter(user=OuterRef("pk"))),
+        "has_recipient_role": Exists(Recipient.objects.filter(user=OuterRef("pk"))),
+        "recipient_request_id": Subquery(
+            Recipient.objects.filter(user=OuterRef("pk")).values("donation_request_id")[:1]
+        ),
+    }
+    row = (
+        User.objects.filter(user_id=user_id)
+        .annotate(**roles)
+        .values(
+            "user_id", "username", "phone", "restaurant_id", "is_donor", "is_recipient",
+            *roles,
+        )
+        .first()
+    )
+    if row is None:
+        return ANONYMOUS
+    return RemealsUser(
+        user_id=row["user_id"],
+        username=row["username"],
+        phone=row["phone"],
+        restaurant_id=row["restaurant_id"],
+        recipient_request_id=row["recipient_request_id"],
+        is_admin=row["is_admin"],
+        is_donor=row["is_donor"] or row["has_donor_role"],
+        is_delivery_staff=row["is_delivery_staff"],
+        is_recipient=row["is_recipient"] or row["has_recipient_role"],
+    )
+
+
+def get_remeals_user(user_id):
+    """Return the cached RemealsUser for user_id, loading it on a miss."""
+    if not user_id:
+        return ANONYMOUS
+    key = _cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = _load_user(user_id)
+        cache.set(key, user, settings.REMEALS_USER_CACHE_SECONDS)
+    return user
+
+
+def invalidate_remeals_user(*user_ids):
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids if user_id])
@@ -0,0 +1,69 @@
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.test import APIRequestFactory
+
+from users.views import login
+
+
+class Command(BaseCommand):
+    help = 'Measure login throughput: user lookup, role flags and password hashing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--identifier', required=True, help='Email or username of an existing user')
+        parser.add_argument('--password', required=True)
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Logins to run (default: 50)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Logins in flight at once (default: 4)',
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be at least 1.')
+
+        body = json.dumps({'identifier': options['identifier'], 'password': options['password']})
+        factory = APIRequestFactory()
+
+        def run_login(_):
+            request = factory.post('/api/users/login/', body, content_type='application/json')
+            started = time.perf_counter()
+            status = login(request).status_code
+            return status, time.perf_counter() - started
+
+        def run_threaded(index):
+            try:
+                return run_login(index)
+            finally:
+                connection.close()
+
+        status, _ = run_login(None)
+        if status != 200:
+            raise CommandError(f'Login failed with status {status}; check the credentials.')
+
+        started = time.perf_counter()
+        if options['concurrency'] == 1:
+            results = [run_login(i) for i in range(options['requests'])]
+        else:
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                results = list(pool.map(run_threaded, range(options['requests'])))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(seconds * 1000 for _, seconds in results)
+        failed = sum(1 for status, _ in results if status != 200)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {len(results)} logins in {elapsed:.2f}s: {len(results) / elapsed:.1f} logins/s, '
+            f'p50 {statistics.median(latencies):.1f} ms, p95 {p95:.1f} ms, {failed} failed'
+        ))
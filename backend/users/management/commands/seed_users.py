@@ -77,7 +77,7 @@ class Command(BaseCommand):
             RestaurantChain(chain_id='CHA002', chain_name='The Pizza Company'),
             RestaurantChain(chain_id='CHA003', chain_name='Sizzler'),
         ]
-        return RestaurantChain.objects.bulk_create(chains, ignore_conflicts=True)
+        return RestaurantChain.objects.bulk_create_with_ids(chains, ignore_conflicts=True)
 
     def create_restaurants(self, chains):
         """Create sample restaurants"""
@@ -115,7 +115,7 @@ class Command(BaseCommand):
                 chain=RestaurantChain.objects.get(chain_id='CHA003')
             ),
         ]
-        return Restaurant.objects.bulk_create(restaurants, ignore_conflicts=True)
+        return Restaurant.objects.bulk_create_with_ids(restaurants, ignore_conflicts=True)
 
     def create_warehouses(self):
         """Create sample warehouses"""
@@ -142,7 +142,7 @@ class Command(BaseCommand):
                 exp_date='2025-12-31'
             ),
         ]
-        return Warehouse.objects.bulk_create(warehouses, ignore_conflicts=True)
+        return Warehouse.objects.bulk_create_with_ids(warehouses, ignore_conflicts=True)
 
     def create_communities(self, warehouses):
         """Create sample communities"""
@@ -174,7 +174,7 @@ class Command(BaseCommand):
                 warehouse_id=Warehouse.objects.get(warehouse_id='WAR003')
             ),
         ]
-        return Community.objects.bulk_create(communities, ignore_conflicts=True)
+        return Community.objects.bulk_create_with_ids(communities, ignore_conflicts=True)
 
     def create_users(self):
         """Create sample users with hashed passwords"""
@@ -0,0 +1,38 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.functional import SimpleLazyObject
+
+from .current import get_remeals_user
+
+
+class RemealsUserMiddleware:
+    """
+    Expose the caller named by the X-USER-ID header as request.remeals_user.
+
+    The user is resolved on first access, at most once per request, and
+    requests that never look at it cost no query. The middleware supports
+    both sync and async requests, so async views under ASGI do not hop to a
+    thread to pass through it; they must not touch request.remeals_user,
+    which loads through the sync ORM.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _attach(self, request):
+        user_id = request.headers.get("X-USER-ID")
+        request.remeals_user = SimpleLazyObject(lambda: get_remeals_user(user_id))
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self._attach(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        self._attach(request)
+        return await self.get_response(request)
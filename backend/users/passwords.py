@@ -0,0 +1,39 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class PasswordCheckBusy(Exception):
+    """Raised when no hashing worker became free within PASSWORD_HASH_TIMEOUT."""
+
+
+def _executor():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="password-hash",
+                )
+    return _pool
+
+
+def verify_password(password, encoded):
+    """
+    check_password() on the bounded hashing pool.
+
+    The calling request waits for the result; the pool only caps how many
+    hashes are computed at the same time.
+    """
+    future = _executor().submit(check_password, password, encoded)
+    try:
+        return future.result(timeout=settings.PASSWORD_HASH_TIMEOUT)
+    except TimeoutError:
+        future.cancel()
+        raise PasswordCheckBusy("Too many logins in progress, try again shortly.")
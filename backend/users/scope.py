@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import CharField, Value
+
+from .models import Donor, Recipient
+
+
+@dataclass(frozen=True)
+class UserScope:
+    """Restaurants a user donates for and communities they requested food for."""
+
+    restaurant_ids: tuple = ()
+    community_ids: tuple = ()
+
+
+def _cache_key(user_id):
+    return f"user-scope:{user_id}"
+
+
+def _load_scope(user_id):
+    """Fetch both halves of the scope with a single UNION query."""
+    restaurants = (
+        Donor.objects.filter(user__user_id=user_id)
+        .annotate(kind=Value("restaurant", output_field=CharField()))
+        .values_list("kind", "restaurant_id__restaurant_id")
+    )
+    communities = (
+        Recipient.objects.filter(
+            user__user_id=user_id,
+            donation_request__community__isnull=False,
+        )
+        .annotate(kind=Value("community", output_field=CharField()))
+        .values_list("kind", "donation_request__community__community_id")
+    )
+
+    restaurant_ids, community_ids = set(), set()
+    for kind, value in restaurants.union(communities):
+        (restaurant_ids if kind == "restaurant" else community_ids).add(value)
+    return UserScope(tuple(sorted(restaurant_ids)), tuple(sorted(community_ids)))
+
+
+def get_user_scope(user_id):
+    """Return the cached UserScope for user_id, loading it on a miss."""
+    key = _cache_key(user_id)
+    scope = cache.get(key)
+    if scope is None:
+        scope = _load_scope(user_id)
+        cache.set(key, scope, settings.USER_SCOPE_CACHE_SECONDS)
+    return scope
+
+
+def invalidate_user_scope(*user_ids):
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids if user_id])
@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from donation_request.models import DonationRequest
+from .current import invalidate_remeals_user
+from .models import Admin, DeliveryStaff, Donor, Recipient, User
+from .scope import invalidate_user_scope
+
+
+@receiver(post_save, sender=Donor)
+@receiver(post_delete, sender=Donor)
+@receiver(post_save, sender=Recipient)
+@receiver(post_delete, sender=Recipient)
+def invalidate_scope_for_role(sender, instance, **kwargs):
+    invalidate_user_scope(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_remeals_user_for_profile(sender, instance, **kwargs):
+    invalidate_remeals_user(instance.user_id)
+
+
+@receiver(post_save, sender=Admin)
+@receiver(post_delete, sender=Admin)
+@receiver(post_save, sender=Donor)
+@receiver(post_delete, sender=Donor)
+@receiver(post_save, sender=DeliveryStaff)
+@receiver(post_delete, sender=DeliveryStaff)
+@receiver(post_save, sender=Recipient)
+@receiver(post_delete, sender=Recipient)
+def invalidate_remeals_user_for_role(sender, instance, **kwargs):
+    invalidate_remeals_user(instance.user_id)
+
+
+@receiver(post_save, sender=DonationRequest)
+@receiver(pre_delete, sender=DonationRequest)
+def invalidate_scope_for_request(sender, instance, **kwargs):
+    # A recipient's communities come from their request, so moving or removing
+    # the request changes what they can see.
+    user_ids = list(
+        Recipient.objects.filter(donation_request=instance).values_list("user_id", flat=True)
+    )
+    invalidate_user_scope(*user_ids)
+    # Deleting the request clears Recipient.donation_request without a signal.
+    invalidate_remeals_user(*user_ids)
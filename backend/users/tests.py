@@ -1,12 +1,22 @@
+import time
 from datetime import date
-
-from django.test import TestCase
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.hashers import make_password
 from django.db import IntegrityError
 from django.utils import timezone
 
 from donation_request.models import DonationRequest
-from users.models import User, Donor, Recipient
+from donation.models import Donation
+from users.middleware import RemealsUserMiddleware
+from users.models import Admin, DeliveryStaff, User, Donor, Recipient
 from restaurants.models import Restaurant
 from community.models import Community
 from warehouse.models import Warehouse
@@ -821,3 +831,173 @@ class RoleModelTests(TestCase):
         )
 
         self.assertEqual(response.status_code, 404)
+
+
+class LoginTests(TestCase):
+    def _login_user(self, **overrides):
+        fields = {
+            "user_id": "ULOG01",
+            "username": "loginuser",
+            "fname": "Log",
+            "lname": "In",
+            "bod": "2000-01-01",
+            "phone": "0900000003",
+            "email": "login@example.com",
+            "password": make_password("loginpass"),
+        }
+        fields.update(overrides)
+        return User.objects.create(**fields)
+
+    def _login(self, identifier, password="loginpass"):
+        return self.client.post(
+            "/api/users/login/",
+            data=json.dumps({"identifier": identifier, "password": password}),
+            content_type="application/json",
+        )
+
+    # 1. Login finds the user and their role flags in one query
+    def test_login_is_one_query(self):
+        user = self._login_user()
+        Admin.objects.create(user=user)
+        for identifier in ("login@example.com", "loginuser"):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self._login(identifier)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.data["is_admin"])
+            self.assertFalse(response.data["is_delivery_staff"])
+            self.assertEqual(len(ctx.captured_queries), 1)
+
+    # 2. An email match wins over another user's identical username
+    def test_login_prefers_email_match(self):
+        self._login_user()
+        self._login_user(
+            user_id="ULOG02", username="login@example.com", email="other@example.com",
+            password=make_password("otherpass"),
+        )
+        response = self._login("login@example.com")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["user_id"], "ULOG01")
+
+    # 3. Role email lists come from settings and grant the role on login
+    def test_login_grants_roles_from_settings(self):
+        user = self._login_user()
+        with override_settings(
+            ADMIN_EMAILS=frozenset({"login@example.com"}),
+            DELIVERY_STAFF_EMAILS=frozenset({"login@example.com"}),
+            DELIVERY_STAFF_DEFAULT_AREA="East",
+        ):
+            response = self._login("loginuser")
+        self.assertTrue(response.data["is_admin"])
+        self.assertTrue(response.data["is_delivery_staff"])
+        self.assertTrue(Admin.objects.filter(user=user).exists())
+        self.assertEqual(DeliveryStaff.objects.get(user=user).assigned_area, "East")
+
+    # 4. A login that cannot get a hashing worker in time gets a 503
+    def test_login_busy_hasher_returns_503(self):
+        self._login_user()
+        with override_settings(PASSWORD_HASH_TIMEOUT=0.01), patch(
+            "users.passwords.check_password", side_effect=lambda *args: time.sleep(0.3) or True
+        ):
+            response = self._login("loginuser")
+        self.assertEqual(response.status_code, 503)
+
+    # 5. The login benchmark reports throughput and rejects bad credentials
+    def test_benchmark_login_command(self):
+        self._login_user()
+        out = StringIO()
+        call_command(
+            "benchmark_login", identifier="loginuser", password="loginpass",
+            requests=3, concurrency=1, stdout=out,
+        )
+        self.assertIn("3 logins", out.getvalue())
+        self.assertIn("0 failed", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command(
+                "benchmark_login", identifier="loginuser", password="wrong", stdout=StringIO(),
+            )
+
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class RemealsUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.restaurant = Restaurant.objects.create(
+            restaurant_id="RESCUR", address="1 Current Rd", name="Current", branch_name="Main",
+        )
+        self.user = User.objects.create(
+            user_id="UCUR01",
+            username="current",
+            fname="Cur",
+            lname="Rent",
+            bod="2000-01-01",
+            phone="0900000009",
+            email="current@example.com",
+            password=make_password("pw"),
+            restaurant=self.restaurant,
+        )
+        self.factory = RequestFactory()
+
+    def _resolve(self, user_id="UCUR01"):
+        headers = {"HTTP_X_USER_ID": user_id} if user_id else {}
+        request = self.factory.get("/", **headers)
+        RemealsUserMiddleware(lambda req: None)(request)
+        return request
+
+    # 1. The caller and every role flag load in one query, then come from cache
+    def test_resolves_user_and_roles_once(self):
+        Admin.objects.create(user=self.user)
+        DeliveryStaff.objects.create(user=self.user, assigned_area="North")
+
+        with CaptureQueriesContext(connection) as ctx:
+            request = self._resolve()
+            self.assertEqual(len(ctx.captured_queries), 0)
+            user = request.remeals_user
+            self.assertTrue(user.is_authenticated)
+            self.assertEqual(user.restaurant_id, "RESCUR")
+            self.assertTrue(user.is_admin)
+            self.assertTrue(user.is_delivery_staff)
+            self.assertFalse(user.is_donor)
+            self.assertEqual(len(ctx.captured_queries), 1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(self._resolve().remeals_user.is_admin)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    # 2. Missing or unknown X-USER-ID resolves to an anonymous caller
+    def test_anonymous_caller(self):
+        self.assertFalse(self._resolve(None).remeals_user.is_authenticated)
+        self.assertFalse(self._resolve("NOPE").remeals_user.is_authenticated)
+
+    # 3. Role and profile changes invalidate the cached caller
+    def test_role_and_profile_changes_invalidate(self):
+        self.assertFalse(self._resolve().remeals_user.is_donor)
+        Donor.objects.create(user=self.user, restaurant_id=self.restaurant)
+        self.assertTrue(self._resolve().remeals_user.is_donor)
+
+        admin = Admin.objects.create(user=self.user)
+        self.assertTrue(self._resolve().remeals_user.is_admin)
+        admin.delete()
+        self.assertFalse(self._resolve().remeals_user.is_admin)
+
+        self.user.restaurant = None
+        self.user.save()
+        self.assertIsNone(self._resolve().remeals_user.restaurant_id)
+
+    # 4. Donation permission checks run no user queries once the caller is cached
+    def test_donation_permission_check_uses_cached_caller(self):
+        donation = Donation.objects.create(restaurant=self.restaurant)
+        url = f"/api/donations/{donation.donation_id}/"
+        headers = {"HTTP_X_USER_ID": "UCUR01"}
+        self._resolve().remeals_user.user_id
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(
+                url, data=json.dumps({"status": "declined"}), content_type="application/json", **headers
+            )
+        self.assertEqual(response.status_code, 200)
+        user_lookups = [q["sql"] for q in ctx.captured_queries if 'FROM "users_user"' in q["sql"]]
+        self.assertEqual(user_lookups, [])
+
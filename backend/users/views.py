@@ -1,4 +1,3 @@
-import os
 import uuid
 from datetime import datetime
 
@@ -7,10 +6,13 @@ from rest_framework.response import Response
 
 from drf_yasg.utils import swagger_auto_schema
 
-from django.contrib.auth.hashers import make_password, check_password, identify_hasher
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, identify_hasher
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
 
 from .serializers import SignupSerializer, LoginSerializer, UpdateProfileSerializer
 from .models import User, Admin, DeliveryStaff
+from .passwords import PasswordCheckBusy, verify_password
 from restaurants.models import Restaurant
 from restaurant_chain.models import RestaurantChain
 
@@ -22,14 +24,39 @@ def _is_hashed(value: str) -> bool:
         return False
 
 
-def _admin_emails():
-    raw = os.environ.get("ADMIN_EMAILS", "")
-    return {email.strip().lower() for email in raw.split(",") if email.strip()}
+def _find_login_user(identifier):
+    """
+    The user whose email or username is `identifier`, with their restaurant
+    and Admin/DeliveryStaff flags, in one query. An email match wins.
+    """
+    return (
+        User.objects.select_related("restaurant")
+        .filter(Q(email=identifier) | Q(username=identifier))
+        .annotate(
+            has_admin_role=Exists(Admin.objects.filter(user=OuterRef("pk"))),
+            has_delivery_role=Exists(DeliveryStaff.objects.filter(user=OuterRef("pk"))),
+        )
+        .order_by(Case(When(email=identifier, then=Value(0)), default=Value(1)))
+        .first()
+    )
 
 
-def _delivery_staff_emails():
-    raw = os.environ.get("DELIVERY_STAFF_EMAILS", "")
-    return {email.strip().lower() for email in raw.split(",") if email.strip()}
+def _grant_listed_roles(user, is_admin, is_delivery_staff):
+    """Give the roles ADMIN_EMAILS / DELIVERY_STAFF_EMAILS list for the user's email."""
+    email = user.email.lower()
+    if not is_admin and email in settings.ADMIN_EMAILS:
+        Admin.objects.get_or_create(user=user)
+        is_admin = True
+    if not is_delivery_staff and email in settings.DELIVERY_STAFF_EMAILS:
+        DeliveryStaff.objects.get_or_create(
+            user=user,
+            defaults={
+                "assigned_area": settings.DELIVERY_STAFF_DEFAULT_AREA,
+                "is_available": True,
+            },
+        )
+        is_delivery_staff = True
+    return is_admin, is_delivery_staff
 
 
 @swagger_auto_schema(method="post", request_body=SignupSerializer)
@@ -114,21 +141,7 @@ def signup(request):
         restaurant_address=restaurant_address or (restaurant.address if restaurant else ""),
     )
 
-    is_admin = False
-    is_delivery_staff = False
-
-    if user.email.lower() in _admin_emails():
-        Admin.objects.get_or_create(user=user)
-        is_admin = True
-    if user.email.lower() in _delivery_staff_emails():
-        DeliveryStaff.objects.get_or_create(
-            user=user,
-            defaults={
-                "assigned_area": os.environ.get("DELIVERY_STAFF_DEFAULT_AREA", "General"),
-                "is_available": True,
-            },
-        )
-        is_delivery_staff = True
+    is_admin, is_delivery_staff = _grant_listed_roles(user, False, False)
 
     return Response({
         "message": "Signup successful",
@@ -156,15 +169,14 @@ def login(request):
     identifier = serializer.validated_data["identifier"]
     password = serializer.validated_data["password"]
 
-    try:
-        user = User.objects.get(email=identifier)
-    except User.DoesNotExist:
-        try:
-            user = User.objects.get(username=identifier)
-        except User.DoesNotExist:
-            return Response({"error": "User not found"}, status=404)
+    user = _find_login_user(identifier)
+    if user is None:
+        return Response({"error": "User not found"}, status=404)
 
-    password_valid = check_password(password, user.password)
+    try:
+        password_valid = verify_password(password, user.password)
+    except PasswordCheckBusy as exc:
+        return Response({"error": str(exc)}, status=503)
     if not password_valid:
         if not _is_hashed(user.password) and user.password == password:
             user.password = make_password(password)
@@ -174,20 +186,9 @@ def login(request):
     if not password_valid:
         return Response({"error": "Invalid password"}, status=400)
 
-    is_admin = Admin.objects.filter(user=user).exists()
-    if not is_admin and user.email.lower() in _admin_emails():
-        Admin.objects.get_or_create(user=user)
-        is_admin = True
-    is_delivery_staff = DeliveryStaff.objects.filter(user=user).exists()
-    if not is_delivery_staff and user.email.lower() in _delivery_staff_emails():
-        DeliveryStaff.objects.get_or_create(
-            user=user,
-            defaults={
-                "assigned_area": os.environ.get("DELIVERY_STAFF_DEFAULT_AREA", "General"),
-                "is_available": True,
-            },
-        )
-        is_delivery_staff = True
+    is_admin, is_delivery_staff = _grant_listed_roles(
+        user, user.has_admin_role, user.has_delivery_role
+    )
 
     return Response(
         {
@@ -0,0 +1,231 @@
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from delivery.models import Delivery
+from fooditem.models import FoodItem
+from fooditem.serializers import FoodItemSerializer
+from .models import Warehouse
+
+GENERATION_KEY = "warehouse-inventory:generation"
+SUMMARY_VERSION_KEY = "warehouse-inventory:summary-version"
+
+
+def _snapshot_key(warehouse_id):
+    return f"warehouse-inventory:{warehouse_id}"
+
+
+def _fresh_key(warehouse_id):
+    generation = cache.get_or_set(GENERATION_KEY, 0, None)
+    return f"warehouse-inventory:{warehouse_id}:fresh:{generation}"
+
+
+def _load_items(warehouse_id):
+    """Serialized food items of every donation delivered to the warehouse."""
+    delivered = Delivery.objects.filter(
+        warehouse_id=warehouse_id,
+        dropoff_location_type="warehouse",
+        status="delivered",
+    ).values("donation_id")
+    items = FoodItem.objects.filter(donation__in=delivered)
+    return {item["food_id"]: dict(item) for item in FoodItemSerializer(items, many=True).data}
+
+
+def _totals(items):
+    by_category = defaultdict(lambda: {"items": 0, "quantity": 0})
+    by_unit = defaultdict(lambda: {"items": 0, "quantity": 0})
+    for item in items:
+        for bucket in (by_category[item["category"] or "uncategorized"], by_unit[item["unit"]]):
+            bucket["items"] += 1
+            bucket["quantity"] += item["quantity"]
+    return {"by_category": dict(by_category), "by_unit": dict(by_unit)}
+
+
+def _rebuild(warehouse_id, previous):
+    """
+    Reload the items and stamp the ones that differ from the previous
+    snapshot with a new version, so deltas can be answered from the cache.
+    """
+    version = int(time.time() * 1000)
+    if previous:
+        version = max(version, previous["version"] + 1)
+    items = _load_items(warehouse_id)
+
+    if previous is None:
+        stamps, removed, base = dict.fromkeys(items, version), {}, version
+    else:
+        old_items, stamps = previous["items"], {}
+        for food_id, data in items.items():
+            unchanged = old_items.get(food_id) == data
+            stamps[food_id] = previous["stamps"][food_id] if unchanged else version
+        removed = {
+            food_id: stamp
+            for food_id, stamp in previous["removed"].items()
+            if food_id not in items
+        }
+        removed.update(dict.fromkeys(old_items.keys() - items.keys(), version))
+        base = previous["base"]
+
+    return {
+        "version": version,
+        "base": base,
+        "items": items,
+        "stamps": stamps,
+        "removed": removed,
+        "totals": _totals(items.values()),
+    }
+
+
+def get_inventory_snapshot(warehouse_id):
+    """
+    Return the cached inventory snapshot of a warehouse, rebuilding it when a
+    delivery or food item it depends on has changed.
+
+    A snapshot holds the serialized items, their totals by category and unit,
+    and per-item version stamps for ?since= deltas.
+    """
+    fresh_key = _fresh_key(warehouse_id)
+    snapshot = cache.get(_snapshot_key(warehouse_id))
+    if snapshot is None or not cache.get(fresh_key):
+        snapshot = _rebuild(warehouse_id, snapshot)
+        cache.set(_snapshot_key(warehouse_id), snapshot, settings.INVENTORY_SNAPSHOT_SECONDS)
+        cache.set(fresh_key, True, settings.INVENTORY_CACHE_SECONDS)
+    return snapshot
+
+
+def inventory_delta(snapshot, since=None):
+    """
+    Items changed after version `since` and the ids removed since then.
+
+    Returns (items, removed, full). A full list is returned when no version
+    was given or the snapshot no longer reaches back to it.
+    """
+    items = snapshot["items"]
+    if since is None or since < snapshot["base"]:
+        return list(items.values()), [], True
+    changed = [data for food_id, data in items.items() if snapshot["stamps"][food_id] > since]
+    removed = sorted(food_id for food_id, stamp in snapshot["removed"].items() if stamp > since)
+    return changed, removed, False
+
+
+def _summary_rows(today, days):
+    """
+    Inventory figures per (warehouse, unit) in one grouped query.
+
+    Rows are reached through the deliveries that brought a donation to the
+    warehouse; when a donation was delivered there more than once, only its
+    first delivery is joined so its items are not counted twice.
+    """
+    earlier = Delivery.objects.filter(
+        warehouse_id=OuterRef("warehouse_id"),
+        donation_id=OuterRef("donation_id"),
+        dropoff_location_type="warehouse",
+        status="delivered",
+        delivery_id__lt=OuterRef("delivery_id"),
+    )
+    in_stock = Q(donation_id__food_items__is_distributed=False)
+    return (
+        Delivery.objects.filter(
+            dropoff_location_type="warehouse",
+            status="delivered",
+            donation_id__food_items__isnull=False,
+        )
+        .exclude(Exists(earlier))
+        .values("warehouse_id", unit=F("donation_id__food_items__unit"))
+        .annotate(
+            items=Count("donation_id__food_items"),
+            stock_items=Count("donation_id__food_items", filter=in_stock),
+            quantity=Coalesce(Sum("donation_id__food_items__quantity", filter=in_stock), 0),
+            expired=Count(
+                "donation_id__food_items",
+                filter=in_stock & Q(donation_id__food_items__is_expired=True),
+            ),
+            expiring_soon=Count(
+                "donation_id__food_items",
+                filter=in_stock
+                & Q(
+                    donation_id__food_items__is_expired=False,
+                    donation_id__food_items__expire_date__gte=today,
+                    donation_id__food_items__expire_date__lte=today + timedelta(days=days),
+                ),
+            ),
+        )
+        .order_by()
+    )
+
+
+def _load_summary(today, days):
+    """
+    Quantities in different units (kg, pieces, boxes) are never added up;
+    stock and utilization are reported per unit.
+    """
+    warehouses = {
+        warehouse_id: {
+            "warehouse_id": warehouse_id,
+            "address": address,
+            "capacity": capacity,
+            "total_items": 0,
+            "expiring_soon": 0,
+            "expired": 0,
+            "by_unit": {},
+        }
+        for warehouse_id, address, capacity in Warehouse.objects.order_by("warehouse_id").values_list(
+            "warehouse_id", "address", "capacity"
+        )
+    }
+    for row in _summary_rows(today, days):
+        summary = warehouses.get(row["warehouse_id"])
+        if summary is None:
+            continue
+        summary["total_items"] += row["items"]
+        summary["expiring_soon"] += row["expiring_soon"]
+        summary["expired"] += row["expired"]
+        capacity = summary["capacity"]
+        summary["by_unit"][row["unit"]] = {
+            "items": row["stock_items"],
+            "quantity": row["quantity"],
+            "utilization": round(row["quantity"] / capacity, 4) if capacity else None,
+        }
+    return list(warehouses.values())
+
+
+def get_inventory_summary(days=3):
+    """
+    Item counts, expiry, and stock and capacity utilization by unit for every
+    warehouse. Cached until a warehouse, delivery or linked food item changes.
+    """
+    today = timezone.localdate()
+    version = cache.get_or_set(SUMMARY_VERSION_KEY, uuid.uuid4().hex, None)
+    generation = cache.get_or_set(GENERATION_KEY, 0, None)
+    key = f"warehouse-inventory:summary:{version}:{generation}:{today}:{days}"
+    summary = cache.get(key)
+    if summary is None:
+        summary = _load_summary(today, days)
+        cache.set(key, summary, settings.INVENTORY_CACHE_SECONDS)
+    return summary
+
+
+def invalidate_warehouse_inventory(*warehouse_ids):
+    """
+    Mark inventory snapshots stale. The snapshots themselves are kept as the
+    base for the next delta. The all-warehouse summary is always dropped.
+    """
+    cache.delete_many(
+        [_fresh_key(warehouse_id) for warehouse_id in warehouse_ids if warehouse_id]
+        + [SUMMARY_VERSION_KEY]
+    )
+
+
+def invalidate_all_warehouse_inventory():
+    """Mark every warehouse's snapshot stale, e.g. after a bulk UPDATE."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
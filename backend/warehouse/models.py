@@ -1,6 +1,6 @@
 from django.db import models
 
-from re_meals_api.id_utils import generate_prefixed_id
+from re_meals_api.id_utils import PrefixedIdManager, generate_prefixed_id
 
 
 class Warehouse(models.Model):
@@ -12,6 +12,8 @@ class Warehouse(models.Model):
     stored_date = models.DateField()
     exp_date = models.DateField()
 
+    objects = PrefixedIdManager()
+
     def save(self, *args, **kwargs):
         if not self.warehouse_id:
             self.warehouse_id = generate_prefixed_id(
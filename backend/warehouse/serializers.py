@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from .models import Warehouse
+from re_meals_api.sparse_fields import SparseFieldsetMixin
 
-class WarehouseSerializer(serializers.ModelSerializer):
+class WarehouseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Warehouse
         fields = [
@@ -11,4 +12,7 @@ class WarehouseSerializer(serializers.ModelSerializer):
             "stored_date",
             "exp_date",
         ]
-        
\ No newline at end of file
+        
+
+class InventorySummaryQuerySerializer(serializers.Serializer):
+    days = serializers.IntegerField(required=False, default=3, min_value=0, max_value=30)
@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from delivery.models import Delivery
+from fooditem.models import FoodItem
+from .inventory import invalidate_warehouse_inventory
+from .models import Warehouse
+
+
+@receiver(post_save, sender=Delivery)
+@receiver(post_delete, sender=Delivery)
+def invalidate_inventory_for_delivery(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Deliveries either bring a donation in or take stock out; both change
+    # the warehouse they name, and a reassigned delivery the old one too.
+    warehouse_ids = {instance.warehouse_id_id}
+    loaded = getattr(instance, "_loaded_values", None) or {}
+    warehouse_ids.add(loaded.get("warehouse_id_id"))
+    invalidate_warehouse_inventory(*warehouse_ids)
+
+
+@receiver(post_save, sender=FoodItem)
+@receiver(post_delete, sender=FoodItem)
+def invalidate_inventory_for_food_item(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    warehouse_ids = set(
+        Delivery.objects.filter(
+            donation_id=instance.donation_id,
+            dropoff_location_type="warehouse",
+        ).values_list("warehouse_id", flat=True)
+    )
+    invalidate_warehouse_inventory(*warehouse_ids)
+
+
+@receiver(post_save, sender=Warehouse)
+@receiver(post_delete, sender=Warehouse)
+def invalidate_inventory_for_warehouse(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_warehouse_inventory(instance.warehouse_id)
@@ -1,5 +1,11 @@
 from datetime import timedelta
+from io import StringIO
 
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework.test import APITestCase
 
@@ -142,13 +148,19 @@ class WarehouseAPITests(APITestCase):
         response = self.client.get(self._inventory_url(self.warehouse))
         self.assertEqual(response.data["total_items"], 1)
 
-    # 9. Inventory marks expired items when expire_date is in the past.
-    def test_inventory_marks_expired_items(self):
+    # 9. Inventory is read-only; the expiry sweeper flags past-due items.
+    def test_inventory_does_not_write_and_sweeper_marks_expired(self):
         donation = self._create_donation("DONEXPIRED")
         self._create_delivery(donation, self.warehouse, delivery_id="DLV003")
         expired_item = self._create_food_item(donation, name="Expired", expire_offset_days=-1)
         self.assertFalse(expired_item.is_expired)
-        self.client.get(self._inventory_url(self.warehouse))
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self._inventory_url(self.warehouse))
+        self.assertTrue(all(q["sql"].startswith("SELECT") for q in ctx.captured_queries))
+        expired_item.refresh_from_db()
+        self.assertFalse(expired_item.is_expired)
+
+        call_command("expire_food_items", stdout=StringIO())
         expired_item.refresh_from_db()
         self.assertTrue(expired_item.is_expired)
 
@@ -294,7 +306,7 @@ class WarehouseAPITests(APITestCase):
 
     # 24. Warehouse listing returns data for created warehouses
     def test_list_warehouses_shows_created(self):
-        response = self.client.get("/api/warehouse/warehouses/")
+        response = self.client.get("/api/warehouse/warehouses/?all=1")
         self.assertEqual(response.status_code, 200)
         ids = {item["warehouse_id"] for item in response.data}
         self.assertIn(self.warehouse.warehouse_id, ids)
@@ -397,3 +409,161 @@ class WarehouseAPITests(APITestCase):
         self.assertEqual(response.status_code, 200)
         self.warehouse.refresh_from_db()
         self.assertEqual(self.warehouse.capacity, 750.0)
+
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class WarehouseInventorySnapshotTests(WarehouseAPITests):
+    """Runs the inventory tests above against a real cache, plus the cases below."""
+
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+
+    def _seed(self):
+        self.donation = self._create_donation("DONSNAP")
+        self.delivery = self._create_delivery(self.donation, self.warehouse, delivery_id="DLVSNAP")
+        self.rice = self._create_food_item(self.donation, name="Rice", quantity=4)
+        self.soup = FoodItem.objects.create(
+            name="Soup", quantity=3, unit="bowl", category="Vegan",
+            expire_date=timezone.now().date() + timedelta(days=5), donation=self.donation,
+        )
+
+    # 35. Snapshots carry totals by category and unit.
+    def test_inventory_totals(self):
+        self._seed()
+        response = self.client.get(self._inventory_url(self.warehouse))
+        self.assertTrue(response.data["full"])
+        self.assertEqual(response.data["total_items"], 2)
+        totals = response.data["totals"]
+        self.assertEqual(totals["by_unit"], {"kg": {"items": 1, "quantity": 4}, "bowl": {"items": 1, "quantity": 3}})
+        self.assertEqual(totals["by_category"]["Vegan"], {"items": 1, "quantity": 3})
+        self.assertEqual(totals["by_category"]["uncategorized"], {"items": 1, "quantity": 4})
+
+    # 36. A warm snapshot is served with only the warehouse lookup.
+    def test_inventory_served_from_cache(self):
+        self._seed()
+        self.client.get(self._inventory_url(self.warehouse))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self._inventory_url(self.warehouse))
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(response.data["total_items"], 2)
+
+    # 37. ?since= returns only items changed or removed after that version.
+    def test_inventory_delta_since_version(self):
+        self._seed()
+        version = self.client.get(self._inventory_url(self.warehouse)).data["version"]
+
+        unchanged = self.client.get(self._inventory_url(self.warehouse), {"since": version})
+        self.assertFalse(unchanged.data["full"])
+        self.assertEqual(unchanged.data["inventory"], [])
+
+        self.rice.quantity = 1
+        self.rice.save()
+        soup_id = self.soup.food_id
+        self.soup.delete()
+        delta = self.client.get(self._inventory_url(self.warehouse), {"since": version})
+        self.assertGreater(delta.data["version"], version)
+        self.assertEqual([item["name"] for item in delta.data["inventory"]], ["Rice"])
+        self.assertEqual(delta.data["inventory"][0]["quantity"], 1)
+        self.assertEqual(delta.data["removed"], [soup_id])
+        self.assertEqual(delta.data["total_items"], 1)
+
+    # 38. Delivery status changes invalidate the warehouse snapshot.
+    def test_inventory_follows_delivery_status(self):
+        self._seed()
+        self.client.get(self._inventory_url(self.warehouse))
+        self.delivery.status = "pending"
+        self.delivery.save()
+        response = self.client.get(self._inventory_url(self.warehouse))
+        self.assertEqual(response.data["total_items"], 0)
+
+    # 39. Stale or malformed versions fall back to a full list or a 400.
+    def test_inventory_since_fallbacks(self):
+        self._seed()
+        full = self.client.get(self._inventory_url(self.warehouse), {"since": 1})
+        self.assertTrue(full.data["full"])
+        self.assertEqual(len(full.data["inventory"]), 2)
+        bad = self.client.get(self._inventory_url(self.warehouse), {"since": "yesterday"})
+        self.assertEqual(bad.status_code, 400)
+
+    # 40. The expiry sweeper marks every snapshot stale.
+    def test_expiry_sweeper_invalidates_snapshots(self):
+        self._seed()
+        version = self.client.get(self._inventory_url(self.warehouse)).data["version"]
+        FoodItem.objects.filter(pk=self.rice.pk).update(expire_date=timezone.now().date() - timedelta(days=1))
+        call_command("expire_food_items", stdout=StringIO())
+        delta = self.client.get(self._inventory_url(self.warehouse), {"since": version})
+        self.assertEqual([item["name"] for item in delta.data["inventory"]], ["Rice"])
+        self.assertTrue(delta.data["inventory"][0]["is_expired"])
+
+    def _summary_for(self, response, warehouse):
+        return next(row for row in response.data["warehouses"] if row["warehouse_id"] == warehouse.warehouse_id)
+
+    # 41. The summary reports item counts, stock by unit, expiry and utilization.
+    def test_inventory_summary_figures(self):
+        self._seed()
+        self._create_food_item(self.donation, name="Old Bread", quantity=2, expire_offset_days=-1, is_expired=True)
+        self._create_food_item(self.donation, name="Given Away", quantity=9, is_distributed=True)
+        empty = Warehouse.objects.create(
+            warehouse_id="WAHEMPTY", address="Empty Lane", capacity=0.0,
+            stored_date=timezone.now().date(), exp_date=timezone.now().date(),
+        )
+
+        response = self.client.get("/api/warehouse/warehouses/inventory-summary/", {"days": 7})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["expiring_within_days"], 7)
+        summary = self._summary_for(response, self.warehouse)
+        self.assertEqual(summary["total_items"], 4)
+        self.assertNotIn("utilization", summary)
+        self.assertEqual(summary["by_unit"]["bowl"], {"items": 1, "quantity": 3, "utilization": round(3 / 500, 4)})
+        self.assertEqual(summary["by_unit"]["kg"], {"items": 2, "quantity": 6, "utilization": round(6 / 500, 4)})
+        self.assertEqual(summary["expiring_soon"], 2)
+        self.assertEqual(summary["expired"], 1)
+
+        empty_summary = self._summary_for(response, empty)
+        self.assertEqual(empty_summary["total_items"], 0)
+        self.assertEqual(empty_summary["by_unit"], {})
+
+    # 42. The expiring-soon window follows ?days= and rejects bad values.
+    def test_inventory_summary_days_window(self):
+        self._seed()
+        url = "/api/warehouse/warehouses/inventory-summary/"
+        self.assertEqual(self._summary_for(self.client.get(url, {"days": 1}), self.warehouse)["expiring_soon"], 0)
+        self.assertEqual(self.client.get(url, {"days": "soon"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"days": 365}).status_code, 400)
+
+    # 43. A donation delivered to a warehouse twice is only counted once.
+    def test_inventory_summary_counts_repeat_deliveries_once(self):
+        self._seed()
+        self._create_delivery(self.donation, self.warehouse, delivery_id="DLVSNAP2")
+        response = self.client.get("/api/warehouse/warehouses/inventory-summary/")
+        self.assertEqual(self._summary_for(response, self.warehouse)["total_items"], 2)
+
+    # 44. The summary is one grouped query plus the warehouse list, then cached.
+    def test_inventory_summary_cached(self):
+        self._seed()
+        url = "/api/warehouse/warehouses/inventory-summary/"
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        self.assertEqual(len(ctx.captured_queries), 2)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    # 45. Food item, delivery and warehouse changes refresh the summary.
+    def test_inventory_summary_invalidation(self):
+        self._seed()
+        url = "/api/warehouse/warehouses/inventory-summary/"
+        self.client.get(url)
+        self.rice.quantity = 1
+        self.rice.save()
+        self.assertEqual(self._summary_for(self.client.get(url), self.warehouse)["by_unit"]["kg"]["quantity"], 1)
+        self.warehouse.capacity = 4.0
+        self.warehouse.save()
+        self.assertEqual(self._summary_for(self.client.get(url), self.warehouse)["by_unit"]["kg"]["utilization"], 0.25)
+        self.delivery.status = "pending"
+        self.delivery.save()
+        self.assertEqual(self._summary_for(self.client.get(url), self.warehouse)["total_items"], 0)
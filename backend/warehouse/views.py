@@ -1,56 +1,72 @@
-from django.utils import timezone
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import Warehouse
 from .serializers import WarehouseSerializer
-from fooditem.models import FoodItem
-from fooditem.serializers import FoodItemSerializer
-from delivery.models import Delivery
+from .inventory import get_inventory_snapshot, get_inventory_summary, inventory_delta
+from .serializers import InventorySummaryQuerySerializer
+from re_meals_api.db_router import use_replica
+from re_meals_api.sparse_fields import SparseFieldsetViewMixin
 
 
-class WarehouseViewSet(viewsets.ModelViewSet):
+class WarehouseViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Warehouse.objects.all()
     serializer_class = WarehouseSerializer
     permission_classes = [permissions.AllowAny]
 
     @action(detail=True, methods=['get'], url_path='inventory')
+    @use_replica
     def inventory(self, request, pk=None):
         """
         Get all food items currently in this warehouse.
         Returns items that are:
         - Delivered to this warehouse (via completed deliveries)
-        - Includes expired items (flagged via `is_expired`)
+        - Includes expired items (flagged via `is_expired` by the
+          expire_food_items sweeper; this endpoint never writes)
         - Includes claimed/distributed items so that admins have full visibility
+
+        Served from a cached snapshot. With ?since=<version> only items that
+        changed after that version are listed, plus the ids removed since.
         """
         warehouse = self.get_object()
-        today = timezone.now().date()
-
-        # Find all deliveries that brought food to this warehouse and are completed
-        delivered_to_warehouse = Delivery.objects.filter(
-            warehouse_id=warehouse,
-            dropoff_location_type='warehouse',
-            status='delivered'
-        ).values_list('donation_id', flat=True)
-
-        # Mark expired items
-        expired_items = FoodItem.objects.filter(
-            donation__donation_id__in=delivered_to_warehouse,
-            expire_date__lt=today,
-            is_expired=False
-        )
-        expired_items.update(is_expired=True)
-
-        # Get food items from those donations, regardless of expiry/claim status.
-        food_items = FoodItem.objects.filter(
-            donation__donation_id__in=delivered_to_warehouse
-        ).select_related('donation', 'donation__restaurant')
-
-        serializer = FoodItemSerializer(food_items, many=True)
+
+        since = request.query_params.get('since')
+        if since is not None:
+            try:
+                since = int(since)
+            except ValueError:
+                return Response(
+                    {'since': ['A version number from an earlier response is required.']},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        snapshot = get_inventory_snapshot(warehouse.warehouse_id)
+        inventory, removed, full = inventory_delta(snapshot, since)
 
         return Response({
             'warehouse_id': warehouse.warehouse_id,
             'warehouse_address': warehouse.address,
-            'total_items': food_items.count(),
-            'inventory': serializer.data
+            'version': snapshot['version'],
+            'full': full,
+            'total_items': len(snapshot['items']),
+            'totals': snapshot['totals'],
+            'inventory': inventory,
+            'removed': removed,
+        })
+
+    @action(detail=False, methods=['get'], url_path='inventory-summary')
+    @use_replica
+    def inventory_summary(self, request):
+        """
+        Inventory overview of every warehouse: item count, expired and
+        expiring-soon items, and stock and capacity utilization by unit.
+
+        Filters: days (expiry window, default 3).
+        """
+        params = InventorySummaryQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        days = params.validated_data['days']
+        return Response({
+            'expiring_within_days': days,
+            'warehouses': get_inventory_summary(days),
         })
@@ -232,26 +232,6 @@ type DeliveryRecordApi = {
   delivery_quantity?: string | null;
 };
 
-type ImpactRecord = {
-  impact_id: string;
-  meals_saved: number;
-  weight_saved_kg: number;
-  co2_reduced_kg: number;
-  impact_date: string;
-  food: string;
-};
-
-type LooseImpactRecord = {
-  impact_id?: string;
-  pk?: string;
-  id?: string;
-  meals_saved?: number | string;
-  weight_saved_kg?: number | string;
-  co2_reduced_kg?: number | string;
-  impact_date?: string;
-  food?: string;
-};
-
 // Interactive Weekly Meals Chart Component
 function WeeklyMealsChart({ data }: { data: Array<{ weekKey: string; meals: number; co2: number; startDate: Date; endDate: Date }> }) {
   const [hoveredIndex, setHoveredIndex] = useState<number | null>(null);
@@ -709,47 +689,6 @@ function CO2TrendChart({ data }: { data: Array<{ weekKey: string; co2: number; s
   );
 }
 
-const normalizeImpactData = (raw: unknown): ImpactRecord[] => {
-  // Handle paginated response
-  let data: ImpactRecord[] = [];
-  if (Array.isArray(raw)) {
-    data = raw;
-  } else if (raw && typeof raw === "object") {
-    const obj = raw as { results?: unknown; data?: unknown };
-    if (Array.isArray(obj.results)) {
-      data = obj.results;
-    } else if (Array.isArray(obj.data)) {
-      data = obj.data;
-    }
-  }
-
-  return data.map((record: LooseImpactRecord) => {
-    // Handle both 'impact_id' and 'pk' field names
-    const impactId = record.impact_id ?? record.pk ?? record.id ?? "";
-
-    // Handle food field - could be string, number, or nested object
-    let foodValue = "";
-    if (typeof record.food === "string") {
-      foodValue = record.food.trim();
-    } else if (typeof record.food === "number") {
-      foodValue = String(record.food);
-    } else if (record.food && typeof record.food === "object") {
-      // If it's an object, try to extract food_id
-      foodValue = (record.food as any).food_id || (record.food as any).id || "";
-      if (foodValue) foodValue = String(foodValue).trim();
-    }
-
-    return {
-      impact_id: typeof impactId === "string" ? impactId : "",
-      meals_saved: Number(record.meals_saved ?? 0),
-      weight_saved_kg: Number(record.weight_saved_kg ?? 0),
-      co2_reduced_kg: Number(record.co2_reduced_kg ?? 0),
-      impact_date: record.impact_date ?? "",
-      food: foodValue,
-    };
-  });
-};
-
 // Popular suggestions & label formatter removed since suggestion UI is not active here.
 
 const createFoodItemId = () => {
@@ -802,6 +741,7 @@ const API_PATHS = {
   deliveryStaff: "/users/delivery-staff/",
   donationRequests: "/donation-requests/",
   impact: "/impact/",
+  dashboard: "/dashboard/",
 };
 
 // Helper function to format API errors into user-friendly messages
@@ -1020,7 +960,39 @@ async function apiFetch<T>(path: string, options: RequestInit = {}): Promise<T>
     return {} as T;
   }
 
-  return response.json() as Promise<T>;
+  const data = await response.json();
+  if (!isCursorPage(data)) {
+    return data as T;
+  }
+
+  // List endpoints are cursor-paginated; follow `next` so callers keep
+  // receiving the full array.
+  const results = [...data.results];
+  let next = data.next;
+  while (next) {
+    const pageResponse = await fetch(next, { ...options, headers: mergedHeaders });
+    if (!pageResponse.ok) {
+      throw new Error(`Request failed (${pageResponse.status}). Please try again.`);
+    }
+    const page = await pageResponse.json();
+    if (!isCursorPage(page)) {
+      break;
+    }
+    results.push(...page.results);
+    next = page.next;
+  }
+  return results as T;
+}
+
+type CursorPage = { next: string | null; previous: string | null; results: unknown[] };
+
+function isCursorPage(data: unknown): data is CursorPage {
+  return (
+    typeof data === "object" &&
+    data !== null &&
+    Array.isArray((data as CursorPage).results) &&
+    "next" in data
+  );
 }
 
 // Animated Number Component
@@ -1092,171 +1064,60 @@ function AnimatedNumber({
   );
 }
 
+type HeatMapCell = {
+  community: string;
+  community_name: string | null;
+  month: string;
+  meals: number;
+};
+
+type ImpactTotalsApi = {
+  records: number;
+  meals_saved: number;
+  weight_saved_kg: number;
+  co2_reduced_kg: number;
+};
+
+type DashboardBootstrap = {
+  impact: {
+    totals: ImpactTotalsApi;
+    period: string;
+    series: Array<ImpactTotalsApi & { period_start: string }>;
+  };
+  leaderboard: {
+    restaurants: Array<{
+      rank: number;
+      restaurant_id: string;
+      name: string;
+      branch_name: string;
+      meals_saved: number;
+      weight_saved_kg: number;
+      co2_reduced_kg: number;
+    }>;
+  };
+  heat_map: { cells: HeatMapCell[] };
+  counts: { restaurants: number; communities: number; donations: number; food_items: number };
+};
+
 // Community Impact Heat Map Component
 function CommunityImpactHeatMap({
-  impactRecords,
-  deliveries,
-  communities,
+  cells,
   loading
 }: {
-  impactRecords: ImpactRecord[];
-  deliveries: DeliveryRecordApi[];
-  communities: Community[];
+  cells: HeatMapCell[];
   loading: boolean;
 }) {
   const [hoveredCell, setHoveredCell] = useState<{ community: string; month: string } | null>(null);
 
-  // Normalize food ID to match format (FOO0000001) - same as main component
-  const normalizeFoodId = (foodId: string | number | null | undefined): string => {
-    if (!foodId) return "";
-    const foodIdStr = String(foodId).trim();
-    if (!foodIdStr) return "";
-
-    // If it already starts with FOO, normalize the digits
-    if (foodIdStr.startsWith("FOO") || foodIdStr.startsWith("foo")) {
-      const digits = foodIdStr.replace(/\D/g, '');
-      return digits ? `FOO${digits.padStart(7, '0')}` : foodIdStr.toUpperCase();
-    }
-
-    // Extract digits and format as FOO0000000
-    const digits = foodIdStr.replace(/\D/g, '');
-    if (!digits) return foodIdStr;
-    return `FOO${digits.padStart(7, '0')}`;
-  };
-
-  // Build data maps
+  // Cells are already split by community and month on the server
   const communityMonthMap = useMemo(() => {
     const map = new Map<string, number>();
-
-    console.log("Building community heat map:", {
-      impactRecords: impactRecords.length,
-      deliveries: deliveries.length,
-      communities: communities.length,
-    });
-
-    // Build delivery map with multiple key formats for flexible lookup
-    const foodToDelivery = new Map<string, DeliveryRecordApi[]>();
-    const deliveryKeys = new Set<string>();
-
-    deliveries.forEach(delivery => {
-      if (delivery.delivery_type === "distribution" && delivery.food_item && delivery.status === "delivered") {
-        const foodItemValue = String(delivery.food_item).trim();
-        if (!foodItemValue) return;
-
-        const normalizedFoodId = normalizeFoodId(foodItemValue);
-
-        // Store with normalized key
-        if (!foodToDelivery.has(normalizedFoodId)) {
-          foodToDelivery.set(normalizedFoodId, []);
-        }
-        foodToDelivery.get(normalizedFoodId)!.push(delivery);
-        deliveryKeys.add(normalizedFoodId);
-
-        // Also store with original format for lookup
-        if (foodItemValue !== normalizedFoodId) {
-          if (!foodToDelivery.has(foodItemValue)) {
-            foodToDelivery.set(foodItemValue, []);
-          }
-          foodToDelivery.get(foodItemValue)!.push(delivery);
-          deliveryKeys.add(foodItemValue);
-        }
-      }
-    });
-
-    console.log("Delivery map created:", {
-      totalDeliveries: deliveries.filter(d => d.delivery_type === "distribution" && d.status === "delivered").length,
-      uniqueFoodItems: deliveryKeys.size,
-      sampleKeys: Array.from(deliveryKeys).slice(0, 5),
-    });
-
-    let matchedImpacts = 0;
-    let skippedNoFood = 0;
-    let skippedNoDeliveries = 0;
-
-    impactRecords.forEach(impact => {
-      // Handle food field - could be string, number, or object
-      let foodIdValue: string = "";
-      if (typeof impact.food === "string") {
-        foodIdValue = impact.food.trim();
-      } else if (typeof impact.food === "number") {
-        foodIdValue = String(impact.food);
-      } else if (impact.food && typeof impact.food === "object") {
-        foodIdValue = (impact.food as any).food_id || (impact.food as any).id || "";
-      }
-
-      if (!foodIdValue) {
-        skippedNoFood++;
-        return;
-      }
-
-      const normalizedFoodId = normalizeFoodId(foodIdValue);
-
-      // Try multiple lookup strategies
-      const distributionDeliveries = foodToDelivery.get(normalizedFoodId) ||
-        foodToDelivery.get(foodIdValue) ||
-        foodToDelivery.get(foodIdValue.toUpperCase()) ||
-        foodToDelivery.get(foodIdValue.toLowerCase()) ||
-        [];
-
-      if (distributionDeliveries.length === 0) {
-        skippedNoDeliveries++;
-        if (skippedNoDeliveries <= 3) {
-          console.log("No deliveries found for impact:", {
-            impactId: impact.impact_id,
-            foodValue: foodIdValue,
-            normalized: normalizedFoodId,
-            availableDeliveryKeys: Array.from(deliveryKeys).slice(0, 5),
-          });
-        }
-        return;
-      }
-
-      matchedImpacts++;
-
-      let totalQuantity = 0;
-      const deliveryQuantities = new Map<string, number>();
-
-      distributionDeliveries.forEach(delivery => {
-        if (delivery.delivery_quantity) {
-          const quantityMatch = delivery.delivery_quantity.match(/^(\d+(?:\.\d+)?)/);
-          if (quantityMatch) {
-            const qty = parseFloat(quantityMatch[1]);
-            deliveryQuantities.set(delivery.delivery_id, qty);
-            totalQuantity += qty;
-          }
-        }
-      });
-
-      const distributeEqually = totalQuantity === 0;
-      const divisor = distributeEqually ? distributionDeliveries.length : totalQuantity;
-
-      distributionDeliveries.forEach(delivery => {
-        if (delivery.community_id && delivery.dropoff_time) {
-          const deliveryDate = new Date(delivery.dropoff_time);
-          const monthKey = `${deliveryDate.getFullYear()}-${String(deliveryDate.getMonth() + 1).padStart(2, '0')}`;
-
-          const key = `${delivery.community_id}|${monthKey}`;
-          const current = map.get(key) || 0;
-
-          const deliveryQty = distributeEqually
-            ? 1
-            : (deliveryQuantities.get(delivery.delivery_id) || 0);
-          const proportionalImpact = (impact.meals_saved || 0) * (deliveryQty / divisor);
-
-          map.set(key, current + proportionalImpact);
-        }
-      });
+    cells.forEach(cell => {
+      const key = `${cell.community}|${cell.month}`;
+      map.set(key, (map.get(key) || 0) + (cell.meals || 0));
     });
-
-    console.log("Community heat map calculation:", {
-      matchedImpacts,
-      skippedNoFood,
-      skippedNoDeliveries,
-      uniqueCommunityMonths: map.size,
-    });
-
     return map;
-  }, [impactRecords, deliveries]);
+  }, [cells]);
 
   const { uniqueCommunities, uniqueMonths } = useMemo(() => {
     const communitiesSet = new Set<string>();
@@ -1320,8 +1181,8 @@ function CommunityImpactHeatMap({
   };
 
   const getCommunityName = (communityId: string): string => {
-    const community = communities.find(c => c.community_id === communityId);
-    return community?.name || communityId;
+    const cell = cells.find(c => c.community === communityId);
+    return cell?.community_name || communityId;
   };
 
   if (loading) {
@@ -1479,15 +1340,10 @@ function HomePage({
   setAuthMode: (mode: AuthMode) => void;
   currentUser: LoggedUser | null;
 }) {
-  const [impactRecords, setImpactRecords] = useState<ImpactRecord[]>([]);
+  const [dashboard, setDashboard] = useState<DashboardBootstrap | null>(null);
   const [impactLoading, setImpactLoading] = useState(false);
   const [impactError, setImpactError] = useState<string | null>(null);
-  const [restaurants, setRestaurants] = useState<Restaurant[]>([]);
-  const [donations, setDonations] = useState<DonationApiRecord[]>([]);
-  const [foodItems, setFoodItems] = useState<FoodItemApiRecord[]>([]);
   const [leaderboardLoading, setLeaderboardLoading] = useState(true);
-  const [communities, setCommunities] = useState<Community[]>([]);
-  const [deliveries, setDeliveries] = useState<DeliveryRecordApi[]>([]);
   const [heatMapLoading, setHeatMapLoading] = useState(false);
 
   const journey = [
@@ -1514,150 +1370,32 @@ function HomePage({
     },
   ];
 
-  // Load all dashboard data in parallel for faster loading
+  // Load every dashboard view model in one request
   useEffect(() => {
     let ignore = false;
 
     async function loadAllDashboardData() {
-      // Set all loading states
       setImpactLoading(true);
       setLeaderboardLoading(true);
       setHeatMapLoading(true);
       setImpactError(null);
 
       try {
-        // Try impact endpoints in parallel instead of sequentially
-        const impactCandidates = [
-          API_PATHS.impact,
-          "/impact/",
-        ];
-
-        // Fetch all data in parallel for maximum speed
-        // Wrap each fetch in a promise that handles network errors gracefully
-        const [
-          impactResult1,
-          impactResult2,
-          restaurantsData,
-          donationsData,
-          foodItemsData,
-          communitiesData,
-          deliveriesData,
-        ] = await Promise.allSettled([
-          apiFetch<unknown>(impactCandidates[0]).catch((err) => {
-            console.warn("Failed to fetch impact data from first endpoint:", err);
-            throw err;
-          }),
-          apiFetch<unknown>(impactCandidates[1]).catch((err) => {
-            console.warn("Failed to fetch impact data from second endpoint:", err);
-            throw err;
-          }),
-          apiFetch<Restaurant[]>("/restaurants/").catch((err) => {
-            console.warn("Failed to fetch restaurants:", err);
-            throw err;
-          }),
-          apiFetch<DonationApiRecord[]>("/donations/").catch((err) => {
-            console.warn("Failed to fetch donations:", err);
-            throw err;
-          }),
-          apiFetch<FoodItemApiRecord[]>("/fooditems/").catch((err) => {
-            console.warn("Failed to fetch food items:", err);
-            throw err;
-          }),
-          apiFetch<Community[]>(API_PATHS.communities).catch((err) => {
-            console.warn("Failed to fetch communities:", err);
-            throw err;
-          }),
-          apiFetch<DeliveryRecordApi[]>(API_PATHS.deliveries, {
-            headers: buildAuthHeaders(currentUser),
-          }).catch((err) => {
-            console.warn("Failed to fetch deliveries:", err);
-            throw err;
-          }),
-        ]);
-
-        if (ignore) return;
-
-        // Process impact data - use first successful result
-        let loaded: ImpactRecord[] = [];
-        let impactError: unknown = null;
-
-        for (const result of [impactResult1, impactResult2]) {
-          if (result.status === "fulfilled") {
-            try {
-              loaded = normalizeImpactData(result.value);
-              if (loaded.length) break;
-            } catch (err) {
-              impactError = err;
-            }
-          } else {
-            impactError = result.reason;
-          }
-        }
-
-        if (loaded.length) {
-          setImpactRecords(loaded);
-        } else if (impactError) {
-          setImpactError(
-            impactError instanceof Error ? impactError.message : "Unable to load impact data."
-          );
-        }
-        // Always clear loading state
-        setImpactLoading(false);
-
-        // Process leaderboard data - update state as soon as available
-        if (restaurantsData.status === "fulfilled") {
-          setRestaurants(restaurantsData.value);
-        } else {
-          console.error("Failed to load restaurants:", restaurantsData.reason);
-          setRestaurants([]);
-        }
-
-        if (donationsData.status === "fulfilled") {
-          setDonations(donationsData.value);
-        } else {
-          console.error("Failed to load donations:", donationsData.reason);
-          setDonations([]);
-        }
-
-        if (foodItemsData.status === "fulfilled") {
-          setFoodItems(foodItemsData.value);
-        } else {
-          console.error("Failed to load food items:", foodItemsData.reason);
-          setFoodItems([]);
-        }
-
-        // Leaderboard is ready when all three are loaded
-        setLeaderboardLoading(false);
-
-        // Process heat map data
-        if (communitiesData.status === "fulfilled") {
-          setCommunities(communitiesData.value);
-        } else {
-          setCommunities([]);
-        }
-
-        if (deliveriesData.status === "fulfilled") {
-          setDeliveries(deliveriesData.value);
-        } else {
-          setDeliveries([]);
-        }
-
-        setHeatMapLoading(false);
-
-        console.log("Dashboard data loaded:", {
-          impactRecords: loaded.length,
-          restaurants: restaurantsData.status === "fulfilled" ? restaurantsData.value.length : 0,
-          donations: donationsData.status === "fulfilled" ? donationsData.value.length : 0,
-          foodItems: foodItemsData.status === "fulfilled" ? foodItemsData.value.length : 0,
-          communities: communitiesData.status === "fulfilled" ? communitiesData.value.length : 0,
-          deliveries: deliveriesData.status === "fulfilled" ? deliveriesData.value.length : 0,
+        const data = await apiFetch<DashboardBootstrap>(API_PATHS.dashboard, {
+          headers: buildAuthHeaders(currentUser),
         });
+        if (!ignore) {
+          setDashboard(data);
+        }
       } catch (err) {
         if (!ignore) {
           console.error("Error loading dashboard data:", err);
           setImpactError(
             formatErrorMessage(err) || "Unable to load dashboard data. Please try again."
           );
+        }
+      } finally {
+        if (!ignore) {
           setImpactLoading(false);
           setLeaderboardLoading(false);
           setHeatMapLoading(false);
@@ -1672,329 +1410,40 @@ function HomePage({
   }, [currentUser]);
 
   const impactTotals = useMemo(() => {
-    return impactRecords.reduce(
-      (acc, record) => ({
-        meals: acc.meals + (record.meals_saved || 0),
-        weight: acc.weight + (record.weight_saved_kg || 0),
-        co2: acc.co2 + (record.co2_reduced_kg || 0),
-      }),
-      { meals: 0, weight: 0, co2: 0 }
-    );
-  }, [impactRecords]);
+    const totals = dashboard?.impact.totals;
+    return {
+      meals: totals?.meals_saved || 0,
+      weight: totals?.weight_saved_kg || 0,
+      co2: totals?.co2_reduced_kg || 0,
+    };
+  }, [dashboard]);
 
-  // Calculate weekly meals saved
+  // Weekly meals saved (weeks start on Monday, last 12 weeks)
   const weeklyMealsData = useMemo(() => {
-    const weeks = new Map<string, { meals: number; co2: number; startDate: Date; endDate: Date }>();
-
-    impactRecords.forEach(record => {
-      const date = new Date(record.impact_date);
-      const weekStart = new Date(date);
-      weekStart.setDate(date.getDate() - date.getDay()); // Start of week (Sunday)
-      weekStart.setHours(0, 0, 0, 0);
-
-      const weekEnd = new Date(weekStart);
-      weekEnd.setDate(weekEnd.getDate() + 6);
-
-      const weekKey = weekStart.toISOString().split('T')[0];
-
-      const current = weeks.get(weekKey) || {
-        meals: 0,
-        co2: 0,
-        startDate: weekStart,
-        endDate: weekEnd
+    return (dashboard?.impact.series ?? []).map(row => {
+      const startDate = new Date(`${row.period_start}T00:00:00`);
+      const endDate = new Date(startDate);
+      endDate.setDate(endDate.getDate() + 6);
+      return {
+        weekKey: row.period_start,
+        meals: row.meals_saved || 0,
+        co2: row.co2_reduced_kg || 0,
+        startDate,
+        endDate,
       };
-      current.meals += record.meals_saved || 0;
-      current.co2 += record.co2_reduced_kg || 0;
-      weeks.set(weekKey, current);
     });
+  }, [dashboard]);
 
-    return Array.from(weeks.entries())
-      .map(([key, data]) => ({
-        weekKey: key,
-        ...data,
-      }))
-      .sort((a, b) => a.startDate.getTime() - b.startDate.getTime())
-      .slice(-12); // Last 12 weeks
-  }, [impactRecords]);
-
-  // Helper to normalize food IDs - handles various formats
-  // FoodItemSerializer formats as F{4digits} (e.g., F0001)
-  // Impact records use FOO{7digits} (e.g., FOO0000001)
-  // We normalize both to FOO{7digits} for matching
-  const normalizeFoodId = (foodId: string | number | null | undefined): string => {
-    if (!foodId) return "";
-    const foodIdStr = String(foodId).trim();
-    if (!foodIdStr) return "";
-
-    // If it already starts with FOO, normalize the digits
-    if (foodIdStr.startsWith("FOO") || foodIdStr.startsWith("foo")) {
-      const digits = foodIdStr.replace(/\D/g, '');
-      return digits ? `FOO${digits.padStart(7, '0')}` : foodIdStr.toUpperCase();
-    }
-
-    // Handle F{4digits} format from FoodItemSerializer (e.g., F0001)
-    if (foodIdStr.startsWith("F") && foodIdStr.length <= 5) {
-      const digits = foodIdStr.replace(/\D/g, '');
-      if (digits) {
-        return `FOO${digits.padStart(7, '0')}`;
-      }
-    }
-
-    // Extract digits and format as FOO0000000
-    const digits = foodIdStr.replace(/\D/g, '');
-    if (!digits) return foodIdStr;
-    return `FOO${digits.padStart(7, '0')}`;
-  };
-
-  // Calculate restaurant leaderboard
+  // Top 5 restaurants by meals saved
   const restaurantLeaderboard = useMemo(() => {
-    console.log("Calculating restaurant leaderboard:", {
-      impactRecords: impactRecords.length,
-      restaurants: restaurants.length,
-      donations: donations.length,
-      foodItems: foodItems.length,
-      impactLoading,
-      leaderboardLoading,
-    });
-
-    // Don't calculate if still loading
-    if (impactLoading || leaderboardLoading) {
-      console.log("Still loading data, skipping calculation");
-      return [];
-    }
-
-    if (!impactRecords.length) {
-      console.log("No impact records available");
-      return [];
-    }
-
-    if (!restaurants.length || !donations.length || !foodItems.length) {
-      console.log("Missing required data:", {
-        hasRestaurants: restaurants.length > 0,
-        hasDonations: donations.length > 0,
-        hasFoodItems: foodItems.length > 0,
-      });
-      return [];
-    }
-
-    const restaurantMap = new Map(restaurants.map(r => [r.restaurant_id, r]));
-    const donationMap = new Map(donations.map(d => [d.donation_id, d]));
-
-    const foodItemMap = new Map<string, FoodItemApiRecord>();
-    foodItems.forEach(f => {
-      const foodId = f.food_id;
-      if (foodId) {
-        const originalStr = String(foodId).trim();
-        const normalized = normalizeFoodId(foodId);
-
-        // Store with normalized key (primary lookup) - this handles F0001 -> FOO0000001
-        foodItemMap.set(normalized, f);
-
-        // Also store with original format for flexible lookup
-        foodItemMap.set(originalStr, f);
-
-        // Store with uppercase version if different
-        if (originalStr !== originalStr.toUpperCase()) {
-          foodItemMap.set(originalStr.toUpperCase(), f);
-        }
-
-        // Store with lowercase version if different
-        if (originalStr !== originalStr.toLowerCase()) {
-          foodItemMap.set(originalStr.toLowerCase(), f);
-        }
-
-        // Also store the normalized version of the original (in case original is already normalized)
-        if (originalStr !== normalized) {
-          // If original is F0001 format, normalized will be FOO0000001
-          // Store both so we can match either way
-          const reverseNormalized = normalizeFoodId(originalStr);
-          if (reverseNormalized !== originalStr && reverseNormalized !== normalized) {
-            foodItemMap.set(reverseNormalized, f);
-          }
-        }
-      }
-    });
-
-    console.log("Food item map created:", {
-      totalFoodItems: foodItems.length,
-      mapSize: foodItemMap.size,
-      sampleKeys: Array.from(foodItemMap.keys()).slice(0, 5),
-      sampleFoodItems: foodItems.slice(0, 3).map(f => ({
-        food_id: f.food_id,
-        donation: f.donation,
-        donationType: typeof f.donation,
-      })),
-    });
-
-    console.log("Donation map created:", {
-      totalDonations: donations.length,
-      sampleDonationIds: Array.from(donationMap.keys()).slice(0, 5),
-      sampleDonations: donations.slice(0, 3).map(d => ({
-        donation_id: d.donation_id,
-        restaurant: d.restaurant,
-        restaurant_name: d.restaurant_name,
-      })),
-    });
-
-    console.log("Restaurant map created:", {
-      totalRestaurants: restaurants.length,
-      sampleRestaurantIds: Array.from(restaurantMap.keys()).slice(0, 5),
-      sampleRestaurants: restaurants.slice(0, 3).map(r => ({
-        restaurant_id: r.restaurant_id,
-        name: r.name,
-      })),
-    });
-
-    console.log("Sample impact records:", impactRecords.slice(0, 3).map(i => ({
-      impact_id: i.impact_id,
-      food: i.food,
-      meals_saved: i.meals_saved,
-    })));
-
-    const restaurantImpact = new Map<string, { restaurantId: string; meals: number; weight: number; co2: number; name: string }>();
-
-    let matchedCount = 0;
-    let skippedNoFood = 0;
-    let skippedNoFoodItem = 0;
-    let skippedNoDonation = 0;
-    let skippedNoRestaurant = 0;
-
-    impactRecords.forEach(impact => {
-      // Handle food field - could be string, number, or object
-      let foodIdValue: string = "";
-      if (typeof impact.food === "string") {
-        foodIdValue = impact.food.trim();
-      } else if (typeof impact.food === "number") {
-        foodIdValue = String(impact.food);
-      } else if (impact.food && typeof impact.food === "object") {
-        // If it's an object, try to extract food_id
-        foodIdValue = (impact.food as any).food_id || (impact.food as any).id || "";
-      }
-
-      if (!foodIdValue) {
-        skippedNoFood++;
-        return;
-      }
-
-      const normalizedFoodId = normalizeFoodId(foodIdValue);
-
-      // Try multiple lookup strategies
-      let foodItem = foodItemMap.get(normalizedFoodId) ||
-        foodItemMap.get(foodIdValue) ||
-        foodItemMap.get(foodIdValue.toUpperCase()) ||
-        foodItemMap.get(foodIdValue.toLowerCase()) ||
-        foodItems.find(f => {
-          const fId = String(f.food_id || "").trim();
-          if (!fId) return false;
-          const fNormalized = normalizeFoodId(fId);
-          return fId === foodIdValue ||
-            fId === normalizedFoodId ||
-            fNormalized === normalizedFoodId ||
-            normalizeFoodId(fId) === normalizedFoodId;
-        });
-
-      if (!foodItem) {
-        skippedNoFoodItem++;
-        if (skippedNoFoodItem <= 3) {
-          console.log("Failed to find food item for impact:", {
-            impactId: impact.impact_id,
-            foodValue: foodIdValue,
-            normalized: normalizedFoodId,
-            availableFoodIds: foodItems.slice(0, 3).map(f => f.food_id),
-          });
-        }
-        return;
-      }
-
-      // Handle donation field - could be string (ID) or object
-      let donationId: string = "";
-      if (typeof foodItem.donation === "string") {
-        donationId = foodItem.donation.trim();
-      } else if (typeof foodItem.donation === "number") {
-        donationId = String(foodItem.donation);
-      } else if (foodItem.donation && typeof foodItem.donation === "object") {
-        donationId = (foodItem.donation as any).donation_id || (foodItem.donation as any).id || "";
-        if (donationId) donationId = String(donationId).trim();
-      }
-
-      if (!donationId) {
-        skippedNoDonation++;
-        if (skippedNoDonation <= 3) {
-          console.log("Food item missing donation:", {
-            foodId: foodItem.food_id,
-            donationValue: foodItem.donation,
-            donationType: typeof foodItem.donation,
-          });
-        }
-        return;
-      }
-
-      const donation = donationMap.get(donationId);
-      if (!donation) {
-        skippedNoDonation++;
-        if (skippedNoDonation <= 3) {
-          console.log("Donation not found in map:", {
-            donationId,
-            availableDonationIds: Array.from(donationMap.keys()).slice(0, 5),
-            foodItemId: foodItem.food_id,
-          });
-        }
-        return;
-      }
-
-      const restaurantId = donation.restaurant;
-      if (!restaurantId) {
-        skippedNoRestaurant++;
-        return;
-      }
-
-      const restaurant = restaurantMap.get(restaurantId);
-      if (!restaurant) {
-        skippedNoRestaurant++;
-        return;
-      }
-
-      matchedCount++;
-
-      const restaurantName = donation.restaurant_name || restaurant.name ||
-        (restaurant.branch_name ? `${restaurant.name || ''} - ${restaurant.branch_name}`.trim() : '') ||
-        restaurant.restaurant_id;
-
-      // Use a unique key that includes both restaurant ID and name to handle branches separately
-      // This ensures branches of the same chain are shown separately if they have different names
-      const uniqueKey = `${restaurantId}-${restaurantName}`;
-
-      const current = restaurantImpact.get(uniqueKey) || {
-        restaurantId: restaurantId,
-        meals: 0,
-        weight: 0,
-        co2: 0,
-        name: restaurantName,
-      };
-
-      current.meals += impact.meals_saved || 0;
-      current.weight += impact.weight_saved_kg || 0;
-      current.co2 += impact.co2_reduced_kg || 0;
-
-      restaurantImpact.set(uniqueKey, current);
-    });
-
-    console.log("Leaderboard calculation stats:", {
-      matchedCount,
-      skippedNoFood,
-      skippedNoFoodItem,
-      skippedNoDonation,
-      skippedNoRestaurant,
-      uniqueRestaurants: restaurantImpact.size,
-    });
-
-    const result = Array.from(restaurantImpact.values())
-      .sort((a, b) => b.meals - a.meals)
-      .slice(0, 5); // Top 5 only
-
-    console.log("Final leaderboard result:", result);
-    return result;
-  }, [impactRecords, restaurants, donations, foodItems, impactLoading, leaderboardLoading]);
+    return (dashboard?.leaderboard.restaurants ?? []).map(row => ({
+      restaurantId: row.restaurant_id,
+      meals: row.meals_saved,
+      weight: row.weight_saved_kg,
+      co2: row.co2_reduced_kg,
+      name: row.branch_name ? `${row.name} - ${row.branch_name}` : row.name,
+    }));
+  }, [dashboard]);
 
   return (
     <div className="mx-auto w-full max-w-8xl space-y-8 mb-1">
@@ -2070,7 +1519,7 @@ function HomePage({
             </p>
           </div>
           <span className="rounded-full border border-[#A8B99A] bg-white px-3 py-1 text-xs font-semibold text-[#365032] shadow-sm animate-scale-in" style={{ animationDelay: '0.2s', opacity: 0 }}>
-            {impactRecords.length} records
+            {Math.round(dashboard?.impact.totals.records ?? 0)} records
           </span>
         </div>
 
@@ -2252,13 +1701,11 @@ function HomePage({
                 <p className="text-xs text-gray-500 mt-1">Meals saved by community and month</p>
               </div>
               <span className="rounded-full bg-[#E6F7EE] px-3 py-1 text-[11px] font-semibold text-[#2F855A] animate-scale-in" style={{ animationDelay: '0.9s', opacity: 0 }}>
-                {communities.length} communities
+                {dashboard?.counts.communities ?? 0} communities
               </span>
             </div>
             <CommunityImpactHeatMap
-              impactRecords={impactRecords}
-              deliveries={deliveries}
-              communities={communities}
+              cells={dashboard?.heat_map.cells ?? []}
               loading={heatMapLoading || impactLoading}
             />
           </div>
@@ -9083,14 +8530,7 @@ function DeliverToCommunity({ currentUser }: { currentUser: LoggedUser | null })
   const handleEditDelivery = (delivery: DeliveryRecordApi) => {
     if (!canEdit) return;
 
-    // Convert food_id from database format (FOO0000014) to API format (F0000014) if needed
-    let foodIdForForm = delivery.food_item || "";
-    if (foodIdForForm.startsWith("FOO")) {
-      // Extract digits from FOO0000014 -> 0000014
-      const digits = foodIdForForm.substring(3);
-      // Convert to F0000014 (F prefix + digits)
-      foodIdForForm = `F${digits}`;
-    }
+    const foodIdForForm = delivery.food_item || "";
 
     setEditingDeliveryId(delivery.delivery_id);
     setDistributionForm({
@@ -9171,17 +8611,6 @@ function DeliverToCommunity({ currentUser }: { currentUser: LoggedUser | null })
       const pickupDate = new Date(distributionForm.pickupTime);
       const dropoffDate = new Date(pickupDate.getTime() + 3 * 60 * 60 * 1000);
 
-      // Convert food_id from API format (F0000014) back to database format (FOO0000014)
-      // The API serializer formats FOO0000014 -> F0000014, but backend needs FOO0000014
-      let foodIdForBackend = selectedFoodItem;
-      if (selectedFoodItem.startsWith("F") && !selectedFoodItem.startsWith("FOO")) {
-        // Extract digits from F0000014 -> 0000014
-        const digits = selectedFoodItem.substring(1);
-        // Convert to FOO0000014 (FOO prefix + 7 digits)
-        foodIdForBackend = `FOO${digits.padStart(7, "0")}`;
-      }
-
-
       // Check only if driver is_available field is false (not checking for conflicting deliveries)
       const selectedStaff = staff.find(s => s.user_id === distributionForm.userId);
       if (selectedStaff && !selectedStaff.is_available) {
@@ -9196,7 +8625,7 @@ function DeliverToCommunity({ currentUser }: { currentUser: LoggedUser | null })
         warehouse_id: distributionForm.warehouseId,
         user_id: distributionForm.userId,
         community_id: distributionForm.communityId,
-        food_item: foodIdForBackend,
+        food_item: selectedFoodItem,
         delivery_quantity: deliveryQuantity,
       };
 
@@ -9271,34 +8700,10 @@ function DeliverToCommunity({ currentUser }: { currentUser: LoggedUser | null })
     return removePostalCode(warehouse.address);
   }, [warehouses]);
 
-  // Helper to normalize food ID for matching (handles both F0000014 and FOO0000014 formats)
-  const normalizeFoodId = (foodId: string): string => {
-    if (!foodId) return foodId;
-    // If it starts with FOO, return as is
-    if (foodId.startsWith("FOO")) return foodId;
-    // If it starts with F but not FOO, convert F0000014 -> FOO0000014
-    if (foodId.startsWith("F") && !foodId.startsWith("FOO")) {
-      const digits = foodId.substring(1);
-      return `FOO${digits.padStart(7, "0")}`;
-    }
-    return foodId;
-  };
-
-  // Helper to find food item by ID (handles both formats)
+  // The API always returns canonical food ids (FOO0000014).
   const lookupFoodItem = useCallback((foodId: string | null | undefined): FoodItemApiRecord | null => {
     if (!foodId) return null;
-    // Try direct match first
-    let foodItem = foodItems.find(f => f.food_id === foodId);
-    if (foodItem) return foodItem;
-
-    // Try normalized match
-    const normalizedId = normalizeFoodId(foodId);
-    foodItem = foodItems.find(f => {
-      const normalizedFoodId = normalizeFoodId(f.food_id);
-      return normalizedFoodId === normalizedId;
-    });
-
-    return foodItem || null;
+    return foodItems.find(f => f.food_id === foodId) || null;
   }, [foodItems]);
 
   const lookupFoodItemName = useCallback((foodId: string | null | undefined): string => {